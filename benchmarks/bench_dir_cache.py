@@ -0,0 +1,86 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Бенчмарк проверки существования путей из сцен: Path.exists на каждый
+путь против DirectoryCache (один листинг на папку). Задержка сетевого
+ресурса имитируется паузой перед каждым stat и листингом.
+
+    python benchmarks/bench_dir_cache.py [путей] [папок] [задержка, мс]
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Добавляем путь к модулям
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.dir_cache import DirectoryCache
+
+
+def build_paths(root: Path, count: int, folders: int, seed: int = 0):
+    """Папки с текстурами и пути на них: примерно треть путей отсутствует"""
+    rng = random.Random(seed)
+    directories = []
+    for i in range(folders):
+        directory = root / f"lib_{i}"
+        directory.mkdir()
+        directories.append(directory)
+    paths = []
+    for i in range(count):
+        path = rng.choice(directories) / f"tex_{i}.jpg"
+        if rng.random() < 0.67:
+            path.touch()
+        paths.append(path)
+    return paths
+
+
+def measure(label: str, check, paths, latency: float) -> list:
+    real_stat, real_scandir = os.stat, os.scandir
+
+    def slow_stat(path, *args, **kwargs):
+        time.sleep(latency)
+        return real_stat(path, *args, **kwargs)
+
+    def slow_scandir(path):
+        time.sleep(latency)
+        return real_scandir(path)
+
+    os.stat, os.scandir = slow_stat, slow_scandir
+    try:
+        started = time.perf_counter()
+        found = [check(path) for path in paths]
+        elapsed = time.perf_counter() - started
+    finally:
+        os.stat, os.scandir = real_stat, real_scandir
+    print(f"   {label:<16} {elapsed:8.2f} с   найдено: {sum(found)}")
+    return found
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 60000
+    folders = int(sys.argv[2]) if len(sys.argv) > 2 else 300
+    latency = (float(sys.argv[3]) if len(sys.argv) > 3 else 0.5) / 1000
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = build_paths(Path(tmp), count, folders)
+
+        print("=" * 60)
+        print(f"Проверка {count} путей в {folders} папках, задержка {latency * 1000:.1f} мс")
+        print("=" * 60)
+
+        direct = measure("Path.exists", Path.exists, paths, latency)
+        cache = DirectoryCache()
+        cached = measure("DirectoryCache", cache.exists, paths, latency)
+        print(f"   папок прочитано: {cache.dirs_listed}")
+
+        if direct != cached:
+            print(f"\n⚠️ Результаты различаются")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Бенчмарк MaxFileParser.parse_scene на синтетическом корпусе:
+пропускная способность (МБ/с), пиковая память (tracemalloc)
+и полнота найденных путей относительно вставленных в сцены.
+
+    python benchmarks/bench_parser.py [--stream-size МБ] [--min-recall 100]
+
+Завершается с кодом 1, если полнота в каком-либо наборе ниже порога -
+так оптимизация парсера не сможет незаметно потерять ассеты.
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import replace
+from pathlib import Path
+from typing import List, Tuple
+
+# Добавляем путь к модулям
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.max_parser import MaxFileParser, ParseMode
+from max_corpus import CorpusSpec, GeneratedScene, generate_scene
+
+
+def corpus_cases(stream_size: int) -> List[Tuple[str, CorpusSpec, bool]]:
+    """Наборы сцен: (название, параметры, таблица FileAssetMetaData)"""
+    base = CorpusSpec(stream_size=stream_size)
+    return [
+        ("базовый", base, False),
+        ("фрагментированный", replace(base, fragmented=True, seed=1), False),
+        ("кириллица/UNC", replace(base, cyrillic_ratio=0.6, unc_ratio=0.4, seed=2), False),
+        ("плотный UTF-16", replace(base, ascii_density=10, utf16_density=400, seed=3), False),
+        ("без шума", replace(base, noise_ratio=0.0, seed=4), False),
+        ("с таблицей ассетов", replace(base, seed=5), True),
+    ]
+
+
+def measure(scene: GeneratedScene, mode: ParseMode, repeat: int) -> Tuple[float, int, float]:
+    """Лучшее время разбора, пиковая память и полнота"""
+    parser = MaxFileParser()
+
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        parser.parse_scene(scene.path, mode)
+        best = min(best, time.perf_counter() - started)
+
+    tracemalloc.start()
+    assets = parser.parse_scene(scene.path, mode)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    expected = scene.all_assets
+    recall = len(expected & assets.all_assets) / len(expected) * 100 if expected else 100.0
+    return best, peak, recall
+
+
+def main():
+    args = argparse.ArgumentParser(description="Бенчмарк парсера .max")
+    args.add_argument('--stream-size', type=float, default=8.0, help="Размер потока Scene, МБ")
+    args.add_argument('--repeat', type=int, default=3)
+    args.add_argument('--min-recall', type=float, default=100.0, help="Порог полноты, %%")
+    options = args.parse_args()
+
+    print("=" * 78)
+    print(f"{'Набор':<20} {'режим':<10} {'размер':>8} {'время':>9} {'МБ/с':>8} "
+          f"{'память':>9} {'полнота':>8}")
+    print("=" * 78)
+
+    failed = []
+    with tempfile.TemporaryDirectory(prefix="MaxAssetManager_bench_") as tmp:
+        for name, spec, metadata in corpus_cases(int(options.stream_size * 1024 * 1024)):
+            scene = generate_scene(Path(tmp) / f"{spec.seed}.max", spec, metadata)
+            mb = scene.size / (1024 * 1024)
+            for mode in (ParseMode.STANDARD, ParseMode.EXHAUSTIVE):
+                elapsed, peak, recall = measure(scene, mode, options.repeat)
+                print(f"{name:<20} {mode.value:<10} {mb:6.1f}МБ {elapsed * 1000:7.0f}мс "
+                      f"{mb / elapsed:8.1f} {peak / 1024 / 1024:7.1f}МБ {recall:7.1f}%")
+                if recall < options.min_recall:
+                    failed.append((name, mode.value, recall))
+
+    if failed:
+        print(f"\n⚠️ Полнота ниже {options.min_recall}%:")
+        for name, mode, recall in failed:
+            print(f"   {name} ({mode}): {recall:.1f}%")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Бенчмарк перевода Windows-путей из сцен в пути этой машины: пути вида
+C:\\Projects\\... и \\\\server\\share\\... в другом регистре, чем на диске,
+ищутся через PathMapper и DirectoryCache.
+
+    python benchmarks/bench_path_mapper.py [путей] [папок]
+"""
+
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Добавляем путь к модулям
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.dir_cache import DirectoryCache
+from core.path_mapper import PathMapper
+
+
+def build_refs(root: Path, count: int, folders: int, seed: int = 0):
+    """Папки на 'дисках' c и share и пути на них в Windows-виде со случайным регистром"""
+    rng = random.Random(seed)
+    directories = []
+    for i in range(folders):
+        mount, prefix = rng.choice([("c", "C:\\Projects"), ("share", "\\\\server\\share")])
+        relative = f"job_{i % 7}/maps_{i}"
+        directory = root / mount / relative
+        directory.mkdir(parents=True)
+        directories.append((directory, prefix + "\\" + relative.replace("/", "\\")))
+
+    refs = []
+    for i in range(count):
+        directory, windows_directory = rng.choice(directories)
+        name = f"Tex_{i % 5000}.jpg"
+        if rng.random() < 0.8:
+            (directory / name.lower()).touch()
+        windows_path = f"{windows_directory}\\{name}"
+        refs.append(windows_path.upper() if rng.random() < 0.5 else windows_path)
+    return refs
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    folders = int(sys.argv[2]) if len(sys.argv) > 2 else 300
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        refs = build_refs(root, count, folders)
+        mapper = PathMapper({"C:\\Projects": str(root / "c"),
+                             "\\\\server\\share": str(root / "share")})
+
+        print("=" * 60)
+        print(f"Перевод {count} путей в {folders} папках")
+        print("=" * 60)
+
+        dir_cache = DirectoryCache()
+        started = time.perf_counter()
+        found = sum(1 for ref in refs if mapper.entry(ref, dir_cache) is not None)
+        elapsed = time.perf_counter() - started
+        print(f"   найдено: {found} из {count} за {elapsed:.2f} с")
+        print(f"   папок прочитано: {dir_cache.dirs_listed}")
+
+
+if __name__ == "__main__":
+    main()
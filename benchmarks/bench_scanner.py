@@ -0,0 +1,176 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Бенчмарк сканера путей MaxFileParser: пропускная способность (МБ/с)
+старого четырёхпроходного поиска и нового однопроходного сканера
+"""
+
+import re
+import struct
+import sys
+import time
+import random
+from pathlib import Path
+from typing import Set, Tuple
+
+# Добавляем путь к модулям
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.max_parser import MaxFileParser, SceneAssets
+
+
+class LegacyParser(MaxFileParser):
+    """Прежняя реализация: два регулярных выражения, поиск UTF-16 дисков
+    и по два data.find на каждое расширение"""
+
+    def scan(self, data: bytes, assets: SceneAssets):
+        self._extract_ascii_paths(data, assets)
+        self._extract_unicode_paths(data, assets)
+        self._extract_by_extension(data, assets)
+
+    def _process_found_path(self, path_data: bytes, assets: SceneAssets):
+        # Прежде все кандидаты приходили байтами (UTF-16 перекодировался в UTF-8)
+        asset = super()._process_found_path(self._decode_path_bytes(path_data), assets)
+        if asset is not None:
+            assets.add(asset.kind, asset.path)
+
+    def _extract_ascii_paths(self, data: bytes, assets: SceneAssets):
+        patterns = [
+            rb'([A-Za-z]:[\\\/](?:[^\x00-\x1f\\/:*?"<>|]+[\\\/])*[^\x00-\x1f\\/:*?"<>|]+\.(?:jpg|jpeg|png|tga|tif|tiff|bmp|gif|exr|hdr|psd|dds|tx|tex|vrmesh|abc|rs|ass|bgeo|obj|ies|hdri))',
+            rb'(\\\\[^\x00-\x1f\\/:*?"<>|]+(?:\\[^\x00-\x1f\\/:*?"<>|]+)+\.(?:jpg|jpeg|png|tga|tif|tiff|bmp|gif|exr|hdr|psd|dds|tx|tex|vrmesh|abc|rs|ass|bgeo|obj|ies|hdri))',
+        ]
+        for pattern in patterns:
+            for match in re.findall(pattern, data, re.IGNORECASE):
+                self._process_found_path(match, assets)
+
+    def _extract_unicode_paths(self, data: bytes, assets: SceneAssets):
+        for match in re.finditer(rb'([A-Za-z]\x00:\x00[\\/]\x00)', data):
+            chunk = data[match.start():match.start() + 1000]
+            decoded = ""
+            for i in range(0, len(chunk) - 1, 2):
+                char_code = struct.unpack('<H', chunk[i:i+2])[0]
+                if 0 < char_code <= 127 or 0x0400 <= char_code <= 0x04FF:
+                    decoded += chr(char_code)
+                else:
+                    break
+            if len(decoded) > 5:
+                self._process_found_path(decoded.encode('utf-8'), assets)
+
+    def _extract_by_extension(self, data: bytes, assets: SceneAssets):
+        for ext in list(self.TEXTURE_EXTENSIONS) + list(self.PROXY_EXTENSIONS):
+            self._find_ascii(data, ext.encode('ascii'), assets)
+            self._find_utf16(data, ext.encode('utf-16-le'), assets)
+
+    def _find_ascii(self, data: bytes, ext: bytes, assets: SceneAssets):
+        pos = 0
+        while True:
+            pos = data.find(ext, pos)
+            if pos == -1:
+                break
+            start = pos
+            for i in range(pos - 1, max(pos - 500, 0), -1):
+                byte = data[i]
+                if byte < 32 or byte > 126:
+                    start = i + 1
+                    break
+                if i > 0 and data[i] == ord(':') and (65 <= data[i-1] <= 90 or 97 <= data[i-1] <= 122):
+                    start = i - 1
+                    break
+            end = pos + len(ext)
+            self._process_found_path(data[start:end], assets)
+            pos = end
+
+    def _find_utf16(self, data: bytes, ext: bytes, assets: SceneAssets):
+        pos = 0
+        while True:
+            pos = data.find(ext, pos)
+            if pos == -1:
+                break
+            start = pos
+            for i in range(pos - 2, max(pos - 1000, 0), -2):
+                char_code = struct.unpack('<H', data[i:i+2])[0]
+                if i >= 2:
+                    prev_code = struct.unpack('<H', data[i-2:i])[0]
+                    if char_code == ord(':') and (65 <= prev_code <= 90 or 97 <= prev_code <= 122):
+                        start = i - 2
+                        break
+                if char_code == 0 or (char_code > 127 and not (0x0400 <= char_code <= 0x04FF)):
+                    start = i + 2
+                    break
+            end = pos + len(ext)
+            path_str = data[start:end].decode('utf-16-le', errors='ignore')
+            if path_str:
+                self._process_found_path(path_str.encode('utf-8'), assets)
+            pos = end
+
+
+def build_buffer(size: int, paths_per_mb: int = 200, seed: int = 0) -> Tuple[bytes, Set[str]]:
+    """Двоичный буфер со встроенными ASCII и UTF-16 путями и набор этих путей"""
+    rng = random.Random(seed)
+    embedded = set()
+    words = ['wood', 'metal', 'floor', 'wall', 'дерево', 'металл', 'стена']
+    exts = ['.jpg', '.png', '.tga', '.tif', '.tiff', '.exr', '.vrmesh', '.abc']
+    out = bytearray()
+    gap = max(64, (1024 * 1024) // max(1, paths_per_mb))
+    while len(out) < size:
+        out += rng.randbytes(rng.randint(gap // 2, gap))
+        root = rng.choice(['C:', 'D:', '\\\\nas\\library'])
+        path = root + '\\' + '\\'.join(rng.choice(words) for _ in range(rng.randint(1, 4)))
+        path += f"\\{rng.choice(words)}_{rng.randint(1, 999)}{rng.choice(exts)}"
+        if rng.random() < 0.5 and path.isascii():
+            out += b'\x00' + path.encode('ascii') + b'\x00'
+        else:
+            out += b'\x00\x00' + path.encode('utf-16-le') + b'\x00\x00'
+        if len(out) <= size:
+            embedded.add(path)
+    return bytes(out[:size]), embedded
+
+
+def measure(label: str, func, data: bytes, expected: Set[str], repeat: int = 3) -> SceneAssets:
+    """Запускает func(data) несколько раз и печатает лучшую пропускную способность"""
+    best = float('inf')
+    assets = None
+    for _ in range(repeat):
+        assets = SceneAssets(scene_path=Path('bench.max'))
+        started = time.perf_counter()
+        func(data, assets)
+        best = min(best, time.perf_counter() - started)
+    mb = len(data) / (1024 * 1024)
+    recall = len(expected & assets.all_assets) / len(expected) * 100 if expected else 100.0
+    print(f"   {label:<8} {best * 1000:9.1f} мс   {mb / best:8.1f} МБ/с   "
+          f"путей: {len(assets.all_assets):6d}   полнота: {recall:.1f}%")
+    return assets
+
+
+def main():
+    size_mb = int(sys.argv[1]) if len(sys.argv) > 1 else 32
+    data, expected = build_buffer(size_mb * 1024 * 1024)
+
+    print("=" * 60)
+    print(f"Сканирование буфера {size_mb} МБ")
+    print("=" * 60)
+
+    legacy = LegacyParser()
+    parser = MaxFileParser()
+
+    def scan_new(buffer: bytes, assets: SceneAssets):
+        for _, path_str, _ in parser._scan_window(buffer):
+            asset = parser._process_found_path(path_str, assets)
+            if asset is not None:
+                assets.add(asset.kind, asset.path)
+
+    before = measure("до", legacy.scan, data, expected)
+    after = measure("после", scan_new, data, expected)
+
+    # Сравниваем с эталоном, а не со старым сканером: тот, например,
+    # находил обрезанный "file.tif" внутри каждого "file.tiff"
+    lost = (expected & before.all_assets) - after.all_assets
+    if lost:
+        print(f"\n⚠️ Новый сканер потерял пути: {len(lost)}")
+        for p in sorted(lost)[:10]:
+            print(f"   {p}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Бенчмарк запуска командной строки (python -m core): медиана времени
+процесса от старта до выхода. Для сравнения - пустой интерпретатор.
+Проверяет также, что import core и python -m core не загружают PyQt6
+и модули анализа заранее.
+
+    python benchmarks/bench_startup.py [запусков] [предел, мс]
+"""
+
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+
+
+def measure(label: str, args, runs: int) -> float:
+    """Медиана времени процесса, мс"""
+    times = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        completed = subprocess.run([sys.executable, *args], cwd=ROOT,
+                                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        times.append((time.perf_counter() - started) * 1000)
+    median = statistics.median(times)
+    print(f"   {label:<34} {median:7.1f} мс   код выхода: {completed.returncode}")
+    return median
+
+
+def loaded_modules(code: str) -> set:
+    """Модули пакета и Qt, загруженные после выполнения code"""
+    check = (f"{code}\nimport sys\n"
+             "print('\\n'.join(m for m in sys.modules if m.startswith(('core.', 'ui', 'PyQt6'))))")
+    output = subprocess.run([sys.executable, '-c', check], cwd=ROOT,
+                            capture_output=True, text=True, check=True).stdout
+    return set(output.split())
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 15
+    limit = float(sys.argv[2]) if len(sys.argv) > 2 else 100.0
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache_file = os.path.join(tmp, "cache.sqlite")
+
+        print("=" * 60)
+        print(f"Запуск командной строки, медиана из {runs}")
+        print("=" * 60)
+
+        measure("python -c pass", ['-c', 'pass'], runs)
+        help_time = measure("python -m core --help", ['-m', 'core', '--help'], runs)
+        cache_time = measure("python -m core cache stats",
+                             ['-m', 'core', 'cache', 'stats', '--cache-file', cache_file], runs)
+        measure("python -m core analyze (пустая)",
+                ['-m', 'core', 'analyze', tmp, '--no-cache', '--no-inventory'], runs)
+
+    failed = False
+    for code in ("import core", "import core.__main__"):
+        extra = loaded_modules(code) - {'core.__main__'}
+        if extra:
+            print(f"\n⚠️ {code} загружает: {', '.join(sorted(extra))}")
+            failed = True
+
+    if max(help_time, cache_time) > limit:
+        print(f"\n⚠️ Запуск дольше {limit:.0f} мс")
+        failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Бенчмарк обхода папки проекта: последовательный walk_files против
+walk_files_parallel. Задержка сетевого ресурса имитируется паузой
+перед каждым листингом папки.
+
+    python benchmarks/bench_walker.py [папок] [файлов в папке] [задержка, мс]
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Добавляем путь к модулям
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core import folder_walker
+from core.folder_walker import walk_files, walk_files_parallel
+
+
+def build_tree(root: Path, folders: int, files_per_folder: int, seed: int = 0):
+    """Дерево папок глубиной до 4 уровней с пустыми файлами текстур"""
+    rng = random.Random(seed)
+    directories = [root]
+    for i in range(folders):
+        parent = rng.choice(directories[-50:]) if len(directories) > 1 else root
+        directory = parent / f"dir_{i}"
+        if len(directory.relative_to(root).parts) > 4:
+            directory = root / f"dir_{i}"
+        directory.mkdir()
+        directories.append(directory)
+        for j in range(files_per_folder):
+            (directory / f"tex_{j}.{rng.choice(['jpg', 'png', 'exr', 'txt'])}").touch()
+
+
+def measure(label: str, walk, root: Path, latency: float) -> set:
+    real_scandir = os.scandir
+
+    def slow_scandir(path):
+        time.sleep(latency)
+        return real_scandir(path)
+
+    folder_walker.os.scandir = slow_scandir
+    try:
+        started = time.perf_counter()
+        found = {walked.path for walked in walk(root, {'.jpg', '.png', '.exr'})}
+        elapsed = time.perf_counter() - started
+    finally:
+        folder_walker.os.scandir = real_scandir
+    print(f"   {label:<16} {elapsed:8.2f} с   файлов: {len(found)}")
+    return found
+
+
+def main():
+    folders = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    files_per_folder = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    latency = (float(sys.argv[3]) if len(sys.argv) > 3 else 5.0) / 1000
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        build_tree(root, folders, files_per_folder)
+
+        print("=" * 60)
+        print(f"Обход {folders} папок, задержка листинга {latency * 1000:.0f} мс")
+        print("=" * 60)
+
+        serial = measure("последовательно", walk_files, root, latency)
+        parallel = measure("параллельно", walk_files_parallel, root, latency)
+
+        if serial != parallel:
+            print(f"\n⚠️ Наборы файлов различаются: {len(serial ^ parallel)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,474 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Генератор синтетических .max файлов (OLE compound file) для бенчмарков парсера.
+
+Сцена - корректный составной файл с потоками, как у 3ds Max (Scene,
+ClassData, Config, ..., потоки свойств документа, по желанию таблица
+FileAssetMetaData2). В потоки между двоичным шумом вставлены пути
+ASCII и UTF-16 с префиксом длины; набор вставленных путей - эталон
+для оценки полноты парсера.
+
+    python benchmarks/max_corpus.py <папка> [--scenes N] [--stream-size МБ]
+"""
+
+import argparse
+import random
+import struct
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+
+SECTOR_SIZE = 512
+MINI_SECTOR_SIZE = 64
+MINI_STREAM_CUTOFF = 4096
+
+FREESECT = 0xFFFFFFFF
+ENDOFCHAIN = 0xFFFFFFFE
+FATSECT = 0xFFFFFFFD
+DIFSECT = 0xFFFFFFFC
+NOSTREAM = 0xFFFFFFFF
+
+OLE_MAGIC = b'\xD0\xCF\x11\xE0\xA1\xB1\x1A\xE1'
+
+TEXTURE_EXTS = ['.jpg', '.png', '.tga', '.tif', '.exr', '.hdr', '.psd', '.dds']
+PROXY_EXTS = ['.vrmesh', '.abc', '.cgeo']
+
+LATIN_WORDS = ['wood', 'metal', 'floor', 'wall', 'concrete', 'fabric', 'leather',
+               'glass', 'plaster', 'marble', 'oak', 'walnut', 'brick', 'tile']
+CYRILLIC_WORDS = ['дерево', 'металл', 'пол', 'стена', 'бетон', 'ткань', 'кожа',
+                  'стекло', 'мрамор', 'дуб', 'кирпич', 'плитка']
+SUFFIXES = ['diffuse', 'normal', 'rough', 'bump', 'refl', 'gloss', 'disp', 'ao']
+
+
+@dataclass
+class CorpusSpec:
+    """Параметры синтетической сцены"""
+    streams: int = 8
+    stream_size: int = 256 * 1024
+    # Количество путей на мегабайт данных
+    ascii_density: float = 40.0
+    utf16_density: float = 40.0
+    cyrillic_ratio: float = 0.2
+    unc_ratio: float = 0.1
+    # Доля случайных двоичных байтов в "шуме" между путями
+    noise_ratio: float = 0.5
+    # Чередовать сектора потоков (фрагментированные цепочки FAT)
+    fragmented: bool = False
+    seed: int = 0
+    # Сведения в потоках свойств документа
+    max_version: str = '26.00'
+    renderer: str = 'V-Ray 6, update 2'
+    author: str = 'artist'
+    thumbnail: bool = True
+
+
+@dataclass
+class GeneratedScene:
+    """Результат генерации: путь к файлу и эталонные пути"""
+    path: Path
+    size: int
+    textures: Set[str] = field(default_factory=set)
+    proxies: Set[str] = field(default_factory=set)
+    streams: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def all_assets(self) -> Set[str]:
+        return self.textures | self.proxies
+
+
+def _make_path(rng: random.Random, spec: CorpusSpec) -> Tuple[str, str]:
+    """Возвращает (путь, тип) для случайного ассета"""
+    words = CYRILLIC_WORDS if rng.random() < spec.cyrillic_ratio else LATIN_WORDS
+    if rng.random() < spec.unc_ratio:
+        root = f"\\\\{rng.choice(['nas01', 'storage', 'fs-render'])}\\{rng.choice(['library', 'projects'])}"
+    else:
+        root = f"{rng.choice('CDEFZ')}:"
+    depth = rng.randint(1, 4)
+    parts = [rng.choice(words) + (str(rng.randint(1, 99)) if rng.random() < 0.5 else '')
+             for _ in range(depth)]
+    if rng.random() < 0.8:
+        ext = rng.choice(TEXTURE_EXTS)
+        kind = 'texture'
+        name = f"{rng.choice(words)}_{rng.randint(1, 9999)}_{rng.choice(SUFFIXES)}{ext}"
+    else:
+        ext = rng.choice(PROXY_EXTS)
+        kind = 'proxy'
+        name = f"{rng.choice(words)}_{rng.randint(1, 9999)}{ext}"
+    return root + '\\' + '\\'.join(parts) + '\\' + name, kind
+
+
+def _noise(rng: random.Random, size: int, noise_ratio: float) -> bytes:
+    """Двоичный шум вперемешку с короткими ASCII-идентификаторами"""
+    out = bytearray()
+    while len(out) < size:
+        if rng.random() < noise_ratio:
+            out += rng.randbytes(rng.randint(8, 64))
+        else:
+            out += b'\x00' + rng.choice(LATIN_WORDS).encode('ascii') + b'\x00\x01'
+    return bytes(out[:size])
+
+
+def _build_stream(rng: random.Random, spec: CorpusSpec, size: int,
+                  scene: GeneratedScene) -> bytes:
+    """Строит поток заданного размера со встроенными путями"""
+    count_ascii = max(0, int(size / (1024 * 1024) * spec.ascii_density))
+    count_utf16 = max(0, int(size / (1024 * 1024) * spec.utf16_density))
+    records = []
+    for _ in range(count_ascii):
+        path, kind = _make_path(rng, spec)
+        try:
+            encoded = path.encode('ascii')
+        except UnicodeEncodeError:
+            encoded = path.encode('utf-16-le')
+        records.append((path, kind, struct.pack('<I', len(encoded)) + encoded + b'\x00'))
+    for _ in range(count_utf16):
+        path, kind = _make_path(rng, spec)
+        encoded = path.encode('utf-16-le')
+        records.append((path, kind, struct.pack('<I', len(path)) + encoded + b'\x00\x00'))
+
+    out = bytearray()
+    gap = max(16, (size - sum(len(r[2]) for r in records)) // (len(records) + 1))
+    for path, kind, blob in records:
+        out += _noise(rng, gap, spec.noise_ratio)
+        if len(out) + len(blob) > size:
+            break
+        out += blob
+        (scene.textures if kind == 'texture' else scene.proxies).add(path)
+    if len(out) < size:
+        out += _noise(rng, size - len(out), spec.noise_ratio)
+    return bytes(out[:size])
+
+
+def build_asset_metadata(entries: List[Tuple[str, str]]) -> bytes:
+    """Строит поток FileAssetMetaData2: GUID + тип + имя файла"""
+    out = bytearray()
+    for asset_type, file_name in entries:
+        out += random.Random(file_name).randbytes(16)
+        for value in (asset_type, file_name):
+            out += struct.pack('<I', len(value)) + value.encode('utf-16-le')
+    return bytes(out)
+
+
+# Потоки свойств документа (MS-OLEPS)
+FMTID_SUMMARY_INFORMATION = bytes.fromhex('e0859ff2f94f6810ab9108002b27b3d9')
+FMTID_DOC_SUMMARY_INFORMATION = bytes.fromhex('02d5cdd59c2e1b10939708002b2cf9ae')
+VT_I2 = 2
+VT_I4 = 3
+VT_VARIANT = 12
+VT_LPSTR = 30
+VT_FILETIME = 64
+VT_CF = 71
+VT_VECTOR = 0x1000
+CF_DIB = 8
+
+
+def _typed_value(vt: int, value) -> bytes:
+    """TypedPropertyValue: тип, выравнивание, данные кратные 4 байтам"""
+    if vt & VT_VECTOR:
+        body = struct.pack('<I', len(value))
+        for item in value:
+            if vt & ~VT_VECTOR == VT_VARIANT:
+                body += _typed_value(VT_LPSTR if isinstance(item, str) else VT_I4, item)
+            else:
+                body += _typed_value(vt & ~VT_VECTOR, item)[4:]
+    elif vt == VT_I2:
+        body = struct.pack('<h', value)
+    elif vt == VT_I4:
+        body = struct.pack('<i', value)
+    elif vt == VT_LPSTR:
+        raw = value.encode('cp1252') + b'\x00'
+        body = struct.pack('<I', len(raw)) + raw
+    elif vt == VT_FILETIME:
+        body = struct.pack('<Q', value)
+    elif vt == VT_CF:
+        body = struct.pack('<Ii', len(value) + 4, CF_DIB) + value
+    else:
+        raise ValueError(f"Тип {vt:#x} не поддерживается")
+    return struct.pack('<HH', vt, 0) + body.ljust((len(body) + 3) & ~3, b'\x00')
+
+
+def build_property_stream(fmtid: bytes, properties: List[Tuple[int, int, object]]) -> bytes:
+    """Поток свойств с одним набором: список (PID, тип, значение)"""
+    # Первым идёт кодовая страница строк VT_LPSTR
+    properties = [(1, VT_I2, 1252)] + list(properties)
+    values = [_typed_value(vt, value) for _, vt, value in properties]
+    offset = 8 + 8 * len(properties)
+    entries = b''
+    for (pid, _, _), value in zip(properties, values):
+        entries += struct.pack('<II', pid, offset)
+        offset += len(value)
+    section = struct.pack('<II', offset, len(properties)) + entries + b''.join(values)
+    header = struct.pack('<HHI', 0xFFFE, 0, 0x00020006) + b'\x00' * 16 + struct.pack('<I', 1)
+    return header + fmtid + struct.pack('<I', 48) + section
+
+
+def build_thumbnail(rng: random.Random, width: int = 64, height: int = 64) -> bytes:
+    """Миниатюра в формате CF_DIB: BITMAPINFOHEADER и 24-битные строки"""
+    row = (width * 3 + 3) & ~3
+    tint = rng.randrange(256)
+    pixels = bytearray()
+    for y in range(height):
+        line = bytearray()
+        for x in range(width):
+            line += bytes((x * 4 & 255, y * 4 & 255, tint))
+        pixels += line.ljust(row, b'\x00')
+    header = struct.pack('<IiiHHIIiiII', 40, width, height, 1, 24, 0, len(pixels), 0, 0, 0, 0)
+    return header + bytes(pixels)
+
+
+def build_summary_streams(rng: random.Random, spec: CorpusSpec) -> Dict[str, bytes]:
+    """\\x05SummaryInformation и \\x05DocumentSummaryInformation как у 3ds Max"""
+    # 2024-01-01 + случайное смещение, в сотнях наносекунд с 1601 года
+    saved = (133485408000000000 + rng.randrange(365 * 24 * 3600) * 10 ** 7)
+    summary = [
+        (2, VT_LPSTR, f"scene_{spec.seed:03d}"),
+        (4, VT_LPSTR, spec.author),
+        (8, VT_LPSTR, spec.author),
+        (13, VT_FILETIME, saved),
+        (18, VT_LPSTR, 'Autodesk 3ds Max'),
+    ]
+    if spec.thumbnail:
+        summary.append((17, VT_CF, build_thumbnail(rng)))
+
+    major = int(spec.max_version.split('.')[0])
+    parts = {
+        'General': [f"3ds Max Version: {spec.max_version}",
+                    f"Build: {major}.0.0.{rng.randint(1000, 9999)}",
+                    f"Saved As Version: {spec.max_version}"],
+        'Mesh Totals': [f"Vertices: {rng.randint(1000, 10 ** 7)}",
+                        f"Faces: {rng.randint(1000, 10 ** 7)}"],
+        'Render Data': [f"Renderer Name={spec.renderer}",
+                        f"Render Width={rng.choice([1920, 2560, 3840])}"],
+    }
+    heading_pairs = []
+    for heading, lines in parts.items():
+        heading_pairs += [heading, len(lines)]
+    doc_parts = [line for lines in parts.values() for line in lines]
+
+    return {
+        '\x05SummaryInformation': build_property_stream(FMTID_SUMMARY_INFORMATION, summary),
+        '\x05DocumentSummaryInformation': build_property_stream(FMTID_DOC_SUMMARY_INFORMATION, [
+            (12, VT_VECTOR | VT_VARIANT, heading_pairs),
+            (13, VT_VECTOR | VT_LPSTR, doc_parts),
+        ]),
+    }
+
+
+def _dir_entry(name: str, entry_type: int, start: int, size: int,
+               left: int = NOSTREAM, right: int = NOSTREAM, child: int = NOSTREAM) -> bytes:
+    """Запись каталога OLE (128 байт)"""
+    encoded = name.encode('utf-16-le')[:62] + b'\x00\x00'
+    return (encoded.ljust(64, b'\x00')
+            + struct.pack('<HBB', len(encoded), entry_type, 1)
+            + struct.pack('<III', left, right, child)
+            + b'\x00' * 16 + b'\x00' * 4 + b'\x00' * 16
+            + struct.pack('<IQ', start, size))
+
+
+def _sort_key(name: str) -> Tuple[int, str]:
+    return len(name), name.upper()
+
+
+def _build_tree(indices: List[int], names: Dict[int, str],
+                links: Dict[int, List[int]]) -> int:
+    """Строит сбалансированное дерево каталога, возвращает корень"""
+    if not indices:
+        return NOSTREAM
+    indices = sorted(indices, key=lambda i: _sort_key(names[i]))
+    mid = len(indices) // 2
+    node = indices[mid]
+    links[node] = [_build_tree(indices[:mid], names, links),
+                   _build_tree(indices[mid + 1:], names, links)]
+    return node
+
+
+def write_compound_file(path: Path, streams: Dict[str, bytes],
+                        fragmented: bool = False, seed: int = 0) -> int:
+    """Записывает плоский OLE compound file (версия 3, сектор 512 байт)"""
+    rng = random.Random(seed)
+    big = {n: d for n, d in streams.items() if len(d) >= MINI_STREAM_CUTOFF}
+    small = {n: d for n, d in streams.items() if len(d) < MINI_STREAM_CUTOFF}
+
+    # Мини-поток
+    ministream = bytearray()
+    minifat: List[int] = []
+    mini_start: Dict[str, int] = {}
+    for name, data in small.items():
+        count = (len(data) + MINI_SECTOR_SIZE - 1) // MINI_SECTOR_SIZE
+        if count == 0:
+            mini_start[name] = ENDOFCHAIN
+            continue
+        first = len(minifat)
+        mini_start[name] = first
+        minifat.extend(range(first + 1, first + count))
+        minifat.append(ENDOFCHAIN)
+        ministream += data.ljust(count * MINI_SECTOR_SIZE, b'\x00')
+
+    sectors: List[bytes] = []
+    fat: List[int] = []
+
+    def add_chain(chunks: List[bytes]) -> List[int]:
+        ids = []
+        for chunk in chunks:
+            ids.append(len(sectors))
+            sectors.append(chunk.ljust(SECTOR_SIZE, b'\x00'))
+            fat.append(FREESECT)
+        for a, b in zip(ids, ids[1:]):
+            fat[a] = b
+        if ids:
+            fat[ids[-1]] = ENDOFCHAIN
+        return ids
+
+    def split(data: bytes) -> List[bytes]:
+        return [data[i:i + SECTOR_SIZE] for i in range(0, len(data), SECTOR_SIZE)]
+
+    # Большие потоки (при fragmented - сектора чередуются)
+    big_start: Dict[str, int] = {}
+    if fragmented and big:
+        pending = {n: split(d) for n, d in big.items()}
+        order: Dict[str, List[int]] = {n: [] for n in big}
+        while pending:
+            name = rng.choice(list(pending))
+            take = rng.randint(1, 16)
+            chunks, pending[name] = pending[name][:take], pending[name][take:]
+            for chunk in chunks:
+                order[name].append(len(sectors))
+                sectors.append(chunk.ljust(SECTOR_SIZE, b'\x00'))
+                fat.append(FREESECT)
+            if not pending[name]:
+                del pending[name]
+        for name, ids in order.items():
+            for a, b in zip(ids, ids[1:]):
+                fat[a] = b
+            fat[ids[-1]] = ENDOFCHAIN
+            big_start[name] = ids[0]
+    else:
+        for name, data in big.items():
+            big_start[name] = add_chain(split(data))[0]
+
+    ministream_start = add_chain(split(bytes(ministream)))[0] if ministream else ENDOFCHAIN
+    minifat_bytes = b''.join(struct.pack('<I', v) for v in minifat)
+    minifat_ids = add_chain(split(minifat_bytes)) if minifat else []
+
+    # Каталог
+    names = {i + 1: name for i, name in enumerate(streams)}
+    links: Dict[int, List[int]] = {}
+    root_child = _build_tree(list(names), names, links)
+    entries = [_dir_entry('Root Entry', 5, ministream_start, len(ministream), child=root_child)]
+    for idx, name in names.items():
+        data = streams[name]
+        start = big_start[name] if name in big else mini_start[name]
+        left, right = links[idx]
+        entries.append(_dir_entry(name, 2, start, len(data), left, right))
+    while len(entries) % (SECTOR_SIZE // 128):
+        entries.append(b'\x00' * 64 + struct.pack('<HBB', 0, 0, 0)
+                       + struct.pack('<III', NOSTREAM, NOSTREAM, NOSTREAM) + b"\x00" * 48)
+    dir_ids = add_chain(split(b''.join(entries)))
+
+    # FAT и DIFAT
+    per_sector = SECTOR_SIZE // 4
+    fat_count = 0
+    difat_count = 0
+    while True:
+        total = len(sectors) + fat_count + difat_count
+        need_fat = (total + per_sector - 1) // per_sector
+        need_difat = max(0, (need_fat - 109 + per_sector - 2) // (per_sector - 1))
+        if need_fat == fat_count and need_difat == difat_count:
+            break
+        fat_count, difat_count = need_fat, need_difat
+    fat_ids = list(range(len(sectors), len(sectors) + fat_count))
+    difat_ids = list(range(fat_ids[-1] + 1 if fat_ids else len(sectors),
+                           (fat_ids[-1] + 1 if fat_ids else len(sectors)) + difat_count))
+    fat.extend([FATSECT] * fat_count)
+    fat.extend([DIFSECT] * difat_count)
+    fat.extend([FREESECT] * (fat_count * per_sector - len(fat)))
+    fat_bytes = b''.join(struct.pack('<I', v) for v in fat)
+    for chunk in split(fat_bytes):
+        sectors.append(chunk)
+
+    rest = fat_ids[109:]
+    for i, sid in enumerate(difat_ids):
+        part = rest[i * (per_sector - 1):(i + 1) * (per_sector - 1)]
+        part = part + [FREESECT] * (per_sector - 1 - len(part))
+        nxt = difat_ids[i + 1] if i + 1 < len(difat_ids) else ENDOFCHAIN
+        sectors.append(b''.join(struct.pack('<I', v) for v in part + [nxt]))
+
+    header_difat = fat_ids[:109] + [FREESECT] * (109 - len(fat_ids[:109]))
+    header = (OLE_MAGIC + b'\x00' * 16
+              + struct.pack('<HHHHH', 0x3E, 3, 0xFFFE, 9, 6) + b'\x00' * 6
+              + struct.pack('<IIIIIIIII', 0, fat_count, dir_ids[0], 0, MINI_STREAM_CUTOFF,
+                            minifat_ids[0] if minifat_ids else ENDOFCHAIN, len(minifat_ids),
+                            difat_ids[0] if difat_ids else ENDOFCHAIN, difat_count)
+              + b''.join(struct.pack('<I', v) for v in header_difat))
+    assert len(header) == SECTOR_SIZE
+
+    with open(path, 'wb') as f:
+        f.write(header)
+        for sector in sectors:
+            f.write(sector)
+    return SECTOR_SIZE * (1 + len(sectors))
+
+
+def generate_scene(path: Path, spec: Optional[CorpusSpec] = None,
+                   asset_metadata: bool = False) -> GeneratedScene:
+    """Генерирует синтетическую сцену и возвращает эталонный список путей"""
+    spec = spec or CorpusSpec()
+    rng = random.Random(spec.seed)
+    scene = GeneratedScene(path=Path(path), size=0)
+
+    streams: Dict[str, bytes] = {}
+    layout = ['Scene', 'ClassData', 'Config', 'VideoPostQueue', 'ScriptedCustAttribDefs',
+              'DllDirectory', 'ClassDirectory3']
+    for i in range(spec.streams):
+        name = layout[i] if i < len(layout) else f"CustomStream{i}"
+        size = spec.stream_size if i == 0 else max(256, int(spec.stream_size * rng.uniform(0.01, 0.3)))
+        streams[name] = _build_stream(rng, spec, size, scene)
+
+    streams.update(build_summary_streams(rng, spec))
+    if asset_metadata:
+        entries = [('Bitmap', p) for p in sorted(scene.textures)]
+        entries += [('Other', p) for p in sorted(scene.proxies)]
+        streams['FileAssetMetaData2'] = build_asset_metadata(entries)
+
+    scene.streams = {name: len(data) for name, data in streams.items()}
+    scene.size = write_compound_file(scene.path, streams, spec.fragmented, spec.seed)
+    return scene
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Генерация синтетических сцен .max")
+    parser.add_argument('output', type=Path, help="Папка для сцен")
+    parser.add_argument('--scenes', type=int, default=10)
+    parser.add_argument('--streams', type=int, default=8)
+    parser.add_argument('--stream-size', type=float, default=4.0, help="Размер потока Scene, МБ")
+    parser.add_argument('--ascii-density', type=float, default=40.0, help="ASCII путей на МБ")
+    parser.add_argument('--utf16-density', type=float, default=40.0, help="UTF-16 путей на МБ")
+    parser.add_argument('--cyrillic', type=float, default=0.2, help="Доля путей с кириллицей")
+    parser.add_argument('--unc', type=float, default=0.1, help="Доля UNC путей")
+    parser.add_argument('--noise', type=float, default=0.5, help="Доля двоичного шума")
+    parser.add_argument('--fragmented', action='store_true', help="Чередовать сектора потоков")
+    parser.add_argument('--metadata', action='store_true', help="Добавить FileAssetMetaData2")
+    args = parser.parse_args()
+
+    args.output.mkdir(parents=True, exist_ok=True)
+    for i in range(args.scenes):
+        spec = CorpusSpec(
+            streams=args.streams,
+            stream_size=int(args.stream_size * 1024 * 1024),
+            ascii_density=args.ascii_density,
+            utf16_density=args.utf16_density,
+            cyrillic_ratio=args.cyrillic,
+            unc_ratio=args.unc,
+            noise_ratio=args.noise,
+            fragmented=args.fragmented,
+            seed=i,
+        )
+        scene = generate_scene(args.output / f"scene_{i:03d}.max", spec, args.metadata)
+        print(f"{scene.path.name}: {scene.size / 1024 / 1024:.1f} МБ, "
+              f"текстур {len(scene.textures)}, прокси {len(scene.proxies)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,59 @@
-from .max_parser import MaxFileParser, SceneAssets
-from .asset_analyzer import AssetAnalyzer, AnalysisResult, FileInfo
-from .file_manager import FileManager, OrganizeResult
-from .backup_manager import BackupManager
-from .operation_history import OperationHistory, Operation, OperationType
-from .file_integrity import FileIntegrityChecker
-
-__all__ = [
-    'MaxFileParser', 'SceneAssets',
-    'AssetAnalyzer', 'AnalysisResult', 'FileInfo',
-    'FileManager', 'OrganizeResult',
-    'BackupManager',
-    'OperationHistory', 'Operation', 'OperationType',
-    'FileIntegrityChecker'
-]
+import importlib
+from typing import TYPE_CHECKING
+
+# Модули загружаются при первом обращении к имени: командной строке
+# (python -m core) не нужно заранее загружать парсер и анализатор
+_EXPORTS = {
+    'MaxFileParser': 'max_parser', 'SceneAssets': 'max_parser', 'ParseMode': 'max_parser',
+    'ParseProfile': 'max_parser', 'FoundAsset': 'max_parser',
+    'ParseCache': 'parse_cache',
+    'FolderInventory': 'folder_inventory',
+    'FolderWatcher': 'folder_watcher', 'FileEvent': 'folder_watcher',
+    'create_watcher': 'folder_watcher',
+    'DirectoryCache': 'dir_cache',
+    'PathMapper': 'path_mapper',
+    'SceneHeader': 'scene_header',
+    'PathTable': 'path_table', 'PathSet': 'path_table',
+    'AssetAnalyzer': 'asset_analyzer', 'AnalysisResult': 'asset_analyzer',
+    'FileInfo': 'asset_analyzer', 'FolderChanges': 'asset_analyzer',
+    'AnalysisDelta': 'asset_analyzer',
+    'AssetIndex': 'asset_index',
+    'FileManager': 'file_manager', 'OrganizeResult': 'file_manager',
+    'BackupManager': 'backup_manager',
+    'OperationHistory': 'operation_history', 'Operation': 'operation_history',
+    'OperationType': 'operation_history',
+    'FileIntegrityChecker': 'file_integrity',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
+
+
+if TYPE_CHECKING:
+    from .max_parser import MaxFileParser, SceneAssets, ParseMode, ParseProfile, FoundAsset
+    from .parse_cache import ParseCache
+    from .folder_inventory import FolderInventory
+    from .folder_watcher import FolderWatcher, FileEvent, create_watcher
+    from .dir_cache import DirectoryCache
+    from .path_mapper import PathMapper
+    from .scene_header import SceneHeader
+    from .path_table import PathTable, PathSet
+    from .asset_analyzer import (AssetAnalyzer, AnalysisResult, FileInfo, FolderChanges,
+                                 AnalysisDelta)
+    from .asset_index import AssetIndex
+    from .file_manager import FileManager, OrganizeResult
+    from .backup_manager import BackupManager
+    from .operation_history import OperationHistory, Operation, OperationType
+    from .file_integrity import FileIntegrityChecker
@@ -0,0 +1,495 @@
+"""
+Командная строка пакета core (без интерфейса и PyQt6)
+
+    python -m core analyze ПУТЬ       - анализ сцены или папки со сценами
+    python -m core report ПУТЬ        - сводка по ассетам (текст или JSON)
+    python -m core organize ПАПКА     - связанные файлы в maps, неиспользуемые в unused
+    python -m core update-paths ПАПКА - пути в сценах после перемещений (нужен 3ds Max)
+    python -m core cache stats        - размер кэша разбора сцен
+    python -m core cache clear        - очистить кэш разбора сцен
+
+Результат пишется в stdout (или в файл -o) одним объектом JSON
+(--format json) или по записи на строку (--format jsonl: у каждой записи
+поле type, последняя запись - summary). Ход работы с -v идёт в stderr.
+
+Коды выхода:
+    0 - выполнено, проблем нет
+    1 - выполнено, но есть проблемы: отсутствующие ассеты, ошибки разбора
+        сцен, неудачные операции
+    2 - неверные аргументы
+    3 - выполнить нельзя: путь не найден, нет 3ds Max, неверные правила путей
+
+Модули анализа загружаются только внутри команд, чтобы запуск (и --help)
+оставался быстрым.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+EXIT_OK = 0
+EXIT_ISSUES = 1
+EXIT_USAGE = 2
+EXIT_ERROR = 3
+
+# Значения ParseMode (без загрузки парсера ради списка вариантов)
+PARSE_MODES = ('fast', 'standard', 'exhaustive')
+
+# Списки документа -> тип записи в JSONL
+RECORD_TYPES = {
+    'scenes': 'scene',
+    'files': 'file',
+    'missing': 'missing',
+    'errors': 'error',
+    'folders': 'folder',
+    'operations': 'operation',
+    'integrity_errors': 'integrity_error',
+    'updates': 'update',
+}
+
+
+class CommandError(Exception):
+    """Команду выполнить нельзя (код выхода EXIT_ERROR)"""
+
+
+def _progress(args):
+    """Функция для сообщений о ходе работы: в stderr при -v"""
+    if not args.verbose:
+        return lambda message: None
+    return lambda message: print(message, file=sys.stderr, flush=True)
+
+
+def _write(args, document: dict):
+    """Выводит документ в формате args.format"""
+
+    if args.output:
+        out = open(args.output, 'w', encoding='utf-8', newline='\n')
+    else:
+        out = sys.stdout
+        if hasattr(out, 'reconfigure'):
+            # JSON всегда в UTF-8, независимо от кодовой страницы консоли
+            out.reconfigure(encoding='utf-8')
+    try:
+        if args.format == 'jsonl':
+            for key, items in document.items():
+                if key == 'summary':
+                    continue
+                for item in items:
+                    out.write(json.dumps({'type': RECORD_TYPES[key], **item},
+                                         ensure_ascii=False) + '\n')
+            out.write(json.dumps({'type': 'summary', **document['summary']},
+                                 ensure_ascii=False) + '\n')
+        else:
+            json.dump(document, out, ensure_ascii=False, indent=2)
+            out.write('\n')
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+
+def _existing_path(path: Path) -> Path:
+    path = Path(os.path.abspath(path))
+    if not path.exists():
+        raise CommandError(f"Путь не найден: {path}")
+    return path
+
+
+# --- анализ ---
+
+def _path_mapper(args):
+    """Правила перевода путей из --path-map/--path-map-file (None - из окружения)"""
+
+    if not args.path_map and not args.path_map_file:
+        return None
+    from .path_mapper import PathMapper, parse_rule
+
+    try:
+        mapper = PathMapper.load(args.path_map_file) if args.path_map_file else PathMapper()
+        for text in args.path_map:
+            mapper.add_rule(*parse_rule(text))
+    except (OSError, ValueError) as e:
+        raise CommandError(f"Правила перевода путей: {e}")
+    return mapper
+
+
+def _run_analysis(args):
+    """Анализ сцены (путь к .max) или папки со сценами"""
+
+    path = _existing_path(args.path)
+    mapper = _path_mapper(args)
+
+    from .asset_analyzer import AssetAnalyzer
+    from .max_parser import ParseMode
+
+    analyzer = AssetAnalyzer(use_cache=not args.no_cache, progress_callback=_progress(args),
+                             workers=args.workers, use_inventory=not args.no_inventory,
+                             path_mapper=mapper, full_rescan=args.full_rescan)
+    parse_mode = ParseMode(args.mode)
+    escalate = not args.no_escalate
+
+    started = time.perf_counter()
+    if path.is_file():
+        search_folder = _existing_path(args.search_folder) if args.search_folder else None
+        result = analyzer.analyze_single_scene(path, search_folder, parse_mode, escalate)
+    else:
+        result = analyzer.analyze_folder(path, args.recursive, parse_mode, escalate)
+    return result, time.perf_counter() - started
+
+
+def _analysis_summary(result, elapsed: float) -> dict:
+    return {
+        'folder': str(result.folder_path),
+        'scenes': len(result.scenes),
+        'used_assets': len(result.all_used_assets),
+        'files': len(result.all_files_info),
+        'linked': len(result.linked_files),
+        'unused': len(result.unused_files),
+        'missing': len(result.missing_files),
+        'errors': len(result.errors),
+        'parse_mode': result.parse_mode.value,
+        'elapsed': round(elapsed, 3),
+    }
+
+
+def _analysis_exit_code(result) -> int:
+    return EXIT_ISSUES if result.missing_files or result.errors else EXIT_OK
+
+
+def cmd_analyze(args) -> int:
+    """Анализ: сцены, файлы со статусом и отсутствующие ассеты"""
+
+    result, elapsed = _run_analysis(args)
+
+    scenes = []
+    for scene_path in result.scenes:
+        scene_assets = result.scene_details.get(scene_path)
+        record = {'path': str(scene_path)}
+        if scene_assets is not None:
+            record.update(textures=len(scene_assets.textures),
+                          proxies=len(scene_assets.proxies),
+                          other=len(scene_assets.other_assets),
+                          errors=list(scene_assets.errors),
+                          from_cache=scene_assets.from_cache)
+        scenes.append(record)
+
+    files = []
+    for path in sorted(result.all_files_info):
+        file_info = result.all_files_info[path]
+        if path in result.linked_files:
+            status = 'linked'
+        elif path in result.unused_files:
+            status = 'unused'
+        else:
+            status = 'other'
+        files.append({
+            'path': str(path),
+            'folder': file_info.folder,
+            'file_type': file_info.file_type,
+            'status': status,
+            'external': path in result.linked_external,
+            'size': file_info.size,
+            'references': list(file_info.used_in_scenes),
+        })
+
+    # Сцены, ссылающиеся на каждый отсутствующий путь
+    missing_scenes = {path: [] for path in result.missing_files}
+    for scene_path, scene_assets in result.scene_details.items():
+        for group in (scene_assets.textures, scene_assets.proxies, scene_assets.other_assets):
+            for path in group:
+                if path in missing_scenes:
+                    missing_scenes[path].append(str(scene_path))
+
+    _write(args, {
+        'summary': _analysis_summary(result, elapsed),
+        'scenes': scenes,
+        'files': files,
+        'missing': [{'path': path, 'scenes': sorted(set(scene_paths))}
+                    for path, scene_paths in sorted(missing_scenes.items())],
+        'errors': [{'message': error} for error in result.errors],
+    })
+    return _analysis_exit_code(result)
+
+
+def cmd_report(args) -> int:
+    """Сводка: итоги анализа и статистика по папкам"""
+
+    result, elapsed = _run_analysis(args)
+
+    if args.format == 'text':
+        from .file_manager import FileManager
+
+        report = FileManager().create_report(result)
+        if args.output:
+            with open(args.output, 'w', encoding='utf-8') as f:
+                f.write(report + '\n')
+        else:
+            print(report)
+    else:
+        _write(args, {
+            'summary': _analysis_summary(result, elapsed),
+            'folders': [{'folder': folder, **stats}
+                        for folder, stats in sorted(result.folder_stats.items())],
+        })
+    return _analysis_exit_code(result)
+
+
+def cmd_organize(args) -> int:
+    """Анализ и организация файлов проекта"""
+
+    from .file_manager import FileManager
+
+    started = time.perf_counter()
+    result, _ = _run_analysis(args)
+    if result.errors and not args.force:
+        # Ассеты сцены, которую не удалось разобрать, оказались бы в unused
+        raise CommandError(f"Сцены разобраны с ошибками ({len(result.errors)}), "
+                           f"организация отменена; --force - выполнить всё равно")
+
+    manager = FileManager(progress_callback=_progress(args), enable_backup=args.backup,
+                          check_integrity=not args.no_integrity)
+    organized = manager.organize_assets(result,
+                                        create_maps_folder=not args.no_maps,
+                                        move_unused=not args.keep_unused,
+                                        copy_instead_of_move=args.copy,
+                                        delete_duplicates=not args.keep_duplicates)
+
+    _write(args, {
+        'summary': {
+            'folder': str(result.folder_path),
+            'files_moved': organized.files_moved,
+            'duplicates_deleted': organized.duplicates_deleted,
+            'files_skipped': organized.files_skipped,
+            'succeeded': len(organized.successful_moves),
+            'failed': len(organized.failed_moves),
+            'integrity_errors': len(organized.integrity_errors),
+            'backup_id': organized.backup_id,
+            'maps_folder': str(organized.maps_folder) if organized.maps_folder else None,
+            'unused_folder': str(organized.unused_folder) if organized.unused_folder else None,
+            'elapsed': round(time.perf_counter() - started, 3),
+        },
+        'operations': [{'source': str(op.source), 'destination': str(op.destination),
+                        'action': op.action, 'success': op.success, 'error': op.error}
+                       for op in organized.operations],
+        'integrity_errors': list(organized.integrity_errors),
+    })
+    return EXIT_ISSUES if organized.failed_moves or organized.integrity_errors else EXIT_OK
+
+
+# --- обновление путей ---
+
+def _load_operations(path: Path) -> list:
+    """Операции из вывода organize (JSON или JSONL)"""
+
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            text = f.read()
+        try:
+            document = json.loads(text)
+            records = document.get('operations', []) if isinstance(document, dict) else []
+        except json.JSONDecodeError:
+            records = [record for record in map(json.loads, filter(str.strip, text.splitlines()))
+                       if record.get('type') == 'operation']
+    except (OSError, ValueError, AttributeError) as e:
+        raise CommandError(f"Операции не прочитаны из {path}: {e}")
+    return [record for record in records if record.get('success') and record.get('destination')]
+
+
+def _history_operations(folder: Path) -> list:
+    """Успешные перемещения и копирования папки из истории операций"""
+
+    from .operation_history import OperationHistory, OperationType
+
+    def in_folder(op) -> bool:
+        # Корень проекта записывается только при резервном копировании
+        if op.base_folder is not None:
+            return Path(op.base_folder) == folder
+        try:
+            Path(op.source).relative_to(folder)
+            return True
+        except ValueError:
+            return False
+
+    return [op for op in OperationHistory().operations
+            if op.success and op.destination is not None
+            and op.type in (OperationType.MOVE, OperationType.COPY) and in_folder(op)]
+
+
+def cmd_update_paths(args) -> int:
+    """Обновление путей в сценах по выполненным перемещениям"""
+
+    from .folder_walker import walk_files_parallel
+    from .max_path_updater import MaxPathUpdater
+
+    folder = _existing_path(args.path)
+    if args.operations:
+        operations = _load_operations(args.operations)
+    else:
+        operations = _history_operations(folder)
+
+    if args.scene:
+        scenes = [_existing_path(scene) for scene in args.scene]
+    else:
+        scenes = sorted(Path(walked.path) for walked in walk_files_parallel(
+            folder, {'.max'}, ('unused',), recursive=args.recursive))
+
+    updater = MaxPathUpdater(max_exe_path=args.max_exe, progress_callback=_progress(args))
+    updates = []
+    if operations and scenes:
+        if updater.max_exe_path is None or not updater.max_exe_path.exists():
+            raise CommandError("3dsmax.exe не найден, укажите --max-exe")
+        for scene_path in scenes:
+            mappings = updater.create_mappings_from_move_operations(operations, scene_path)
+            update = updater.update_scene_paths(scene_path, mappings)
+            updates.append({'scene': str(scene_path), 'success': update.success,
+                            'paths_updated': update.paths_updated, 'error': update.error})
+
+    failed = sum(1 for update in updates if not update['success'])
+    _write(args, {
+        'summary': {
+            'folder': str(folder),
+            'operations': len(operations),
+            'scenes': len(scenes),
+            'paths_updated': sum(update['paths_updated'] for update in updates),
+            'failed': failed,
+        },
+        'updates': updates,
+    })
+    return EXIT_ISSUES if failed else EXIT_OK
+
+
+# --- кэш ---
+
+def cmd_cache(args) -> int:
+    """Управление кэшем разбора сцен"""
+
+    from .parse_cache import ParseCache
+
+    cache = ParseCache(args.cache_file)
+    try:
+        if args.action == 'clear':
+            cache.clear()
+            print(f"Кэш очищен: {cache.cache_file}")
+        else:
+            stats = cache.get_stats()
+            print(f"Файл: {stats['cache_file']}")
+            print(f"Записей: {stats['entries']}, отпечатков потоков: {stats['stream_entries']}")
+            print(f"Размер: {stats['payload_size'] / 1024 / 1024:.1f} МБ "
+                  f"из {stats['max_size'] / 1024 / 1024:.0f} МБ")
+    finally:
+        cache.close()
+    return EXIT_OK
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m core",
+                                     description="3ds Max Asset Manager")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    def output_options(formats=('json', 'jsonl'), default='json') -> argparse.ArgumentParser:
+        options = argparse.ArgumentParser(add_help=False)
+        options.add_argument('--format', choices=formats, default=default,
+                             help=f"Формат вывода (по умолчанию {default})")
+        options.add_argument('-o', '--output', type=Path, default=None,
+                             help="Файл для результата (по умолчанию stdout)")
+        options.add_argument('-v', '--verbose', action='store_true',
+                             help="Ход работы в stderr")
+        return options
+
+    analysis = argparse.ArgumentParser(add_help=False)
+    analysis.add_argument('path', type=Path, help="Сцена .max или папка со сценами")
+    analysis.add_argument('-r', '--recursive', action='store_true',
+                          help="Искать сцены и в подпапках")
+    analysis.add_argument('--search-folder', type=Path, default=None,
+                          help="Папка проекта для одной сцены (по умолчанию - папка сцены)")
+    analysis.add_argument('--mode', choices=PARSE_MODES, default='standard',
+                          help="Глубина разбора сцен")
+    analysis.add_argument('--no-escalate', action='store_true',
+                          help="Не разбирать глубже сцены с неполным результатом")
+    analysis.add_argument('--workers', type=int, default=None,
+                          help="Процессов разбора (по умолчанию - по числу ядер)")
+    analysis.add_argument('--no-cache', action='store_true', help="Не использовать кэш разбора")
+    analysis.add_argument('--no-inventory', action='store_true',
+                          help="Не использовать опись папки проекта")
+    analysis.add_argument('--full-rescan', action='store_true',
+                          help="Обойти папку проекта целиком и обновить опись "
+                               "(после изменения файлов на месте)")
+    analysis.add_argument('--path-map', action='append', default=[], metavar='ПРЕФИКС=КОРЕНЬ',
+                          help="Перевод Windows-путей из сцен, например C:=/mnt/c "
+                               "(по умолчанию - из MAX_ASSET_PATH_MAP)")
+    analysis.add_argument('--path-map-file', type=Path, default=None,
+                          help="JSON-файл правил перевода путей")
+
+    analyze_parser = commands.add_parser('analyze', parents=[analysis, output_options()],
+                                         help="Анализ сцены или папки")
+    analyze_parser.set_defaults(func=cmd_analyze)
+
+    report_parser = commands.add_parser('report',
+                                        parents=[analysis, output_options(('text', 'json', 'jsonl'),
+                                                                          'text')],
+                                        help="Сводка по ассетам")
+    report_parser.set_defaults(func=cmd_report)
+
+    organize_parser = commands.add_parser('organize', parents=[analysis, output_options()],
+                                          help="Организация файлов проекта")
+    organize_parser.add_argument('--no-maps', action='store_true',
+                                 help="Не собирать связанные файлы в maps")
+    organize_parser.add_argument('--keep-unused', action='store_true',
+                                 help="Не перемещать неиспользуемые файлы в unused")
+    organize_parser.add_argument('--copy', action='store_true',
+                                 help="Копировать вместо перемещения")
+    organize_parser.add_argument('--keep-duplicates', action='store_true',
+                                 help="Не удалять дубликаты")
+    organize_parser.add_argument('--backup', action='store_true',
+                                 help="Резервная копия перед изменениями")
+    organize_parser.add_argument('--no-integrity', action='store_true',
+                                 help="Не проверять целостность изображений")
+    organize_parser.add_argument('--force', action='store_true',
+                                 help="Организовать, даже если сцены разобраны с ошибками")
+    organize_parser.set_defaults(func=cmd_organize)
+
+    update_parser = commands.add_parser('update-paths', parents=[output_options()],
+                                        help="Обновить пути в сценах после перемещений")
+    update_parser.add_argument('path', type=Path, help="Папка проекта")
+    update_parser.add_argument('--scene', action='append', type=Path, default=[],
+                               help="Сцена для обновления (по умолчанию - все сцены папки)")
+    update_parser.add_argument('-r', '--recursive', action='store_true',
+                               help="Искать сцены и в подпапках")
+    update_parser.add_argument('--operations', type=Path, default=None,
+                               help="Вывод organize (JSON/JSONL); по умолчанию - история операций")
+    update_parser.add_argument('--max-exe', type=Path, default=None,
+                               help="Путь к 3dsmax.exe (по умолчанию - поиск)")
+    update_parser.set_defaults(func=cmd_update_paths)
+
+    cache_parser = commands.add_parser('cache', help="Кэш разбора сцен")
+    cache_parser.add_argument('action', choices=['stats', 'clear'])
+    cache_parser.add_argument('--cache-file', type=Path, default=None,
+                              help="Файл кэша (по умолчанию - в папке кэша пользователя)")
+    cache_parser.set_defaults(func=cmd_cache)
+
+    return parser
+
+
+def main(argv=None) -> int:
+    for stream in (sys.stdout, sys.stderr):
+        if hasattr(stream, 'reconfigure'):
+            # Значки в сообщениях не должны ронять вывод в консоль с кодовой страницей
+            stream.reconfigure(errors='replace')
+    args = build_parser().parse_args(argv)
+    try:
+        return args.func(args)
+    except CommandError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return EXIT_ERROR
+    except KeyboardInterrupt:
+        return 130
+    except Exception:
+        import traceback
+        traceback.print_exc()
+        return EXIT_ERROR
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,10 +4,20 @@
 """
 
 import os
+import sqlite3
+from concurrent.futures import as_completed
 from pathlib import Path
-from typing import Dict, List, Set, Optional, Tuple
-from dataclasses import dataclass, field
-from .max_parser import MaxFileParser, SceneAssets
+from typing import Callable, Dict, Iterable, Iterator, List, Set, Optional, Tuple
+from dataclasses import dataclass, field, replace
+from .max_parser import MaxFileParser, SceneAssets, ParseMode
+from .asset_index import AssetIndex
+from .dir_cache import DirectoryCache
+from .folder_inventory import FolderInventory
+from .folder_walker import WalkedFile, walk_files, walk_files_parallel
+from .folder_watcher import CREATED, DELETED, RESCAN, FileEvent
+from .parse_cache import ParseCache
+from .path_mapper import PATH_MAP_ENV, PathMapper
+from .path_table import PathSet
 
 
 @dataclass
@@ -20,6 +30,10 @@ class FileInfo:
     file_type: str  # texture, proxy, other
     is_used: bool = False
     used_in_scenes: List[str] = field(default_factory=list)
+    # Данные stat, снятые при сканировании (None - неизвестны)
+    size: Optional[int] = None
+    mtime: Optional[float] = None
+    inode: Optional[int] = None
 
 
 @dataclass
@@ -29,9 +43,9 @@ class AnalysisResult:
     scenes: List[Path] = field(default_factory=list)
     
     # Все ассеты из всех сцен (пути как в сцене)
-    used_textures: Set[str] = field(default_factory=set)
-    used_proxies: Set[str] = field(default_factory=set)
-    used_other: Set[str] = field(default_factory=set)
+    used_textures: PathSet = field(default_factory=PathSet)
+    used_proxies: PathSet = field(default_factory=PathSet)
+    used_other: PathSet = field(default_factory=PathSet)
     
     # Файлы в папке (реальные пути)
     folder_textures: Set[Path] = field(default_factory=set)
@@ -40,7 +54,7 @@ class AnalysisResult:
     
     # Результаты сравнения
     unused_files: Set[Path] = field(default_factory=set)
-    missing_files: Set[str] = field(default_factory=set)
+    missing_files: PathSet = field(default_factory=PathSet)
     linked_files: Set[Path] = field(default_factory=set)
     
     # Детальная информация о каждом файле
@@ -56,8 +70,25 @@ class AnalysisResult:
     # Детали по каждой сцене
     scene_details: Dict[Path, SceneAssets] = field(default_factory=dict)
     
+    # Индекс связанных файлов (по имени и пути), строится при сравнении
+    linked_index: AssetIndex = field(default_factory=AssetIndex)
+    
+    # Индексы путей из сцен и файлов all_files_info по имени - для
+    # обновления статуса только затронутых имён
+    scene_index: AssetIndex = field(default_factory=AssetIndex)
+    file_index: AssetIndex = field(default_factory=AssetIndex)
+    # Файлы, найденные не обходом папки, а по полным путям из сцен
+    linked_external: Set[Path] = field(default_factory=set)
+    
+    # Параметры анализа для повторного разбора изменённых сцен:
+    # recursive_scenes - искать новые сцены в подпапках (None - набор
+    # сцен задан явно, новые сцены не добавляются)
+    parse_mode: ParseMode = ParseMode.STANDARD
+    escalate: bool = True
+    recursive_scenes: Optional[bool] = None
+    
     @property
-    def all_used_assets(self) -> Set[str]:
+    def all_used_assets(self) -> PathSet:
         return self.used_textures | self.used_proxies | self.used_other
     
     @property
@@ -67,10 +98,11 @@ class AnalysisResult:
     @property
     def used_asset_names(self) -> Set[str]:
         """Имена файлов из сцены (только имена, без пути)"""
+        used = self.all_used_assets
         names = set()
-        for p in self.all_used_assets:
+        for path_id in used.ids():
             try:
-                names.add(Path(p).name.lower())
+                names.add(used.table.lower_name(path_id))
             except (ValueError, OSError, AttributeError):
                 pass
         return names
@@ -90,6 +122,82 @@ class AnalysisResult:
         return result
 
 
+@dataclass
+class FolderChanges:
+    """Изменения на диске, прочитанные по событиям отслеживания папки"""
+    # Новые и изменённые файлы ассетов (со свежим stat)
+    files_updated: List[WalkedFile] = field(default_factory=list)
+    files_removed: List[Path] = field(default_factory=list)
+    dirs_removed: List[Path] = field(default_factory=list)
+    # Заново разобранные и удалённые сцены
+    scenes_parsed: List[SceneAssets] = field(default_factory=list)
+    scenes_removed: List[Path] = field(default_factory=list)
+    # Папка обойдена целиком: файлов и сцен, которых нет в списках, больше нет
+    full: bool = False
+
+    @property
+    def is_empty(self) -> bool:
+        return not (self.full or self.files_updated or self.files_removed or
+                    self.dirs_removed or self.scenes_parsed or self.scenes_removed)
+
+
+@dataclass
+class AnalysisDelta:
+    """Что изменилось в результате анализа после применения FolderChanges"""
+    added: List[FileInfo] = field(default_factory=list)
+    # Удалённые файлы - в последнем известном состоянии
+    removed: List[FileInfo] = field(default_factory=list)
+    # Изменённые файлы: (прежнее состояние, текущее)
+    changed: List[Tuple[FileInfo, FileInfo]] = field(default_factory=list)
+    scenes_updated: List[Path] = field(default_factory=list)
+    scenes_removed: List[Path] = field(default_factory=list)
+    missing_added: List[str] = field(default_factory=list)
+    missing_removed: List[str] = field(default_factory=list)
+
+    @property
+    def is_empty(self) -> bool:
+        return not (self.added or self.removed or self.changed or self.scenes_updated or
+                    self.scenes_removed or self.missing_added or self.missing_removed)
+
+
+class _ChangeRecorder:
+    """Прежнее состояние файлов и путей сцен, затронутых обновлением"""
+
+    def __init__(self, result: AnalysisResult):
+        self.result = result
+        self.files: Dict[Path, Optional[FileInfo]] = {}
+        self.missing: Dict[str, bool] = {}
+
+    def file(self, path: Path):
+        if path not in self.files:
+            info = self.result.all_files_info.get(path)
+            self.files[path] = (replace(info, used_in_scenes=list(info.used_in_scenes))
+                                if info is not None else None)
+
+    def ref(self, path: str):
+        if path not in self.missing:
+            self.missing[path] = path in self.result.missing_files
+
+    def delta(self) -> AnalysisDelta:
+        delta = AnalysisDelta()
+        for path, before in self.files.items():
+            after = self.result.all_files_info.get(path)
+            if before is None:
+                if after is not None:
+                    delta.added.append(after)
+            elif after is None:
+                delta.removed.append(before)
+            elif before != after:
+                delta.changed.append((before, after))
+        for path, was_missing in self.missing.items():
+            is_missing = path in self.result.missing_files
+            if is_missing and not was_missing:
+                delta.missing_added.append(path)
+            elif was_missing and not is_missing:
+                delta.missing_removed.append(path)
+        return delta
+
+
 class AssetAnalyzer:
     """Анализатор ассетов сцен и папок"""
     
@@ -119,12 +227,59 @@ class AssetAnalyzer:
     # Все поддерживаемые расширения
     ALL_EXTENSIONS = TEXTURE_EXTENSIONS | PROXY_EXTENSIONS | OTHER_EXTENSIONS
     
-    def __init__(self, debug: bool = False):
+    # Потоков для листинга папок (на сетевых ресурсах листинги ждут сервер)
+    WALK_THREADS = 8
+    
+    def __init__(self, debug: bool = False, use_cache: bool = True,
+                 cache: Optional[ParseCache] = None,
+                 progress_callback: Optional[Callable[[str], None]] = None,
+                 workers: Optional[int] = None,
+                 use_inventory: bool = True,
+                 path_mapper: Optional[PathMapper] = None,
+                 full_rescan: bool = False):
+        """
+        Args:
+            debug: Собирать отладочную информацию
+            use_cache: Брать результаты разбора неизменённых сцен из кэша
+            cache: Кэш разбора (если None, используется кэш пользователя)
+            progress_callback: Функция для сообщений о ходе анализа
+            workers: Число процессов для разбора сцен (None - по числу ядер,
+                1 - без отдельных процессов). Столько же процессов сканирует
+                поток сцены крупнее MaxFileParser.PARALLEL_SCAN_THRESHOLD
+            use_inventory: Хранить опись папки проекта и при повторном
+                анализе перечитывать только изменённые папки
+            path_mapper: Перевод Windows-путей из сцен в пути этой машины
+                (если None - правила из переменной MAX_ASSET_PATH_MAP)
+            full_rescan: Обойти папку проекта целиком и составить опись
+                заново (файлы, изменённые на месте, время папки не меняют)
+        """
         self.debug = debug
-        self.parser = MaxFileParser(debug=debug)
+        self.use_inventory = use_inventory
+        self.full_rescan = full_rescan
+        self.progress_callback = progress_callback
+        if path_mapper is None:
+            try:
+                path_mapper = PathMapper.from_env()
+            except (OSError, ValueError) as e:
+                self._log(f"⚠️ Правила перевода путей {PATH_MAP_ENV} не прочитаны: {e}")
+        self.path_mapper = path_mapper
+        self.workers = workers if workers is not None else (os.cpu_count() or 1)
+        if use_cache and cache is None:
+            cache = ParseCache()
+        self.parser = MaxFileParser(debug=debug, cache=cache if use_cache else None,
+                                    scan_workers=self.workers)
+    
+    def _log(self, message: str):
+        if self.progress_callback:
+            try:
+                self.progress_callback(message)
+            except Exception:
+                print(message)
     
     def analyze_single_scene(self, scene_path: Path, 
-                             search_folder: Optional[Path] = None) -> AnalysisResult:
+                             search_folder: Optional[Path] = None,
+                             parse_mode: ParseMode = ParseMode.STANDARD,
+                             escalate: bool = True) -> AnalysisResult:
         """Анализирует одну сцену и ВСЮ папку проекта"""
         
         if search_folder is None:
@@ -132,11 +287,13 @@ class AssetAnalyzer:
         
         result = AnalysisResult(
             folder_path=search_folder,
-            scenes=[scene_path]
+            scenes=[scene_path],
+            parse_mode=parse_mode,
+            escalate=escalate
         )
         
         # Парсим сцену
-        scene_assets = self.parser.parse_scene(scene_path)
+        scene_assets = self._parse_scene(scene_path, parse_mode, escalate)
         result.scene_details[scene_path] = scene_assets
         result.errors.extend(scene_assets.errors)
         result.debug_info.extend(scene_assets.debug_info)
@@ -158,16 +315,22 @@ class AssetAnalyzer:
         return result
     
     def analyze_folder(self, folder_path: Path, 
-                       recursive: bool = False) -> AnalysisResult:
-        """Анализирует папку с несколькими сценами"""
+                       recursive: bool = False,
+                       parse_mode: ParseMode = ParseMode.STANDARD,
+                       escalate: bool = True) -> AnalysisResult:
+        """
+        Анализирует папку с несколькими сценами.
+        
+        parse_mode задаёт глубину разбора сцен; при escalate сцены,
+        результат которых выглядит неполным, разбираются глубже.
+        """
         
-        result = AnalysisResult(folder_path=folder_path)
+        result = AnalysisResult(folder_path=folder_path, parse_mode=parse_mode,
+                                escalate=escalate, recursive_scenes=recursive)
         
         # Находим все .max файлы
-        if recursive:
-            max_files = list(folder_path.rglob('*.max'))
-        else:
-            max_files = list(folder_path.glob('*.max'))
+        max_files = sorted(Path(walked.path) for walked in walk_files_parallel(
+            folder_path, {'.max'}, recursive=recursive, threads=self.WALK_THREADS))
         
         result.scenes = max_files
         
@@ -175,9 +338,9 @@ class AssetAnalyzer:
             result.errors.append(f"В папке {folder_path} не найдено .max файлов")
             return result
         
-        # Парсим каждую сцену
-        for scene_path in max_files:
-            scene_assets = self.parser.parse_scene(scene_path)
+        # Парсим сцены (параллельно) и объединяем результаты по мере готовности
+        for scene_assets in self._parse_scenes(max_files, parse_mode, escalate):
+            scene_path = scene_assets.scene_path
             result.scene_details[scene_path] = scene_assets
             result.errors.extend(scene_assets.errors)
             result.debug_info.extend(scene_assets.debug_info)
@@ -198,6 +361,91 @@ class AssetAnalyzer:
         
         return result
     
+    def _parse_scenes(self, scenes: List[Path], parse_mode: ParseMode,
+                      escalate: bool) -> Iterator[SceneAssets]:
+        """
+        Парсит сцены, отдавая результаты по мере готовности.
+        
+        Результаты из кэша берутся сразу, остальные сцены разбираются
+        в пуле процессов: разбор на чистом Python упирается в процессор.
+        Крупные сцены запускаются первыми, чтобы не задерживать конец.
+        """
+        
+        total = len(scenes)
+        done = 0
+        pending = []
+        
+        for scene_path in scenes:
+            cached = self.parser.get_cached(scene_path, parse_mode)
+            if cached is not None and not (escalate and cached.looks_incomplete):
+                done += 1
+                self._log(f"   [{done}/{total}] {scene_path.name} (кэш)")
+                yield cached
+            else:
+                pending.append(scene_path)
+        
+        def scene_size(path: Path) -> int:
+            try:
+                return path.stat().st_size
+            except OSError:
+                return 0
+        
+        pending.sort(key=scene_size, reverse=True)
+        workers = min(self.workers, len(pending))
+        
+        if workers <= 1:
+            for scene_path in pending:
+                scene_assets = self._parse_scene(scene_path, parse_mode, escalate)
+                done += 1
+                self._log(f"   [{done}/{total}] {scene_path.name}")
+                yield scene_assets
+            return
+        
+        # Пул процессов загружает multiprocessing - только когда он нужен
+        from concurrent.futures import ProcessPoolExecutor
+        
+        cache = self.parser.cache
+        cache_file = cache.cache_file if cache is not None else None
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_parse_worker,
+                                 initargs=(self.debug, cache_file)) as pool:
+            futures = {
+                pool.submit(_parse_scene_in_worker, scene_path, parse_mode, escalate): scene_path
+                for scene_path in pending
+            }
+            for future in as_completed(futures):
+                scene_path = futures[future]
+                try:
+                    scene_assets = future.result()
+                except Exception as e:
+                    scene_assets = SceneAssets(scene_path=scene_path, parse_mode=parse_mode)
+                    scene_assets.errors.append(f"Ошибка парсинга {scene_path}: {e}")
+                done += 1
+                self._log(f"   [{done}/{total}] {scene_path.name}")
+                yield scene_assets
+    
+    def _parse_scene(self, scene_path: Path, parse_mode: ParseMode,
+                     escalate: bool) -> SceneAssets:
+        """Парсит сцену, при необходимости повторяя разбор в более глубоком режиме"""
+        
+        scene_assets = self.parser.parse_scene(scene_path, parse_mode)
+        
+        while escalate and scene_assets.looks_incomplete:
+            deeper = scene_assets.parse_mode.deeper()
+            if deeper is None:
+                break
+            
+            if self.debug:
+                scene_assets.debug_info.append(
+                    f"{scene_path.name}: результат режима {scene_assets.parse_mode.value} "
+                    f"неполный, повтор в режиме {deeper.value}")
+            
+            deep_assets = self.parser.parse_scene(scene_path, deeper)
+            deep_assets.mode_timings = {**scene_assets.mode_timings, **deep_assets.mode_timings}
+            deep_assets.debug_info = scene_assets.debug_info + deep_assets.debug_info
+            scene_assets = deep_assets
+        
+        return scene_assets
+    
     def _scan_folder_deep(self, folder_path: Path, result: AnalysisResult):
         """
         Глубокое сканирование папки - находит ВСЕ файлы ассетов
@@ -207,53 +455,16 @@ class AssetAnalyzer:
         if self.debug:
             result.debug_info.append(f"\n🔍 Сканирование папки: {folder_path}")
         
-        # Рекурсивно сканируем все подпапки
-        for file_path in folder_path.rglob('*'):
-            if not file_path.is_file():
-                continue
-            
-            # Пропускаем папку unused (если уже есть)
-            if 'unused' in file_path.parts:
-                continue
-            
-            ext = file_path.suffix.lower()
-            
-            # Пропускаем неподдерживаемые расширения
-            if ext not in self.ALL_EXTENSIONS:
-                continue
-            
-            # Определяем тип файла
-            if ext in self.TEXTURE_EXTENSIONS:
-                file_type = 'texture'
-                result.folder_textures.add(file_path)
-            elif ext in self.PROXY_EXTENSIONS:
-                file_type = 'proxy'
-                result.folder_proxies.add(file_path)
-            else:
-                file_type = 'other'
-                result.folder_other.add(file_path)
-            
-            # Определяем подпапку
-            try:
-                rel_path = file_path.relative_to(folder_path)
-                if len(rel_path.parts) > 1:
-                    subfolder = rel_path.parts[0]
-                else:
-                    subfolder = "(корень)"
-            except ValueError:
-                subfolder = "(корень)"
-            
-            # Создаём информацию о файле
-            file_info = FileInfo(
-                path=file_path,
-                name=file_path.name,
-                extension=ext,
-                folder=subfolder,
-                file_type=file_type
-            )
-            
-            result.all_files_info[file_path] = file_info
+        def on_error(error: OSError):
+            if self.debug:
+                result.debug_info.append(f"  ⚠ Не удалось прочитать папку: {error}")
         
+        # Рекурсивно сканируем все подпапки, кроме unused (если уже есть)
+        for walked in self._walk_folder(folder_path, on_error, result):
+            self._add_file(result, Path(walked.path), walked.name,
+                           walked.top_folder or "(корень)",
+                           walked.size, walked.mtime, walked.inode)
+
         if self.debug:
             result.debug_info.append(f"  Найдено текстур: {len(result.folder_textures)}")
             result.debug_info.append(f"  Найдено прокси: {len(result.folder_proxies)}")
@@ -263,164 +474,526 @@ class AssetAnalyzer:
             subfolders = set(f.folder for f in result.all_files_info.values())
             result.debug_info.append(f"  Подпапки: {subfolders}")
     
+    def _walk_folder(self, folder_path: Path, on_error: Callable[[OSError], None],
+                     result: AnalysisResult) -> Iterable[WalkedFile]:
+        """Файлы ассетов папки: из описи (перечитав изменённые папки) или обходом"""
+        
+        if self.use_inventory:
+            inventory = FolderInventory(folder_path)
+            try:
+                files = inventory.refresh(self.ALL_EXTENSIONS, ('unused',), on_error,
+                                          self.WALK_THREADS, full=self.full_rescan)
+                stats = inventory.last_refresh
+                self._log(f"📂 Опись папки: проверено папок {stats['dirs_checked']}, "
+                          f"перечитано {stats['dirs_listed']}, файлов {stats['files']}")
+                return files
+            except sqlite3.Error as e:
+                if self.debug:
+                    result.debug_info.append(f"  ⚠ Опись папки недоступна: {e}")
+            finally:
+                inventory.close()
+        
+        return walk_files_parallel(folder_path, self.ALL_EXTENSIONS, ('unused',), on_error,
+                                   threads=self.WALK_THREADS)
+    
+    def _add_file(self, result: AnalysisResult, file_path: Path, name: str, folder: str,
+                  size: Optional[int], mtime: Optional[float],
+                  inode: Optional[int]) -> FileInfo:
+        """Добавляет файл в результат: тип по расширению, наборы папки, индекс имён"""
+        
+        ext = os.path.splitext(name)[1].lower()
+        
+        # Определяем тип файла
+        if ext in self.TEXTURE_EXTENSIONS:
+            file_type = 'texture'
+            result.folder_textures.add(file_path)
+        elif ext in self.PROXY_EXTENSIONS:
+            file_type = 'proxy'
+            result.folder_proxies.add(file_path)
+        else:
+            file_type = 'other'
+            result.folder_other.add(file_path)
+        
+        # Создаём информацию о файле
+        file_info = FileInfo(
+            path=file_path,
+            name=name,
+            extension=ext,
+            folder=folder,
+            file_type=file_type,
+            size=size,
+            mtime=mtime,
+            inode=inode
+        )
+        
+        result.all_files_info[file_path] = file_info
+        result.file_index.add(file_path, name)
+        return file_info
+    
+    def _add_external_file(self, result: AnalysisResult, asset_path: Path,
+                           entry: os.DirEntry) -> FileInfo:
+        """FileInfo для файла, найденного по полному пути из сцены, а не обходом папки"""
+        
+        # Определяем подпапку относительно папки проекта или используем полный путь
+        try:
+            rel_path = asset_path.relative_to(result.folder_path)
+            if len(rel_path.parts) > 1:
+                subfolder = rel_path.parts[0]
+            else:
+                subfolder = "(корень)"
+        except ValueError:
+            # Файл вне папки проекта - используем родительскую папку
+            subfolder = f"(внешняя: {asset_path.parent.name})"
+        
+        stat = entry.stat()
+        result.linked_external.add(asset_path)
+        return self._add_file(result, asset_path, asset_path.name, subfolder,
+                              stat.st_size, stat.st_mtime, entry.inode())
+    
+    def _remove_file(self, result: AnalysisResult, file_path: Path,
+                     recorder: Optional[_ChangeRecorder] = None) -> Optional[str]:
+        """Удаляет файл из результата; возвращает ключ его имени"""
+        
+        if recorder is not None:
+            recorder.file(file_path)
+        file_info = result.all_files_info.pop(file_path, None)
+        if file_info is None:
+            return None
+        for group in (result.folder_textures, result.folder_proxies, result.folder_other,
+                      result.linked_files, result.unused_files, result.linked_external):
+            group.discard(file_path)
+        result.linked_index.discard(file_path)
+        result.file_index.discard(file_path)
+        return AssetIndex.name_key(file_info.name)
+    
     def _compare_assets(self, result: AnalysisResult):
         """Сравнивает используемые ассеты с файлами в папке"""
         
-        # Создаём индекс имён файлов из сцены
-        scene_names_index: Dict[str, List[str]] = {}
+        # Пути, Path и имена берутся из общей таблицы путей
+        used = result.all_used_assets
+        table = used.table
         
-        for asset_path in result.all_used_assets:
+        # Индекс путей из сцен по имени файла (индекс файлов папки
+        # заполнен при сканировании)
+        scene_index = AssetIndex()
+        for path_id in used.ids():
             try:
-                name = Path(asset_path).name.lower()
-                if name not in scene_names_index:
-                    scene_names_index[name] = []
-                scene_names_index[name].append(asset_path)
+                scene_index.add(table.path(path_id), table.lower_name(path_id))
             except Exception:
                 continue
+        result.scene_index = scene_index
+        
+        # Индекс связанных файлов: заполняется по ходу сравнения
+        result.linked_index = AssetIndex()
         
         if self.debug:
-            result.debug_info.append(f"\n📋 Имён в сцене: {len(scene_names_index)}")
+            result.debug_info.append(f"\n📋 Имён в сцене: {len(scene_index)}")
         
-        # Сначала проверяем файлы по полным путям из сцены (включая внешние библиотеки)
-        for asset_path_str in result.all_used_assets:
-            try:
-                asset_path = Path(asset_path_str)
-                # Проверяем, существует ли файл по пути из сцены
-                if asset_path.exists():
+        names = dict.fromkeys(scene_index.names())
+        names.update(dict.fromkeys(result.file_index.names()))
+        dir_cache = DirectoryCache()
+        self._classify_names(result, names, dir_cache)
+        
+        if self.debug:
+            result.debug_info.append(
+                f"📂 Проверка путей: {dir_cache.lookups} путей, папок прочитано: {dir_cache.dirs_listed}")
+            if self.path_mapper:
+                rules = ", ".join(f"{prefix} → {root}" for prefix, root in self.path_mapper.rules)
+                result.debug_info.append(f"🔀 Перевод путей: {rules}")
+    
+    def _classify_names(self, result: AnalysisResult, names: Iterable[str],
+                        dir_cache: DirectoryCache,
+                        recorder: Optional[_ChangeRecorder] = None):
+        """
+        Определяет статус файлов и путей из сцен с данными именами (ключи
+        AssetIndex): связан, не используется или отсутствует. Прежний
+        статус этих имён сбрасывается, поэтому так же считается и полное
+        сравнение, и обновление после изменений в папке.
+        
+        Существование путей из сцен проверяется по листингам папок из
+        dir_cache - каждая папка читается один раз за проход. Пути,
+        переведённые path_mapper, дальше учитываются как пути этой машины.
+        """
+        
+        table = result.used_textures.table
+        path_mapper = self.path_mapper or None
+        all_files = result.all_files_info
+        
+        for name in names:
+            refs = result.scene_index.by_name(name)
+            
+            # Сбрасываем прежний статус имени
+            for file_path in result.file_index.by_name(name):
+                if recorder is not None:
+                    recorder.file(file_path)
+                result.linked_files.discard(file_path)
+                result.unused_files.discard(file_path)
+                result.linked_index.discard(file_path)
+                file_info = all_files[file_path]
+                file_info.is_used = False
+                file_info.used_in_scenes = []
+            for asset_path_str in refs:
+                if recorder is not None:
+                    recorder.ref(asset_path_str)
+                result.missing_files.discard(asset_path_str)
+            
+            # Сначала проверяем файлы по полным путям из сцены (включая внешние библиотеки)
+            exact: Set[Path] = set()
+            not_found: List[str] = []
+            for asset_path_str in refs:
+                try:
+                    asset_path = table.as_path(table.intern(asset_path_str))
+                    # Проверяем, существует ли файл по пути из сцены
+                    if path_mapper is not None:
+                        entry = path_mapper.entry(asset_path_str, dir_cache)
+                    else:
+                        entry = dir_cache.entry(asset_path)
+                    if entry is None or not entry.is_file():
+                        not_found.append(asset_path_str)
+                        continue
+                    if path_mapper is not None:
+                        asset_path = table.as_path(table.intern(entry.path))
+                    exact.add(asset_path)
                     # Добавляем в linked_files, даже если он вне папки проекта
                     result.linked_files.add(asset_path)
+                    result.linked_index.add(asset_path, name)
                     
-                    # Если файл уже есть в all_files_info (найден при сканировании папки)
-                    if asset_path in result.all_files_info:
-                        file_info = result.all_files_info[asset_path]
-                        file_info.is_used = True
-                        file_info.used_in_scenes.append(asset_path_str)
-                    else:
+                    file_info = all_files.get(asset_path)
+                    if file_info is None:
                         # Файл из внешней библиотеки - создаём FileInfo для него
-                        ext = asset_path.suffix.lower()
-                        if ext in self.TEXTURE_EXTENSIONS:
-                            file_type = 'texture'
-                        elif ext in self.PROXY_EXTENSIONS:
-                            file_type = 'proxy'
-                        else:
-                            file_type = 'other'
-                        
-                        # Определяем подпапку относительно папки проекта или используем полный путь
-                        try:
-                            rel_path = asset_path.relative_to(result.folder_path)
-                            if len(rel_path.parts) > 1:
-                                subfolder = rel_path.parts[0]
-                            else:
-                                subfolder = "(корень)"
-                        except ValueError:
-                            # Файл вне папки проекта - используем родительскую папку
-                            subfolder = f"(внешняя: {asset_path.parent.name})"
-                        
-                        file_info = FileInfo(
-                            path=asset_path,
-                            name=asset_path.name,
-                            extension=ext,
-                            folder=subfolder,
-                            file_type=file_type,
-                            is_used=True,
-                            used_in_scenes=[asset_path_str]
-                        )
-                        result.all_files_info[asset_path] = file_info
-                        
-                        # Добавляем в соответствующие наборы
-                        if file_type == 'texture':
-                            result.folder_textures.add(asset_path)
-                        elif file_type == 'proxy':
-                            result.folder_proxies.add(asset_path)
-                        else:
-                            result.folder_other.add(asset_path)
-                        
+                        if recorder is not None:
+                            recorder.file(asset_path)
+                        file_info = self._add_external_file(result, asset_path, entry)
                         if self.debug:
                             result.debug_info.append(f"  ✓ Внешняя библиотека: {asset_path}")
-            except Exception as e:
-                if self.debug:
-                    result.debug_info.append(f"  ⚠ Ошибка проверки пути {asset_path_str}: {e}")
-                continue
+                    file_info.is_used = True
+                    file_info.used_in_scenes.append(asset_path_str)
+                except Exception as e:
+                    not_found.append(asset_path_str)
+                    if self.debug:
+                        result.debug_info.append(f"  ⚠ Ошибка проверки пути {asset_path_str}: {e}")
+            
+            # Остальные файлы с этим именем связаны по имени или не используются
+            for file_path in result.file_index.by_name(name):
+                if file_path in exact:
+                    continue
+                if file_path in result.linked_external:
+                    # Путь из сцены, по которому был найден файл, из сцен исчез
+                    self._remove_file(result, file_path, recorder)
+                    continue
+                
+                file_info = all_files[file_path]
+                if refs:
+                    result.linked_files.add(file_path)
+                    result.linked_index.add(file_path, name)
+                    file_info.is_used = True
+                    file_info.used_in_scenes = list(refs)
+                    
+                    if self.debug:
+                        result.debug_info.append(f"  ✓ {file_info.folder}/{file_info.name.lower()}")
+                else:
+                    result.unused_files.add(file_path)
+                    
+                    if self.debug:
+                        result.debug_info.append(f"  ✗ {file_info.folder}/{file_info.name.lower()}")
+            
+            # Файл считается отсутствующим, если:
+            # 1. Он не существует по полному пути из сцены
+            # 2. И его нет в linked_files (не был найден ни по полному пути, ни по имени в папке проекта)
+            if not_found and not result.linked_index.has_name(name):
+                for asset_path_str in not_found:
+                    result.missing_files.add(asset_path_str)
+    
+    def collect_changes(self, result: AnalysisResult,
+                        events: Iterable[FileEvent]) -> FolderChanges:
+        """
+        Читает с диска то, что изменилось по событиям отслеживания папки:
+        stat новых и изменённых файлов, обход новых папок, разбор
+        изменённых сцен. Сам результат не меняется - изменения применяет
+        apply_changes (например, в потоке интерфейса).
+        """
+        
+        changes = FolderChanges()
+        files: Set[str] = set()
+        scenes: Set[str] = set()
         
-        # Проверяем каждый файл в папке проекта
-        for file_path, file_info in result.all_files_info.items():
-            # Пропускаем файлы, которые уже обработаны выше
-            if file_info.is_used:
+        for event in events:
+            if event.kind == RESCAN:
+                return self._collect_all(result)
+            
+            if event.is_dir:
+                if event.kind == DELETED:
+                    changes.dirs_removed.append(Path(event.path))
+                    prefix = os.path.join(event.path, '')
+                    scenes.update(str(scene) for scene in result.scenes
+                                  if str(scene).startswith(prefix))
+                elif event.kind == CREATED:
+                    # Папка создана или перенесена в проект - обходим её
+                    files.update(walked.path for walked in walk_files(
+                        event.path, self.ALL_EXTENSIONS, ('unused',)))
+                    if result.recursive_scenes:
+                        scenes.update(walked.path for walked in walk_files(event.path, {'.max'}))
                 continue
-                
-            file_name = file_path.name.lower()
             
-            # Ищем по имени файла
-            if file_name in scene_names_index:
-                result.linked_files.add(file_path)
-                file_info.is_used = True
-                file_info.used_in_scenes = scene_names_index[file_name]
-                
-                if self.debug:
-                    result.debug_info.append(f"  ✓ {file_info.folder}/{file_name}")
+            ext = os.path.splitext(event.path)[1].lower()
+            if ext == '.max':
+                scenes.add(event.path)
+            elif ext in self.ALL_EXTENSIONS:
+                files.add(event.path)
+        
+        # Итог по текущему состоянию диска: порядок событий не важен
+        for path in sorted(files):
+            walked = self._stat_folder_file(result.folder_path, path)
+            if walked is None:
+                changes.files_removed.append(Path(path))
             else:
-                result.unused_files.add(file_path)
-                file_info.is_used = False
-                
-                if self.debug:
-                    result.debug_info.append(f"  ✗ {file_info.folder}/{file_name}")
+                changes.files_updated.append(walked)
+        
+        to_parse = []
+        for path in sorted(scenes):
+            scene_path = Path(path)
+            if not os.path.isfile(path):
+                if scene_path in result.scene_details:
+                    changes.scenes_removed.append(scene_path)
+            elif self._is_watched_scene(result, scene_path):
+                to_parse.append(scene_path)
+        if to_parse:
+            changes.scenes_parsed = list(self._parse_scenes(to_parse, result.parse_mode,
+                                                            result.escalate))
+        return changes
+    
+    def _collect_all(self, result: AnalysisResult) -> FolderChanges:
+        """Полный пересмотр папки (события потеряны)"""
+        
+        changes = FolderChanges(full=True)
+        changes.files_updated = list(walk_files_parallel(
+            result.folder_path, self.ALL_EXTENSIONS, ('unused',), threads=self.WALK_THREADS))
+        
+        if result.recursive_scenes is None:
+            scenes = [scene for scene in result.scenes if scene.is_file()]
+        else:
+            scenes = sorted(Path(walked.path) for walked in walk_files_parallel(
+                result.folder_path, {'.max'}, recursive=result.recursive_scenes,
+                threads=self.WALK_THREADS))
+        # Неизменённые сцены берутся из кэша разбора
+        changes.scenes_parsed = list(self._parse_scenes(scenes, result.parse_mode,
+                                                        result.escalate))
+        return changes
+    
+    @staticmethod
+    def _stat_folder_file(folder_path: Path, path: str) -> Optional[WalkedFile]:
+        """Файл ассета папки со свежим stat; None - файла нет или он вне анализа"""
+        
+        parts = Path(os.path.relpath(path, folder_path)).parts
+        if not parts or parts[0] == os.pardir or 'unused' in parts[:-1]:
+            return None
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        if not os.path.isfile(path):
+            return None
+        top_folder = parts[0] if len(parts) > 1 else ''
+        return WalkedFile(path, parts[-1], top_folder, stat.st_size, stat.st_mtime,
+                          stat.st_ino)
+    
+    @staticmethod
+    def _is_watched_scene(result: AnalysisResult, scene_path: Path) -> bool:
+        """Сцена входит в анализ (уже разобрана или попадает под поиск сцен)"""
+        
+        if scene_path in result.scene_details or result.recursive_scenes is None:
+            return scene_path in result.scene_details
+        if not result.recursive_scenes:
+            return scene_path.parent == result.folder_path
+        try:
+            scene_path.relative_to(result.folder_path)
+            return True
+        except ValueError:
+            return False
+    
+    def apply_changes(self, result: AnalysisResult, changes: FolderChanges) -> AnalysisDelta:
+        """
+        Применяет изменения на диске к результату анализа. Статус
+        пересчитывается только для имён, которых коснулись изменения:
+        новых, удалённых файлов и путей, появившихся или исчезнувших в сценах.
+        """
+        
+        recorder = _ChangeRecorder(result)
+        names: Set[str] = set()
+        
+        # Сцены
+        removed_scenes = list(changes.scenes_removed)
+        if changes.full:
+            parsed = {scene_assets.scene_path for scene_assets in changes.scenes_parsed}
+            removed_scenes.extend(scene for scene in result.scenes if scene not in parsed)
+        for scene_path in removed_scenes:
+            if scene_path in result.scenes:
+                result.scenes.remove(scene_path)
+            old_assets = result.scene_details.pop(scene_path, None)
+            if old_assets is not None:
+                self._forget_errors(result, old_assets)
+        
+        for scene_assets in changes.scenes_parsed:
+            scene_path = scene_assets.scene_path
+            old_assets = result.scene_details.get(scene_path)
+            if old_assets is not None:
+                self._forget_errors(result, old_assets)
+            result.scene_details[scene_path] = scene_assets
+            result.errors.extend(scene_assets.errors)
+            if scene_path not in result.scenes:
+                result.scenes.append(scene_path)
+                result.scenes.sort()
+        
+        if removed_scenes or changes.scenes_parsed:
+            names |= self._update_used_assets(result, recorder)
         
-        # Определяем отсутствующие файлы
-        # Файл считается отсутствующим, если:
-        # 1. Он не существует по полному пути из сцены
-        # 2. И его нет в linked_files (не был найден ни по полному пути, ни по имени в папке проекта)
-        for asset_path_str in result.all_used_assets:
+        # Файлы
+        removed_files = list(changes.files_removed)
+        for directory in changes.dirs_removed:
+            prefix = os.path.join(str(directory), '')
+            removed_files.extend(path for path in result.all_files_info
+                                 if str(path).startswith(prefix))
+        if changes.full:
+            present = {Path(walked.path) for walked in changes.files_updated}
+            removed_files.extend(path for path in result.all_files_info
+                                 if path not in present and path not in result.linked_external)
+        for file_path in removed_files:
+            name = self._remove_file(result, file_path, recorder)
+            if name is not None:
+                names.add(name)
+        
+        for walked in changes.files_updated:
+            file_path = Path(walked.path)
+            recorder.file(file_path)
+            file_info = result.all_files_info.get(file_path)
+            if file_info is None:
+                file_info = self._add_file(result, file_path, walked.name,
+                                           walked.top_folder or "(корень)",
+                                           walked.size, walked.mtime, walked.inode)
+                names.add(AssetIndex.name_key(file_info.name))
+            else:
+                # Изменение содержимого статус не меняет
+                file_info.size = walked.size
+                file_info.mtime = walked.mtime
+                file_info.inode = walked.inode
+                if file_path in result.linked_external:
+                    # Файл по пути из сцены теперь найден и обходом папки
+                    result.linked_external.discard(file_path)
+                    file_info.folder = walked.top_folder or "(корень)"
+        
+        self._classify_names(result, names, DirectoryCache(), recorder)
+        
+        delta = recorder.delta()
+        delta.scenes_updated = [scene_assets.scene_path for scene_assets in changes.scenes_parsed]
+        delta.scenes_removed = removed_scenes
+        self._update_stats(result, delta)
+        return delta
+    
+    @staticmethod
+    def _forget_errors(result: AnalysisResult, scene_assets: SceneAssets):
+        """Убирает из результата ошибки прежнего разбора сцены"""
+        for error in scene_assets.errors:
             try:
-                asset_path_obj = Path(asset_path_str)
-                
-                # Проверяем, был ли файл найден
-                found = False
-                # Проверяем по полному пути
-                if asset_path_obj in result.linked_files:
-                    found = True
-                else:
-                    # Проверяем, есть ли файл с таким именем в linked_files
-                    asset_name = asset_path_obj.name.lower()
-                    for linked_file in result.linked_files:
-                        if linked_file.name.lower() == asset_name:
-                            found = True
-                            break
-                
-                # Если файл не найден и не существует по полному пути
-                if not found and not asset_path_obj.exists():
-                    result.missing_files.add(asset_path_str)
-                        
-            except Exception:
-                # В случае ошибки считаем файл отсутствующим
-                result.missing_files.add(asset_path_str)
+                result.errors.remove(error)
+            except ValueError:
+                pass
+    
+    def _update_used_assets(self, result: AnalysisResult,
+                            recorder: _ChangeRecorder) -> Set[str]:
+        """
+        Пересобирает ассеты сцен из scene_details; возвращает ключи имён
+        путей, которые появились в сценах или исчезли из них
+        """
+        
+        old_ids = set(result.all_used_assets.ids())
+        result.used_textures = PathSet()
+        result.used_proxies = PathSet()
+        result.used_other = PathSet()
+        for scene_assets in result.scene_details.values():
+            result.used_textures.update(scene_assets.textures)
+            result.used_proxies.update(scene_assets.proxies)
+            result.used_other.update(scene_assets.other_assets)
+        
+        used = result.all_used_assets
+        table = used.table
+        new_ids = set(used.ids())
+        
+        names = set()
+        for path_id in new_ids - old_ids:
+            name = table.lower_name(path_id)
+            result.scene_index.add(table.path(path_id), name)
+            names.add(AssetIndex.name_key(name))
+        for path_id in old_ids - new_ids:
+            asset_path_str = table.path(path_id)
+            recorder.ref(asset_path_str)
+            result.missing_files.discard(asset_path_str)
+            result.scene_index.discard(asset_path_str)
+            names.add(AssetIndex.name_key(table.lower_name(path_id)))
+        return names
+    
+    @staticmethod
+    def _count_file(folder_stats: Dict[str, Dict[str, int]], file_info: FileInfo,
+                    sign: int = 1):
+        """Добавляет файл в статистику папки (sign=-1 - убирает)"""
+        
+        folder = file_info.folder
+        
+        if folder not in folder_stats:
+            folder_stats[folder] = {
+                'total': 0,
+                'used': 0,
+                'unused': 0,
+                'textures': 0,
+                'proxies': 0,
+                'other': 0
+            }
+        
+        stats = folder_stats[folder]
+        stats['total'] += sign
+        
+        if file_info.is_used:
+            stats['used'] += sign
+        else:
+            stats['unused'] += sign
+        
+        if file_info.file_type == 'texture':
+            stats['textures'] += sign
+        elif file_info.file_type == 'proxy':
+            stats['proxies'] += sign
+        else:
+            stats['other'] += sign
+        
+        if stats['total'] <= 0:
+            del folder_stats[folder]
     
     def _collect_stats(self, result: AnalysisResult):
         """Собирает статистику по папкам"""
         
         for file_info in result.all_files_info.values():
-            folder = file_info.folder
-            
-            if folder not in result.folder_stats:
-                result.folder_stats[folder] = {
-                    'total': 0,
-                    'used': 0,
-                    'unused': 0,
-                    'textures': 0,
-                    'proxies': 0,
-                    'other': 0
-                }
-            
-            stats = result.folder_stats[folder]
-            stats['total'] += 1
-            
-            if file_info.is_used:
-                stats['used'] += 1
-            else:
-                stats['unused'] += 1
-            
-            if file_info.file_type == 'texture':
-                stats['textures'] += 1
-            elif file_info.file_type == 'proxy':
-                stats['proxies'] += 1
-            else:
-                stats['other'] += 1
+            self._count_file(result.folder_stats, file_info)
+    
+    def _update_stats(self, result: AnalysisResult, delta: AnalysisDelta):
+        """Обновляет статистику по папкам по изменениям файлов"""
+        
+        for file_info in delta.removed + [before for before, _ in delta.changed]:
+            self._count_file(result.folder_stats, file_info, -1)
+        for file_info in delta.added + [after for _, after in delta.changed]:
+            self._count_file(result.folder_stats, file_info)
+
+
+# Анализатор процесса пула: создаётся один раз на процесс
+_worker_analyzer: Optional[AssetAnalyzer] = None
+
+
+def _init_parse_worker(debug: bool, cache_file: Optional[Path]):
+    """Инициализация процесса пула разбора сцен"""
+    global _worker_analyzer
+    cache = ParseCache(cache_file) if cache_file is not None else None
+    _worker_analyzer = AssetAnalyzer(debug=debug, use_cache=cache is not None,
+                                     cache=cache, workers=1)
+
+
+def _parse_scene_in_worker(scene_path: Path, parse_mode: ParseMode,
+                           escalate: bool) -> SceneAssets:
+    """Разбор одной сцены в процессе пула"""
+    return _worker_analyzer._parse_scene(scene_path, parse_mode, escalate)
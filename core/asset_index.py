@@ -0,0 +1,120 @@
+"""
+Индекс файлов ассетов для сравнения сцен с папкой проекта.
+
+Файлы индексируются по имени без учёта регистра, по нормализованному
+полному пути и, если хэш содержимого известен, по хэшу. Все поиски -
+обращения к словарю, поэтому сравнение десятков тысяч ссылок из сцен
+с десятками тысяч файлов остаётся линейным.
+"""
+
+import ntpath
+import os
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+AssetRef = Union[str, Path]
+
+
+class AssetIndex:
+    """Индекс файлов (или путей из сцен) по имени, пути и хэшу содержимого"""
+
+    def __init__(self):
+        self._paths: Dict[str, AssetRef] = {}
+        self._by_name: Dict[str, List[AssetRef]] = {}
+        self._by_path: Dict[str, AssetRef] = {}
+        self._by_hash: Dict[str, List[AssetRef]] = {}
+        # Ключ имени и хэш каждого файла - для удаления
+        self._keys: Dict[str, Tuple[str, Optional[str]]] = {}
+
+    @staticmethod
+    def name_key(name: str) -> str:
+        """Ключ имени файла: без учёта регистра (как в Windows)"""
+        return name.casefold()
+
+    @staticmethod
+    def path_key(path: AssetRef) -> str:
+        """
+        Ключ полного пути: разделители и регистр приведены к виду
+        Windows, откуда приходят пути сцен
+        """
+        return ntpath.normcase(ntpath.normpath(os.fspath(path)))
+
+    def add(self, path: AssetRef, name: Optional[str] = None,
+            content_hash: Optional[str] = None):
+        """
+        Добавляет файл. name - имя файла, если уже известно
+        (по умолчанию берётся из пути)
+        """
+
+        raw = os.fspath(path)
+        if raw in self._paths:
+            return
+        self._paths[raw] = path
+        # На POSIX файлы, различающиеся только регистром, - разные файлы;
+        # по ключу пути находится первый из них
+        self._by_path.setdefault(self.path_key(raw), path)
+
+        if name is None:
+            name = ntpath.basename(os.fspath(path))
+        name_key = self.name_key(name)
+        self._keys[raw] = (name_key, content_hash)
+        self._by_name.setdefault(name_key, []).append(path)
+        if content_hash is not None:
+            self._by_hash.setdefault(content_hash, []).append(path)
+
+    def discard(self, path: AssetRef):
+        """Удаляет файл из индекса (если он есть)"""
+
+        raw = os.fspath(path)
+        stored = self._paths.pop(raw, None)
+        if stored is None:
+            return
+        name_key, content_hash = self._keys.pop(raw)
+        self._remove(self._by_name, name_key, stored)
+        if content_hash is not None:
+            self._remove(self._by_hash, content_hash, stored)
+
+        path_key = self.path_key(raw)
+        if self._by_path.get(path_key) is stored:
+            del self._by_path[path_key]
+            # Путь мог совпадать по ключу с другим файлом - он и остаётся
+            for other in self._by_name.get(name_key, ()):
+                if self.path_key(other) == path_key:
+                    self._by_path[path_key] = other
+                    break
+
+    @staticmethod
+    def _remove(groups: Dict[str, List[AssetRef]], key: str, path: AssetRef):
+        group = groups.get(key)
+        if group is not None:
+            group.remove(path)
+            if not group:
+                del groups[key]
+
+    def names(self) -> List[str]:
+        """Ключи имён всех файлов индекса"""
+        return list(self._by_name)
+
+    def has_name(self, name: str) -> bool:
+        return self.name_key(name) in self._by_name
+
+    def by_name(self, name: str) -> List[AssetRef]:
+        """Файлы с таким именем (в любом регистре)"""
+        return list(self._by_name.get(self.name_key(name), ()))
+
+    def find_path(self, path: AssetRef) -> Optional[AssetRef]:
+        """Файл по полному пути (без учёта регистра и вида разделителей)"""
+        return self._by_path.get(self.path_key(path))
+
+    def by_hash(self, content_hash: str) -> List[AssetRef]:
+        """Файлы с таким содержимым"""
+        return list(self._by_hash.get(content_hash, ()))
+
+    def __contains__(self, path: AssetRef) -> bool:
+        return self.path_key(path) in self._by_path
+
+    def __len__(self) -> int:
+        return len(self._paths)
+
+    def __iter__(self) -> Iterator[AssetRef]:
+        return iter(self._paths.values())
@@ -0,0 +1,101 @@
+"""
+Декодер потока FileAssetMetaData2/3 - таблицы внешних файлов,
+которую 3ds Max ведёт для Asset Tracking.
+
+Запись таблицы: GUID (16 байт), затем строки UTF-16 LE, каждая
+с префиксом длины в символах (uint32): тип ассета и путь к файлу.
+В FileAssetMetaData3 после пути идёт ещё одна строка.
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple
+
+
+# Имена потоков в порядке предпочтения
+ASSET_METADATA_STREAMS = ('FileAssetMetaData3', 'FileAssetMetaData2')
+
+GUID_SIZE = 16
+# Ограничение длины строки: пути в Windows короче 32767 символов
+MAX_STRING_CHARS = 32767
+
+# Тип ассета - короткий идентификатор вида Bitmap, Photometric, XRef
+_ASSET_TYPE_RE = re.compile(r'[A-Za-z][A-Za-z0-9_ ]{0,63}')
+_CONTROL_CHARS_RE = re.compile(r'[\x00-\x1f]')
+
+
+@dataclass
+class AssetRecord:
+    """Запись таблицы ассетов сцены"""
+    guid: bytes
+    asset_type: str
+    path: str
+    # Дополнительные строки записи (FileAssetMetaData3)
+    extra: List[str] = field(default_factory=list)
+    # Смещение записи в потоке
+    offset: int = 0
+
+
+def parse_asset_metadata(data: bytes, stream_name: str = '') -> Optional[List[AssetRecord]]:
+    """
+    Разбирает таблицу ассетов.
+
+    Число строк в записи зависит от версии потока; пробуем сначала
+    вариант по имени потока, затем другой. Возвращает None, если
+    поток не разбирается целиком - тогда нужен эвристический поиск.
+    """
+    preferred = (3, 2) if stream_name.endswith('3') else (2, 3)
+    for strings_per_record in preferred:
+        records = _decode_records(data, strings_per_record)
+        if records:
+            return records
+    return None
+
+
+def _decode_records(data: bytes, strings_per_record: int) -> Optional[List[AssetRecord]]:
+    """Строгий разбор: любая несостыковка означает другой формат"""
+
+    records = []
+    pos = 0
+    size = len(data)
+
+    while pos < size:
+        if pos + GUID_SIZE > size:
+            return None
+        offset = pos
+        guid = bytes(data[pos:pos + GUID_SIZE])
+        pos += GUID_SIZE
+
+        strings = []
+        for _ in range(strings_per_record):
+            value, pos = _read_string(data, pos)
+            if value is None:
+                return None
+            strings.append(value)
+
+        asset_type, path = strings[0], strings[1]
+        if not _ASSET_TYPE_RE.fullmatch(asset_type) or not path:
+            return None
+        records.append(AssetRecord(guid=guid, asset_type=asset_type,
+                                   path=path, extra=strings[2:], offset=offset))
+
+    return records
+
+
+def _read_string(data: bytes, pos: int) -> Tuple[Optional[str], int]:
+    """Читает строку с префиксом длины; (None, pos) при ошибке"""
+
+    if pos + 4 > len(data):
+        return None, pos
+    length = int.from_bytes(data[pos:pos + 4], 'little')
+    pos += 4
+    end = pos + length * 2
+    if length > MAX_STRING_CHARS or end > len(data):
+        return None, pos
+    try:
+        value = bytes(data[pos:end]).decode('utf-16-le')
+    except UnicodeDecodeError:
+        return None, pos
+    if _CONTROL_CHARS_RE.search(value):
+        return None, pos
+    return value, end
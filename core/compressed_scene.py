@@ -0,0 +1,84 @@
+"""
+Чтение сжатых сцен 3ds Max (Compress on Save).
+
+Сжатая сцена - составной файл OLE, упакованный целиком в zlib или gzip.
+Распаковываем её потоково, кусками ограниченного размера, так что
+распакованная сцена никогда не находится в памяти целиком.
+"""
+
+import zlib
+from pathlib import Path
+from typing import Iterator
+
+GZIP_MAGIC = b'\x1f\x8b'
+
+# Сколько сжатых данных читаем с диска за раз
+READ_SIZE = 1024 * 1024
+
+# zlib сам определяет заголовок: zlib или gzip
+_AUTO_WBITS = zlib.MAX_WBITS | 32
+
+
+def is_compressed_scene(header: bytes) -> bool:
+    """Начинается ли файл с заголовка gzip или zlib"""
+
+    if header.startswith(GZIP_MAGIC):
+        return True
+    # Заголовок zlib: метод deflate, окно до 32 КБ, контрольная сумма по модулю 31
+    return (len(header) >= 2 and header[0] & 0x0F == 8 and header[0] >> 4 <= 7
+            and ((header[0] << 8) | header[1]) % 31 == 0)
+
+
+class InflatingReader:
+    """
+    Потоковая распаковка сжатой сцены.
+
+    Использование:
+        reader = InflatingReader(path)
+        for chunk in reader:
+            ...
+        reader.compressed_bytes, reader.inflated_bytes
+    """
+
+    def __init__(self, path: str | Path, max_chunk: int = 4 * 1024 * 1024):
+        """
+        Args:
+            path: Путь к сжатой сцене
+            max_chunk: Предел размера одного распакованного куска
+        """
+        self.path = Path(path)
+        self.max_chunk = max_chunk
+        self.compressed_bytes = 0
+        self.inflated_bytes = 0
+        # Сжатые данные закончились раньше конца потока deflate
+        self.truncated = False
+
+    def __iter__(self) -> Iterator[bytes]:
+        decompressor = zlib.decompressobj(_AUTO_WBITS)
+
+        with open(self.path, 'rb') as f:
+            while True:
+                data = f.read(READ_SIZE)
+                if not data:
+                    break
+                self.compressed_bytes += len(data)
+
+                while data:
+                    if decompressor.eof:
+                        # За концом потока может идти следующий член gzip,
+                        # всё остальное - хвост файла, который не распаковываем
+                        if not data.startswith(GZIP_MAGIC):
+                            return
+                        decompressor = zlib.decompressobj(_AUTO_WBITS)
+
+                    chunk = decompressor.decompress(data, self.max_chunk)
+                    if chunk:
+                        self.inflated_bytes += len(chunk)
+                        yield chunk
+                    data = decompressor.unused_data if decompressor.eof else decompressor.unconsumed_tail
+
+        chunk = decompressor.flush()
+        if chunk:
+            self.inflated_bytes += len(chunk)
+            yield chunk
+        self.truncated = not decompressor.eof
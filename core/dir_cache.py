@@ -0,0 +1,178 @@
+"""
+Кэш листингов папок на время одного прохода (анализ, организация)
+
+Пути из сцен указывают на сравнительно небольшое число папок, поэтому
+вместо stat на каждый путь каждая родительская папка листается один раз
+(os.scandir), а проверки существования и stat отвечаются из памяти.
+На Windows данные stat приходят вместе с листингом и отдельного
+обращения к диску не требуют.
+
+Пути в Windows-виде (буква диска, UNC, обратные слэши) и все пути на
+Windows и macOS сравниваются без учёта регистра.
+
+Кэш не следит за изменениями на диске: после перемещения файлов его
+нужно сбросить (forget/clear) или создать новый.
+"""
+
+import ntpath
+import os
+import sys
+import threading
+from typing import Dict, List, NamedTuple, Optional, Union
+
+
+PathLike = Union[str, os.PathLike]
+
+# Файловые системы этих платформ по умолчанию не различают регистр
+CASE_INSENSITIVE_PLATFORM = os.name == 'nt' or sys.platform == 'darwin'
+
+
+def is_windows_path(path: str) -> bool:
+    """Путь записан в Windows-виде: буква диска, UNC или обратные слэши"""
+    return '\\' in path or (len(path) > 1 and path[1] == ':' and path[0].isalpha())
+
+
+class _Listing(NamedTuple):
+    """Содержимое папки: имя -> запись и имя без регистра -> имена"""
+    entries: Dict[str, os.DirEntry]
+    folded: Dict[str, List[str]]
+
+
+class DirectoryCache:
+    """Листинги папок для пакетных проверок существования и stat"""
+
+    def __init__(self):
+        # Папка -> листинг (None - папки нет или она недоступна)
+        self._listings: Dict[str, Optional[_Listing]] = {}
+        # То же для папок, найденных по имени без учёта регистра
+        self._folded_listings: Dict[str, Optional[_Listing]] = {}
+        self._lock = threading.Lock()
+        # Число прочитанных папок и запросов (для журнала)
+        self.dirs_listed = 0
+        self.lookups = 0
+
+    def __len__(self) -> int:
+        return len(self._listings)
+
+    @staticmethod
+    def _split(path: str, windows: bool):
+        return (ntpath if windows else os.path).split(path)
+
+    @staticmethod
+    def _key(directory: str) -> str:
+        return os.path.normcase(directory)
+
+    def _read(self, directory: str) -> Optional[_Listing]:
+        try:
+            with os.scandir(directory) as it:
+                entries = {entry.name: entry for entry in it}
+        except OSError:
+            return None
+        folded: Dict[str, List[str]] = {}
+        for name in entries:
+            folded.setdefault(name.casefold(), []).append(name)
+        return _Listing(entries, folded)
+
+    def _listing(self, directory: str, ignore_case: bool, windows: bool) -> Optional[_Listing]:
+        """Листинг папки; без учёта регистра папка ищется и в листинге родителя"""
+
+        key = self._key(directory)
+        try:
+            listing = self._listings[key]
+        except KeyError:
+            listing = self._read(directory)
+            with self._lock:
+                self.dirs_listed += 1
+                self._listings[key] = listing
+        if listing is not None or not ignore_case or CASE_INSENSITIVE_PLATFORM:
+            return listing
+
+        # Папки с таким написанием нет - ищем её имя в родителе без учёта регистра
+        try:
+            return self._folded_listings[key]
+        except KeyError:
+            pass
+        parent, name = self._split(directory, windows)
+        if name and parent != directory:
+            entry = self._find(parent, name, ignore_case, windows)
+            if entry is not None and entry.path != directory:
+                listing = self._listing(entry.path, False, windows)
+        with self._lock:
+            self._folded_listings[key] = listing
+        return listing
+
+    def _find(self, directory: str, name: str, ignore_case: bool,
+              windows: bool) -> Optional[os.DirEntry]:
+        listing = self._listing(directory or os.curdir, ignore_case, windows)
+        if listing is None:
+            return None
+        entry = listing.entries.get(name)
+        if entry is None and (ignore_case or CASE_INSENSITIVE_PLATFORM):
+            names = listing.folded.get(name.casefold())
+            if names:
+                entry = listing.entries[min(names)]
+        return entry
+
+    def entry(self, path: PathLike, ignore_case: Optional[bool] = None) -> Optional[os.DirEntry]:
+        """
+        Запись папки для пути или None, если её нет.
+
+        ignore_case: сравнивать имена без учёта регистра (None - для путей
+            в Windows-виде)
+        """
+
+        path = os.fspath(path)
+        windows = is_windows_path(path)
+        if ignore_case is None:
+            ignore_case = windows
+        self.lookups += 1
+        directory, name = self._split(path, windows)
+        if not name:
+            return None
+        return self._find(directory, name, ignore_case, windows)
+
+    def exists(self, path: PathLike, ignore_case: Optional[bool] = None) -> bool:
+        """Как Path.exists: битая символическая ссылка не существует"""
+        entry = self.entry(path, ignore_case)
+        try:
+            return entry is not None and (entry.is_file() or entry.is_dir())
+        except OSError:
+            return False
+
+    def is_file(self, path: PathLike, ignore_case: Optional[bool] = None) -> bool:
+        entry = self.entry(path, ignore_case)
+        try:
+            return entry is not None and entry.is_file()
+        except OSError:
+            return False
+
+    def stat(self, path: PathLike, ignore_case: Optional[bool] = None) -> Optional[os.stat_result]:
+        """stat по ссылке (как Path.stat) или None, если файла нет"""
+        entry = self.entry(path, ignore_case)
+        if entry is None:
+            return None
+        try:
+            return entry.stat()
+        except OSError:
+            return None
+
+    def resolve(self, path: PathLike, ignore_case: Optional[bool] = None) -> Optional[str]:
+        """Путь с именем в том регистре, в каком оно записано на диске"""
+        entry = self.entry(path, ignore_case)
+        return entry.path if entry is not None else None
+
+    def forget(self, path: PathLike):
+        """Сбрасывает листинг папки, в которой лежит path, и самой path"""
+
+        path = os.fspath(path)
+        directory = self._split(path, is_windows_path(path))[0]
+        with self._lock:
+            for key in (self._key(directory), self._key(path)):
+                self._listings.pop(key, None)
+            # Папки без учёта регистра могут указывать на любой из листингов
+            self._folded_listings.clear()
+
+    def clear(self):
+        with self._lock:
+            self._listings.clear()
+            self._folded_listings.clear()
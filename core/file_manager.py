@@ -15,6 +15,7 @@ from datetime import datetime
 from .backup_manager import BackupManager
 from .operation_history import OperationHistory, Operation, OperationType
 from .file_integrity import FileIntegrityChecker
+from .dir_cache import DirectoryCache
 
 
 @dataclass
@@ -128,11 +129,15 @@ class FileManager:
                 result.maps_folder = maps_folder
                 self._log(f"📁 Папка maps: {maps_folder}")
             
+            # Существование файлов проверяется по листингам папок: каждая
+            # папка читается один раз, после перемещений кэш сбрасывается
+            dir_cache = DirectoryCache()
+            
             # Проверяем, есть ли неиспользуемые файлы перед созданием папки
             unused_files_count = 0
             if move_unused and hasattr(analysis, 'unused_files'):
                 unused_files_count = len([f for f in analysis.unused_files 
-                                         if Path(f).exists() and Path(f).suffix.lower() != '.max'])
+                                         if dir_cache.exists(f) and Path(f).suffix.lower() != '.max'])
             
             if move_unused and unused_files_count > 0:
                 unused_folder.mkdir(exist_ok=True)
@@ -156,7 +161,7 @@ class FileManager:
                 
                 for file_path in linked_files:
                     file_path = Path(file_path)
-                    if not file_path.exists():
+                    if not dir_cache.exists(file_path):
                         continue
                     if file_path.suffix.lower() == '.max':
                         continue
@@ -295,10 +300,13 @@ class FileManager:
                 unused_files = list(analysis.unused_files)
                 self._log(f"Неиспользуемых: {len(unused_files)}")
                 
+                # Файлы уже перемещались - листинги устарели
+                dir_cache.clear()
+                
                 for file_path in unused_files:
                     file_path = Path(file_path)
                     
-                    if not file_path.exists():
+                    if not dir_cache.exists(file_path):
                         continue
                     if file_path.suffix.lower() == '.max':
                         continue
@@ -0,0 +1,265 @@
+"""
+Опись папки проекта на диске (SQLite, одна база на корень проекта)
+
+Хранит дерево папок с временем изменения каждой и найденные файлы
+ассетов (размер, время изменения, inode). При следующем анализе для
+каждой известной папки делается один stat: заново листаются только
+папки, время изменения которых сдвинулось (файл добавлен, удалён или
+переименован), и новые поддеревья. Остальные файлы берутся из описи.
+
+Изменение содержимого файла на месте время папки не меняет, поэтому
+размер и время таких файлов в описи могут отставать до их переименования
+или до полного обхода (refresh(full=True), analyze --full-rescan).
+
+Папка, которую не удалось прочитать (сбой сети, нет доступа), остаётся
+в описи с прежними файлами и перечитывается при следующем обновлении.
+Из описи папка удаляется, только когда её нет в листинге родителя.
+"""
+
+import hashlib
+import os
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Collection, Dict, Iterable, List, Optional, Tuple, Union
+
+from .folder_walker import (DirectoryListing, MAX_LISTINGS_PER_SHARE, WalkedFile,
+                            list_directory, share_limit, walk_directories)
+from .parse_cache import default_cache_dir
+
+
+# Папку, изменённую менее двух секунд назад, при следующем запуске
+# листаем снова: время могло не сдвинуться при изменении в тот же тик
+_RACY_WINDOW_NS = 2 * 10 ** 9
+
+
+class FolderInventory:
+    """Опись файлов ассетов одного корня проекта"""
+
+    def __init__(self, root: Path, cache_file: Optional[Path] = None):
+        """
+        Args:
+            root: Корень проекта
+            cache_file: Файл базы (если None - в папке кэша пользователя,
+                имя по хэшу пути корня)
+        """
+        self.root = os.path.abspath(root)
+        if cache_file is None:
+            digest = hashlib.sha1(os.path.normcase(self.root).encode('utf-8')).hexdigest()[:16]
+            cache_file = default_cache_dir() / "inventory" / f"{digest}.sqlite"
+        self.cache_file = Path(cache_file)
+        self._conn: Optional[sqlite3.Connection] = None
+        # Итоги последнего обновления: проверено и заново прочитано папок
+        self.last_refresh: Dict[str, int] = {}
+
+    def _connect(self) -> sqlite3.Connection:
+        """Открывает базу при первом обращении"""
+
+        if self._conn is None:
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.cache_file), timeout=10)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS meta (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL
+                )
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS dirs (
+                    path TEXT PRIMARY KEY,
+                    top_folder TEXT NOT NULL,
+                    mtime_ns INTEGER NOT NULL
+                )
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS files (
+                    path TEXT PRIMARY KEY,
+                    dir TEXT NOT NULL,
+                    name TEXT NOT NULL,
+                    top_folder TEXT NOT NULL,
+                    size INTEGER,
+                    mtime REAL,
+                    inode INTEGER
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS files_dir ON files(dir)")
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def refresh(self, extensions: Optional[Collection[str]] = None,
+                skip_dirs: Collection[str] = (),
+                on_error: Optional[Callable[[OSError], None]] = None,
+                threads: int = MAX_LISTINGS_PER_SHARE,
+                full: bool = False) -> List[WalkedFile]:
+        """
+        Обновляет опись и возвращает все файлы корня.
+
+        Если опись пуста, составлена с другими расширениями или full -
+        корень обходится целиком.
+        """
+
+        conn = self._connect()
+        signature = repr((self.root, sorted(extensions) if extensions is not None else None,
+                          sorted(skip_dirs)))
+        row = conn.execute("SELECT value FROM meta WHERE key = 'signature'").fetchone()
+        known = {path: (top_folder, mtime_ns) for path, top_folder, mtime_ns
+                 in conn.execute("SELECT path, top_folder, mtime_ns FROM dirs")}
+
+        stats = {'dirs_checked': 0, 'dirs_listed': 0}
+        if full or row is None or row[0] != signature or self.root not in known:
+            conn.execute("DELETE FROM dirs")
+            conn.execute("DELETE FROM files")
+            conn.execute("INSERT OR REPLACE INTO meta VALUES ('signature', ?)", (signature,))
+            self._walk(conn, [(self.root, '')], extensions, skip_dirs, on_error, threads, stats)
+        else:
+            self._update(conn, known, extensions, skip_dirs, on_error, threads, stats)
+        conn.commit()
+
+        files = [WalkedFile(*row) for row in conn.execute(
+            "SELECT path, name, top_folder, size, mtime, inode FROM files")]
+        stats['files'] = len(files)
+        self.last_refresh = stats
+        return files
+
+    def _update(self, conn: sqlite3.Connection, known: Dict[str, Tuple[str, int]],
+                extensions: Optional[Collection[str]], skip_dirs: Collection[str],
+                on_error: Optional[Callable[[OSError], None]], threads: int,
+                stats: Dict[str, int]):
+        """Перечитывает изменённые папки и обходит новые поддеревья"""
+
+        def check(path: str) -> Optional[int]:
+            try:
+                with share_limit(path):
+                    return os.stat(path).st_mtime_ns
+            except OSError:
+                return None
+
+        paths = list(known)
+        with ThreadPoolExecutor(max_workers=max(threads, 1)) as pool:
+            mtimes = dict(zip(paths, pool.map(check, paths)))
+        stats['dirs_checked'] = len(paths)
+
+        changed = []
+        for path, mtime_ns in mtimes.items():
+            if mtime_ns is None:
+                # Папка недоступна или удалена. Удалённую уберёт листинг
+                # родителя (его время при удалении сдвинулось), недоступную
+                # сохраняем до следующего обновления
+                self._mark_stale(conn, path)
+            elif mtime_ns != known[path][1]:
+                changed.append(path)
+
+        def relist(path: str) -> Union[DirectoryListing, OSError]:
+            try:
+                with share_limit(path):
+                    return list_directory(path, known[path][0], extensions, skip_dirs,
+                                          stat_directory=True)
+            except OSError as e:
+                return e
+
+        new_roots = []
+        with ThreadPoolExecutor(max_workers=max(threads, 1)) as pool:
+            listings = list(pool.map(relist, changed))
+        for path, listing in zip(changed, listings):
+            if isinstance(listing, OSError):
+                if on_error is not None:
+                    on_error(listing)
+                self._mark_stale(conn, path)
+                continue
+            # Подпапки, которых больше нет, удаляются вместе с поддеревом
+            current = {subdir for subdir, _ in listing.subdirs}
+            for child in self._children(conn, path):
+                if child not in current:
+                    self._delete_tree(conn, child)
+            new_roots.extend(subdir for subdir in listing.subdirs if subdir[0] not in known)
+            self._store(conn, [listing], stats)
+
+        if new_roots:
+            self._walk(conn, new_roots, extensions, skip_dirs, on_error, threads, stats)
+
+    def _walk(self, conn: sqlite3.Connection, roots: List[Tuple[str, str]],
+              extensions: Optional[Collection[str]], skip_dirs: Collection[str],
+              on_error: Optional[Callable[[OSError], None]], threads: int,
+              stats: Dict[str, int]):
+        """
+        Обходит поддеревья и записывает их. Непрочитанные папки записываются
+        без файлов и с временем -1: иначе родитель, время которого не
+        изменится, больше не будет перечитан и папка не найдётся
+        """
+
+        failed = []
+
+        def record(error: OSError):
+            if error.filename is not None:
+                failed.append(os.fsdecode(error.filename))
+            if on_error is not None:
+                on_error(error)
+
+        self._store(conn, walk_directories(roots, extensions, skip_dirs, record, threads,
+                                           stat_directories=True), stats)
+        for path in failed:
+            relative = os.path.relpath(path, self.root)
+            top_folder = '' if relative == os.curdir else relative.split(os.sep)[0]
+            conn.execute("INSERT OR IGNORE INTO dirs VALUES (?, ?, -1)", (path, top_folder))
+
+    def _store(self, conn: sqlite3.Connection, listings: Iterable[DirectoryListing],
+               stats: Dict[str, int]):
+        """Записывает листинги папок, заменяя прежние файлы этих папок"""
+
+        now = time.time_ns()
+        for listing in listings:
+            stats['dirs_listed'] += 1
+            mtime_ns = listing.mtime_ns
+            if mtime_ns is None or now - mtime_ns < _RACY_WINDOW_NS:
+                mtime_ns = -1
+            conn.execute("INSERT OR REPLACE INTO dirs VALUES (?, ?, ?)",
+                         (listing.path, listing.top_folder, mtime_ns))
+            conn.execute("DELETE FROM files WHERE dir = ?", (listing.path,))
+            conn.executemany(
+                "INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(f.path, listing.path, f.name, f.top_folder, f.size, f.mtime, f.inode)
+                 for f in listing.files])
+
+    @staticmethod
+    def _mark_stale(conn: sqlite3.Connection, path: str):
+        """Папка будет перечитана при следующем обновлении, файлы пока остаются"""
+        conn.execute("UPDATE dirs SET mtime_ns = -1 WHERE path = ?", (path,))
+
+    @staticmethod
+    def _subtree_range(path: str) -> Tuple[str, str]:
+        """Границы путей внутри папки: path + разделитель ... path + следующий символ"""
+        prefix = path.rstrip(os.sep) + os.sep
+        return prefix, prefix[:-1] + chr(ord(os.sep) + 1)
+
+    def _children(self, conn: sqlite3.Connection, path: str) -> List[str]:
+        low, high = self._subtree_range(path)
+        return [child for (child,) in conn.execute(
+                    "SELECT path FROM dirs WHERE path >= ? AND path < ?", (low, high))
+                if os.path.dirname(child) == path]
+
+    def _delete_tree(self, conn: sqlite3.Connection, path: str):
+        """Удаляет папку и всё её поддерево из описи"""
+
+        low, high = self._subtree_range(path)
+        conn.execute("DELETE FROM dirs WHERE path = ? OR (path >= ? AND path < ?)",
+                     (path, low, high))
+        conn.execute("DELETE FROM files WHERE dir = ? OR (dir >= ? AND dir < ?)",
+                     (path, low, high))
+
+    def clear(self):
+        """Удаляет опись (следующее обновление обойдёт корень целиком)"""
+
+        conn = self._connect()
+        conn.execute("DELETE FROM dirs")
+        conn.execute("DELETE FROM files")
+        conn.execute("DELETE FROM meta")
+        conn.commit()
@@ -0,0 +1,275 @@
+"""
+Обход папки проекта через os.scandir.
+
+Тип записи берётся из DirEntry без отдельного обращения к диску, размер
+и время изменения - из DirEntry.stat() (на Windows он уже заполнен
+листингом папки). Пропускаемые папки (unused) не обходятся вовсе.
+
+На сетевых ресурсах (SMB/NFS) каждый листинг папки - это запрос к
+серверу, поэтому walk_files_parallel листает папки пулом потоков
+с ограничением числа одновременных листингов на один ресурс.
+"""
+
+import os
+import queue
+import threading
+from collections import deque
+from pathlib import Path
+from typing import (Callable, Collection, Deque, Dict, Iterable, Iterator, List,
+                    NamedTuple, Optional, Tuple)
+
+
+class WalkedFile(NamedTuple):
+    """Файл, найденный при обходе, с данными stat"""
+    path: str
+    name: str
+    # Первая подпапка относительно корня обхода ('' - файл в корне)
+    top_folder: str
+    size: Optional[int]
+    mtime: Optional[float]
+    inode: Optional[int]
+
+
+class DirectoryListing(NamedTuple):
+    """Листинг одной папки при обходе"""
+    path: str
+    top_folder: str
+    # Время изменения папки (только если его запрашивали)
+    mtime_ns: Optional[int]
+    files: List[WalkedFile]
+    # Подпапки для обхода: (путь, первая подпапка)
+    subdirs: List[Tuple[str, str]]
+
+
+def walk_files(root: str | Path,
+               extensions: Optional[Collection[str]] = None,
+               skip_dirs: Collection[str] = (),
+               on_error: Optional[Callable[[OSError], None]] = None,
+               recursive: bool = True) -> Iterator[WalkedFile]:
+    """
+    Отдаёт файлы под root (в глубину, как Path.rglob).
+
+    Args:
+        root: Корень обхода
+        extensions: Нужные расширения в нижнем регистре (None - все файлы)
+        skip_dirs: Имена папок, в которые не заходим
+        on_error: Вызывается для папок, которые не удалось прочитать
+        recursive: Обходить подпапки
+    """
+
+    stack = [(os.fspath(root), '')]
+    while stack:
+        directory, top_folder = stack.pop()
+        try:
+            listing = list_directory(directory, top_folder, extensions, skip_dirs)
+        except OSError as e:
+            if on_error is not None:
+                on_error(e)
+            continue
+        yield from listing.files
+        if recursive:
+            # В обратном порядке, чтобы папки обходились в порядке листинга
+            stack.extend(reversed(listing.subdirs))
+
+
+def list_directory(directory: str, top_folder: str = '',
+                   extensions: Optional[Collection[str]] = None,
+                   skip_dirs: Collection[str] = (),
+                   stat_directory: bool = False) -> DirectoryListing:
+    """
+    Файлы папки и её подпапки для обхода. При stat_directory время
+    изменения папки берётся до листинга: изменение во время листинга
+    не останется незамеченным.
+    """
+
+    mtime_ns = os.stat(directory).st_mtime_ns if stat_directory else None
+    with os.scandir(directory) as it:
+        entries = list(it)
+
+    files = []
+    subdirs = []
+    for entry in entries:
+        try:
+            # Ссылки на папки не обходим - так же ведёт себя rglob
+            if entry.is_dir(follow_symlinks=False):
+                if entry.name not in skip_dirs:
+                    subdirs.append((entry.path, top_folder or entry.name))
+                continue
+            if not entry.is_file():
+                continue
+        except OSError:
+            continue
+
+        if extensions is not None and os.path.splitext(entry.name)[1].lower() not in extensions:
+            continue
+
+        try:
+            stat = entry.stat()
+            size, mtime, inode = stat.st_size, stat.st_mtime, entry.inode()
+        except OSError:
+            size = mtime = inode = None
+        files.append(WalkedFile(entry.path, entry.name, top_folder, size, mtime, inode))
+    return DirectoryListing(directory, top_folder, mtime_ns, files, subdirs)
+
+
+# Предел одновременных листингов на один сетевой ресурс или диск
+MAX_LISTINGS_PER_SHARE = 8
+
+_share_limits: Dict[str, threading.BoundedSemaphore] = {}
+_share_limits_lock = threading.Lock()
+
+
+def share_key(path: str) -> str:
+    """Ресурс, которому принадлежит путь: \\\\server\\share, диск или '' (POSIX)"""
+    return os.path.normcase(os.path.splitdrive(path)[0])
+
+
+def share_limit(path: str) -> threading.BoundedSemaphore:
+    """Семафор ресурса, общий для всех обходов процесса"""
+
+    key = share_key(path)
+    with _share_limits_lock:
+        limit = _share_limits.get(key)
+        if limit is None:
+            limit = threading.BoundedSemaphore(MAX_LISTINGS_PER_SHARE)
+            _share_limits[key] = limit
+    return limit
+
+
+def walk_files_parallel(root: str | Path,
+                        extensions: Optional[Collection[str]] = None,
+                        skip_dirs: Collection[str] = (),
+                        on_error: Optional[Callable[[OSError], None]] = None,
+                        recursive: bool = True,
+                        threads: int = MAX_LISTINGS_PER_SHARE) -> Iterator[WalkedFile]:
+    """
+    То же, что walk_files, но папки листаются пулом потоков. Порядок
+    файлов не определён, набор файлов совпадает с walk_files.
+
+    У каждого потока своя очередь папок: найденные подпапки он кладёт
+    к себе и берёт последнюю (обход в глубину, мало памяти), а
+    освободившийся поток забирает самую старую папку у соседа - это
+    обычно верхняя папка с большим поддеревом.
+    """
+
+    root = os.fspath(root)
+    if threads <= 1 or not recursive:
+        yield from walk_files(root, extensions, skip_dirs, on_error, recursive)
+        return
+
+    for listing in walk_directories([(root, '')], extensions, skip_dirs, on_error, threads):
+        yield from listing.files
+
+
+def walk_directories(roots: Iterable[Tuple[str, str]],
+                     extensions: Optional[Collection[str]] = None,
+                     skip_dirs: Collection[str] = (),
+                     on_error: Optional[Callable[[OSError], None]] = None,
+                     threads: int = MAX_LISTINGS_PER_SHARE,
+                     stat_directories: bool = False) -> Iterator[DirectoryListing]:
+    """
+    Параллельный обход поддеревьев roots ((путь, первая подпапка)),
+    по листингу на папку. stat_directories - см. list_directory
+    """
+
+    walker = _ParallelWalk(extensions, skip_dirs, on_error, max(threads, 1), stat_directories)
+    yield from walker.run(list(roots))
+
+
+class _ParallelWalk:
+    """Состояние одного параллельного обхода"""
+
+    def __init__(self, extensions: Optional[Collection[str]], skip_dirs: Collection[str],
+                 on_error: Optional[Callable[[OSError], None]], threads: int,
+                 stat_directories: bool):
+        self.extensions = extensions
+        self.skip_dirs = skip_dirs
+        self.stat_directories = stat_directories
+        # Ошибки передаются в поток, который перебирает результаты
+        self.on_error = on_error
+        self.queues: List[Deque[Tuple[str, str]]] = [deque() for _ in range(threads)]
+        # Папки в очередях и в работе; обход закончен, когда их не осталось
+        self.outstanding = 0
+        self.condition = threading.Condition()
+        self.stopped = False
+        # Листинги и ошибки для потока, который перебирает результаты
+        self.results: 'queue.Queue' = queue.Queue(maxsize=1024)
+
+    def run(self, roots: List[Tuple[str, str]]) -> Iterator[DirectoryListing]:
+        if not roots:
+            return
+        self.outstanding = len(roots)
+        for index, root in enumerate(roots):
+            self.queues[index % len(self.queues)].append(root)
+        workers = [threading.Thread(target=self._work, args=(index,), daemon=True,
+                                    name=f"walker-{index}")
+                   for index in range(len(self.queues))]
+        for worker in workers:
+            worker.start()
+
+        try:
+            finished = 0
+            while finished < len(workers):
+                item = self.results.get()
+                if item is None:
+                    finished += 1
+                elif isinstance(item, OSError):
+                    if self.on_error is not None:
+                        self.on_error(item)
+                else:
+                    yield item
+        finally:
+            # Перебор прерван - останавливаем потоки
+            with self.condition:
+                self.stopped = True
+                self.condition.notify_all()
+            while any(worker.is_alive() for worker in workers):
+                try:
+                    self.results.get(timeout=0.1)
+                except queue.Empty:
+                    pass
+
+    def _take(self, index: int) -> Optional[Tuple[str, str]]:
+        """Папка из своей очереди, иначе - украденная у соседа; None - обход закончен"""
+
+        own = self.queues[index]
+        with self.condition:
+            while not self.stopped:
+                if own:
+                    return own.pop()
+                for offset in range(1, len(self.queues)):
+                    other = self.queues[(index + offset) % len(self.queues)]
+                    if other:
+                        return other.popleft()
+                if self.outstanding == 0:
+                    return None
+                self.condition.wait()
+            return None
+
+    def _work(self, index: int):
+        try:
+            while True:
+                task = self._take(index)
+                if task is None:
+                    break
+                directory, top_folder = task
+                subdirs = []
+                try:
+                    with share_limit(directory):
+                        listing = list_directory(directory, top_folder, self.extensions,
+                                                 self.skip_dirs, self.stat_directories)
+                    subdirs = listing.subdirs
+                    self.results.put(listing)
+                except OSError as e:
+                    self.results.put(e)
+                finally:
+                    # Счётчик папок обновляется при любом исходе, иначе обход не закончится
+                    with self.condition:
+                        self.queues[index].extend(reversed(subdirs))
+                        self.outstanding += len(subdirs) - 1
+                        if self.outstanding == 0:
+                            self.condition.notify_all()
+                        elif subdirs:
+                            self.condition.notify(len(subdirs))
+        finally:
+            self.results.put(None)
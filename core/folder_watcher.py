@@ -0,0 +1,484 @@
+"""
+Отслеживание изменений в папке проекта.
+
+На Linux изменения приходят от ядра через inotify (ctypes, без
+зависимостей). На сетевых ресурсах (SMB/NFS) inotify не видит изменений
+с других машин, а на других системах его нет - там папка периодически
+опрашивается: stat каждой известной папки, листинг только тех, время
+изменения которых сдвинулось, и stat отслеживаемых файлов (сцен),
+которые перезаписываются на месте.
+
+Переименование приходит как удаление старого пути и создание нового.
+"""
+
+import abc
+import ctypes
+import ctypes.util
+import errno
+import os
+import select
+import struct
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Collection, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from .folder_inventory import _RACY_WINDOW_NS
+from .folder_walker import (DirectoryListing, MAX_LISTINGS_PER_SHARE, list_directory,
+                            share_limit, walk_directories)
+
+
+# Виды событий
+CREATED = 'created'
+DELETED = 'deleted'
+MODIFIED = 'modified'
+# События потеряны (переполнение очереди, корень удалён) - нужен полный пересмотр
+RESCAN = 'rescan'
+
+
+class FileEvent(NamedTuple):
+    """Изменение файла или папки"""
+    kind: str
+    path: str
+    is_dir: bool = False
+
+
+# Файловые системы, изменения на которых inotify видит не все
+NETWORK_FILESYSTEMS = {
+    'nfs', 'nfs4', 'cifs', 'smb3', 'smbfs', 'ncpfs', 'afs', '9p',
+    'ceph', 'glusterfs', 'davfs', 'fuse.sshfs', 'fuse.rclone'
+}
+
+
+def is_network_path(path: str) -> bool:
+    """Путь на сетевом ресурсе (UNC, сетевой диск или сетевая ФС)"""
+
+    path = os.path.abspath(path)
+    if path.startswith('\\\\') or path.startswith('//'):
+        return True
+    if os.name == 'nt':
+        drive = os.path.splitdrive(path)[0]
+        if not drive:
+            return False
+        DRIVE_REMOTE = 4
+        return ctypes.windll.kernel32.GetDriveTypeW(drive + '\\') == DRIVE_REMOTE
+
+    # Точка монтирования с самым длинным общим префиксом
+    path = os.path.realpath(path)
+    best_mount, best_type = '', ''
+    try:
+        with open('/proc/self/mounts', encoding='utf-8', errors='replace') as mounts:
+            for line in mounts:
+                fields = line.split()
+                if len(fields) < 3:
+                    continue
+                mount = fields[1].replace('\\040', ' ')
+                inside = path == mount or path.startswith(mount.rstrip('/') + '/')
+                if inside and len(mount) >= len(best_mount):
+                    best_mount, best_type = mount, fields[2]
+    except OSError:
+        return False
+    return best_type in NETWORK_FILESYSTEMS
+
+
+class FolderWatcher(abc.ABC):
+    """Источник событий изменения папки"""
+
+    # Способ отслеживания (для журнала)
+    kind = ''
+
+    @abc.abstractmethod
+    def read_events(self, timeout: float) -> List[FileEvent]:
+        """События, накопившиеся за время ожидания (не дольше timeout секунд)"""
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def _wanted(name: str, extensions: Optional[Collection[str]]) -> bool:
+    return extensions is None or os.path.splitext(name)[1].lower() in extensions
+
+
+# --- inotify ---
+
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_DELETE_SELF = 0x00000400
+_IN_MOVE_SELF = 0x00000800
+_IN_Q_OVERFLOW = 0x00004000
+_IN_IGNORED = 0x00008000
+_IN_ONLYDIR = 0x01000000
+_IN_DONT_FOLLOW = 0x02000000
+_IN_EXCL_UNLINK = 0x04000000
+_IN_ISDIR = 0x40000000
+
+_WATCH_MASK = (_IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO | _IN_CREATE | _IN_DELETE
+               | _IN_DELETE_SELF | _IN_MOVE_SELF | _IN_ONLYDIR | _IN_DONT_FOLLOW
+               | _IN_EXCL_UNLINK)
+
+# struct inotify_event: wd, mask, cookie, len, затем имя
+_EVENT_HEADER = struct.Struct('iIII')
+
+_libc = None
+
+
+def _inotify_libc():
+    """libc с функциями inotify или None"""
+
+    global _libc
+    if _libc is None:
+        _libc = False
+        if sys.platform.startswith('linux'):
+            try:
+                libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+                libc.inotify_init1.argtypes = [ctypes.c_int]
+                libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+                libc.inotify_rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+                _libc = libc
+            except (OSError, AttributeError):
+                pass
+    return _libc or None
+
+
+def inotify_available() -> bool:
+    return _inotify_libc() is not None
+
+
+class InotifyWatcher(FolderWatcher):
+    """Отслеживание через inotify: по наблюдению на каждую папку дерева"""
+
+    kind = 'inotify'
+
+    def __init__(self, root: str, extensions: Optional[Collection[str]] = None,
+                 skip_dirs: Collection[str] = ()):
+        """
+        Raises:
+            OSError: inotify недоступен или исчерпан лимит наблюдений
+                (fs.inotify.max_user_watches)
+        """
+        self.root = os.path.abspath(root)
+        self.extensions = extensions
+        self.skip_dirs = skip_dirs
+        self._libc = _inotify_libc()
+        if self._libc is None:
+            raise OSError(errno.ENOSYS, "inotify недоступен")
+        self._fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1")
+        self._paths: Dict[int, str] = {}
+        self._wds: Dict[str, int] = {}
+        try:
+            self._watch_tree(self.root, strict=True)
+        except OSError:
+            self.close()
+            raise
+
+    def close(self):
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+    def _watch(self, path: str):
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(path), _WATCH_MASK)
+        if wd < 0:
+            code = ctypes.get_errno()
+            raise OSError(code, os.strerror(code), path)
+        self._paths[wd] = path
+        self._wds[path] = wd
+
+    def _watch_tree(self, root: str, strict: bool = False):
+        """
+        Ставит наблюдения на папку и все подпапки. При strict ошибка
+        прерывает работу, иначе папка пропускается (её могли уже удалить)
+        """
+        stack = [root]
+        while stack:
+            directory = stack.pop()
+            try:
+                self._watch(directory)
+                with os.scandir(directory) as it:
+                    for entry in it:
+                        if entry.name not in self.skip_dirs and entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+            except OSError as e:
+                if strict and (directory == root or e.errno == errno.ENOSPC):
+                    raise
+
+    def _unwatch_tree(self, root: str):
+        """Снимает наблюдения с папки, ушедшей из дерева"""
+        prefix = root + os.sep
+        for path in [p for p in self._wds if p == root or p.startswith(prefix)]:
+            wd = self._wds.pop(path)
+            self._paths.pop(wd, None)
+            self._libc.inotify_rm_watch(self._fd, wd)
+
+    def read_events(self, timeout: float) -> List[FileEvent]:
+        if self._fd < 0:
+            return []
+        readable, _, _ = select.select([self._fd], [], [], timeout)
+        if not readable:
+            return []
+
+        events: List[FileEvent] = []
+        while True:
+            try:
+                data = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            if not data:
+                break
+            self._decode(data, events)
+
+        # Подряд идущие одинаковые события (запись по частям) схлопываем
+        unique = []
+        for event in events:
+            if not unique or unique[-1] != event:
+                unique.append(event)
+        return unique
+
+    def _decode(self, data: bytes, events: List[FileEvent]):
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(data):
+            wd, mask, _cookie, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = os.fsdecode(data[offset:offset + length].rstrip(b'\0'))
+            offset += length
+
+            if mask & _IN_Q_OVERFLOW:
+                events.append(FileEvent(RESCAN, self.root, True))
+                continue
+            directory = self._paths.get(wd)
+            if directory is None:
+                continue
+            if mask & _IN_IGNORED:
+                # Наблюдение снято ядром (папка удалена)
+                self._paths.pop(wd, None)
+                if self._wds.get(directory) == wd:
+                    del self._wds[directory]
+                continue
+            if mask & (_IN_DELETE_SELF | _IN_MOVE_SELF):
+                if directory == self.root:
+                    events.append(FileEvent(RESCAN, self.root, True))
+                continue
+
+            path = os.path.join(directory, name)
+            is_dir = bool(mask & _IN_ISDIR)
+            if is_dir:
+                if name in self.skip_dirs:
+                    continue
+                if mask & (_IN_CREATE | _IN_MOVED_TO):
+                    # Файлы, появившиеся до установки наблюдения, найдёт обход новой папки
+                    self._watch_tree(path)
+                    events.append(FileEvent(CREATED, path, True))
+                elif mask & (_IN_DELETE | _IN_MOVED_FROM):
+                    self._unwatch_tree(path)
+                    events.append(FileEvent(DELETED, path, True))
+                continue
+
+            if not _wanted(name, self.extensions):
+                continue
+            if mask & (_IN_CREATE | _IN_MOVED_TO):
+                events.append(FileEvent(CREATED, path))
+            elif mask & (_IN_DELETE | _IN_MOVED_FROM):
+                events.append(FileEvent(DELETED, path))
+            elif mask & _IN_CLOSE_WRITE:
+                # Файл дописан и закрыт (IN_MODIFY не слушаем: он приходит
+                # на каждую запись, пока сцена ещё сохраняется)
+                events.append(FileEvent(MODIFIED, path))
+
+
+# --- опрос ---
+
+class PollingWatcher(FolderWatcher):
+    """
+    Отслеживание опросом. Новые, удалённые и переименованные файлы
+    меняют время изменения папки, поэтому за опрос листаются только такие
+    папки. Запись в файл на месте время папки не меняет - файлы с
+    расширениями из stat_extensions (сцены) проверяются stat отдельно.
+    """
+
+    kind = 'polling'
+
+    def __init__(self, root: str, extensions: Optional[Collection[str]] = None,
+                 skip_dirs: Collection[str] = (), interval: float = 5.0,
+                 stat_extensions: Collection[str] = (),
+                 threads: int = MAX_LISTINGS_PER_SHARE):
+        self.root = os.path.abspath(root)
+        self.extensions = extensions
+        self.skip_dirs = skip_dirs
+        self.interval = interval
+        self.stat_extensions = stat_extensions
+        self.threads = max(threads, 1)
+        self._closed = threading.Event()
+        # Папка -> время изменения; папка -> {файл: (размер, время)}
+        self._dirs: Dict[str, int] = {}
+        self._files: Dict[str, Dict[str, Tuple[Optional[int], Optional[float]]]] = {}
+        self._store(walk_directories([(self.root, '')], extensions, skip_dirs,
+                                     threads=self.threads, stat_directories=True))
+        self._next_poll = time.monotonic() + interval
+
+    def close(self):
+        self._closed.set()
+
+    def read_events(self, timeout: float) -> List[FileEvent]:
+        delay = self._next_poll - time.monotonic()
+        if delay > 0:
+            if self._closed.wait(min(delay, timeout)) or delay > timeout:
+                return []
+        self._next_poll = time.monotonic() + self.interval
+        return self.poll()
+
+    def _store(self, listings: Iterable[DirectoryListing],
+               events: Optional[List[FileEvent]] = None):
+        """Запоминает листинги; для новых папок файлы отдаются как созданные"""
+        now = time.time_ns()
+        for listing in listings:
+            mtime_ns = listing.mtime_ns
+            if mtime_ns is None or now - mtime_ns < _RACY_WINDOW_NS:
+                # Изменение в тот же тик могло не сдвинуть время - перечитаем
+                mtime_ns = -1
+            self._dirs[listing.path] = mtime_ns
+            self._files[listing.path] = {f.path: (f.size, f.mtime) for f in listing.files}
+            if events is not None:
+                events.extend(FileEvent(CREATED, f.path) for f in listing.files)
+
+    def _forget_tree(self, root: str):
+        prefix = root + os.sep
+        for path in [p for p in self._dirs if p == root or p.startswith(prefix)]:
+            del self._dirs[path]
+            self._files.pop(path, None)
+
+    def poll(self) -> List[FileEvent]:
+        """Один опрос: события с прошлого опроса"""
+
+        def check(path: str) -> Optional[int]:
+            try:
+                with share_limit(path):
+                    return os.stat(path).st_mtime_ns
+            except OSError:
+                return None
+
+        def relist(path: str) -> Optional[DirectoryListing]:
+            try:
+                with share_limit(path):
+                    return list_directory(path, '', self.extensions, self.skip_dirs,
+                                          stat_directory=True)
+            except OSError:
+                return None
+
+        events: List[FileEvent] = []
+        paths = list(self._dirs)
+        with ThreadPoolExecutor(max_workers=self.threads) as pool:
+            mtimes = dict(zip(paths, pool.map(check, paths)))
+
+        if mtimes.get(self.root) is None:
+            # Корень пропал: всё, что о нём известно, устарело
+            self._forget_tree(self.root)
+            return [FileEvent(RESCAN, self.root, True)]
+
+        changed = []
+        for path, mtime_ns in mtimes.items():
+            if path not in self._dirs:
+                continue
+            if mtime_ns is None:
+                self._forget_tree(path)
+                events.append(FileEvent(DELETED, path, True))
+            elif mtime_ns != self._dirs[path]:
+                changed.append(path)
+
+        with ThreadPoolExecutor(max_workers=self.threads) as pool:
+            listings = list(pool.map(relist, changed))
+
+        new_roots = []
+        for path, listing in zip(changed, listings):
+            if path not in self._dirs:
+                continue
+            if listing is None:
+                self._forget_tree(path)
+                events.append(FileEvent(DELETED, path, True))
+                continue
+
+            before = self._files.get(path, {})
+            after = {f.path: (f.size, f.mtime) for f in listing.files}
+            for file_path in before.keys() - after.keys():
+                events.append(FileEvent(DELETED, file_path))
+            for file_path, state in after.items():
+                if file_path not in before:
+                    events.append(FileEvent(CREATED, file_path))
+                elif before[file_path] != state:
+                    events.append(FileEvent(MODIFIED, file_path))
+
+            current = {subdir for subdir, _ in listing.subdirs}
+            for child in [p for p in self._dirs if os.path.dirname(p) == path]:
+                if child not in current:
+                    self._forget_tree(child)
+                    events.append(FileEvent(DELETED, child, True))
+            new_roots.extend((subdir, '') for subdir in current if subdir not in self._dirs)
+            self._store([listing])
+
+        if new_roots:
+            self._store(walk_directories(new_roots, self.extensions, self.skip_dirs,
+                                         threads=self.threads, stat_directories=True),
+                        events)
+
+        if self.stat_extensions:
+            relisted = set(changed)
+            events.extend(self._check_files(relisted))
+        return events
+
+    def _check_files(self, skip: Set[str]) -> List[FileEvent]:
+        """Запись на месте: stat файлов с расширениями stat_extensions"""
+
+        watched = [(directory, file_path, state)
+                   for directory, files in self._files.items() if directory not in skip
+                   for file_path, state in files.items()
+                   if os.path.splitext(file_path)[1].lower() in self.stat_extensions]
+
+        def check(item) -> Optional[Tuple[int, float]]:
+            try:
+                with share_limit(item[1]):
+                    stat = os.stat(item[1])
+                return stat.st_size, stat.st_mtime
+            except OSError:
+                return None
+
+        events = []
+        with ThreadPoolExecutor(max_workers=self.threads) as pool:
+            for (directory, file_path, state), current in zip(watched, pool.map(check, watched)):
+                # Пропавший файл заметит листинг папки на следующем опросе
+                if current is not None and current != state:
+                    self._files[directory][file_path] = current
+                    events.append(FileEvent(MODIFIED, file_path))
+        return events
+
+
+def create_watcher(root: str, extensions: Optional[Collection[str]] = None,
+                   skip_dirs: Collection[str] = (), poll_interval: float = 5.0,
+                   stat_extensions: Collection[str] = (),
+                   polling: Optional[bool] = None) -> FolderWatcher:
+    """
+    Наблюдатель для папки: inotify для локальных папок на Linux, иначе
+    опрос раз в poll_interval секунд. polling - принудительный выбор
+    (None - автоматически).
+    """
+
+    root = os.path.abspath(root)
+    if polling is None:
+        polling = not inotify_available() or is_network_path(root)
+    if not polling:
+        try:
+            return InotifyWatcher(root, extensions, skip_dirs)
+        except OSError:
+            # Например, исчерпан лимит наблюдений - опрос работает всегда
+            pass
+    return PollingWatcher(root, extensions, skip_dirs, poll_interval, stat_extensions)
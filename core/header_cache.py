@@ -0,0 +1,186 @@
+"""
+Кэш сведений о сценах (SceneHeader) на диске (SQLite)
+
+Запись привязана к абсолютному пути, размеру и mtime_ns сцены, как в
+кэше миниатюр: повторное открытие папки не читает потоки свойств
+неизменённых сцен. Сцены, которые не удалось прочитать (SceneHeader.failed),
+не запоминаются. Размер кэша ограничен, давно не показанные записи
+вытесняются.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+from .parse_cache import default_cache_dir
+from .scene_header import SceneHeader
+
+
+class SceneHeaderCache:
+    """LRU-кэш SceneHeader по идентичности файла сцены"""
+
+    DEFAULT_MAX_BYTES = 32 * 1024 * 1024
+    EVICT_TO_RATIO = 0.9
+
+    def __init__(self, cache_file: Optional[Path] = None,
+                 max_bytes: int = DEFAULT_MAX_BYTES):
+        """
+        Args:
+            cache_file: Файл базы (если None, используется папка кэша пользователя)
+            max_bytes: Предел суммарного размера записей
+        """
+        if cache_file is None:
+            cache_file = default_cache_dir() / "scene_header_cache.sqlite"
+
+        self.cache_file = Path(cache_file)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        # Суммарный размер записей: считается один раз, дальше ведётся при
+        # записи, чтобы не суммировать всю таблицу на каждую сцену
+        self._total: Optional[int] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        """Открывает базу при первом обращении"""
+
+        if self._conn is None:
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            # Сведения загружаются пулом потоков, доступ сериализуется блокировкой
+            conn = sqlite3.connect(str(self.cache_file), timeout=10,
+                                   check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS headers (
+                    path TEXT PRIMARY KEY,
+                    size INTEGER NOT NULL,
+                    mtime_ns INTEGER NOT NULL,
+                    data TEXT NOT NULL,
+                    data_size INTEGER NOT NULL,
+                    last_used REAL NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS headers_last_used ON headers(last_used)")
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    @staticmethod
+    def _key_path(scene_path: Path) -> str:
+        return os.path.normcase(os.path.abspath(scene_path))
+
+    def get(self, scene_path: Path, stat: os.stat_result) -> Optional[SceneHeader]:
+        """Сохранённые сведения, если сцена не менялась (None - записи нет)"""
+
+        try:
+            with self._lock:
+                conn = self._connect()
+                row = conn.execute(
+                    "SELECT size, mtime_ns, data FROM headers WHERE path = ?",
+                    (self._key_path(scene_path),)).fetchone()
+                if row is None:
+                    return None
+                size, mtime_ns, data = row
+                if size != stat.st_size or mtime_ns != stat.st_mtime_ns:
+                    return None
+                conn.execute("UPDATE headers SET last_used = ? WHERE path = ?",
+                             (time.time(), self._key_path(scene_path)))
+                conn.commit()
+            return SceneHeader.from_dict(Path(scene_path), json.loads(data))
+        except (sqlite3.Error, ValueError, TypeError):
+            return None
+
+    def put(self, scene_path: Path, stat: os.stat_result, header: SceneHeader):
+        """Сохраняет сведения о сцене"""
+
+        data = json.dumps(header.to_dict(), ensure_ascii=False)
+        key = self._key_path(scene_path)
+        try:
+            with self._lock:
+                conn = self._connect()
+                if self._total is None:
+                    self._total = conn.execute(
+                        "SELECT COALESCE(SUM(data_size), 0) FROM headers").fetchone()[0]
+                old = conn.execute("SELECT data_size FROM headers WHERE path = ?",
+                                   (key,)).fetchone()
+                conn.execute(
+                    "INSERT OR REPLACE INTO headers VALUES (?, ?, ?, ?, ?, ?)",
+                    (key, stat.st_size, stat.st_mtime_ns, data, len(data), time.time()))
+                self._total += len(data) - (old[0] if old else 0)
+                self._evict(conn)
+                conn.commit()
+        except sqlite3.Error:
+            # Сумма могла разойтись с базой - пересчитаем при следующей записи
+            self._total = None
+
+    def get_or_read(self, scene_path: Path,
+                    reader: Callable[[Path], SceneHeader]) -> SceneHeader:
+        """
+        Сведения из кэша, а при промахе - прочитанные reader и сохранённые
+        (если сцену удалось прочитать)
+        """
+
+        scene_path = Path(scene_path)
+        try:
+            stat = scene_path.stat()
+        except OSError:
+            return reader(scene_path)
+
+        header = self.get(scene_path, stat)
+        if header is None:
+            header = reader(scene_path)
+            if not header.failed:
+                self.put(scene_path, stat, header)
+        return header
+
+    def _evict(self, conn: sqlite3.Connection):
+        """Удаляет давно не показанные записи сверх предела размера"""
+
+        if self._total <= self.max_bytes:
+            return
+
+        target = self._total - int(self.max_bytes * self.EVICT_TO_RATIO)
+        freed = 0
+        stale = []
+        for path, data_size in conn.execute(
+                "SELECT path, data_size FROM headers ORDER BY last_used"):
+            stale.append((path,))
+            freed += data_size
+            if freed >= target:
+                break
+        conn.executemany("DELETE FROM headers WHERE path = ?", stale)
+        self._total -= freed
+
+    def clear(self):
+        """Удаляет все записи"""
+
+        with self._lock:
+            conn = self._connect()
+            conn.execute("DELETE FROM headers")
+            conn.commit()
+            conn.execute("VACUUM")
+            self._total = 0
+
+    def get_stats(self) -> Dict:
+        """Количество записей и занимаемый размер"""
+
+        with self._lock:
+            conn = self._connect()
+            count, total = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(data_size), 0) FROM headers").fetchone()
+        return {
+            'entries': count,
+            'payload_size': total,
+            'max_size': self.max_bytes,
+            'cache_file': str(self.cache_file),
+        }
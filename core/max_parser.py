@@ -3,51 +3,194 @@
 Улучшенная версия с лучшим поиском путей
 """
 
-import olefile
 import re
 import os
-import struct
+import time
+import zlib
+from enum import Enum
 from pathlib import Path
-from typing import Set, Dict, List, Optional, Tuple
+from typing import (TYPE_CHECKING, Set, Dict, Generator, List, NamedTuple, Optional, Tuple,
+                    Iterable, Iterator, Union)
 from dataclasses import dataclass, field
 
+from .ole_reader import CompoundFile, CompoundFileError, NotCompoundFileError
+from .asset_metadata import ASSET_METADATA_STREAMS, AssetRecord, parse_asset_metadata
+from .compressed_scene import InflatingReader, is_compressed_scene
+from .dir_cache import DirectoryCache
+from .path_mapper import PathMapper
+from .parse_cache import ParseCache
+from .path_table import PathSet
+from .scene_header import (DOC_SUMMARY_STREAM, SUMMARY_STREAM, SceneHeader,
+                           parse_scene_header, thumbnail_from_summary)
+
+if TYPE_CHECKING:
+    from concurrent.futures import ProcessPoolExecutor
+
+
+# Окно сканирования: bytes или срез memoryview над отображённым файлом
+Buffer = Union[bytes, memoryview]
+
+
+class ParseMode(Enum):
+    """Глубина разбора сцены"""
+    # Только таблица FileAssetMetaData и потоки свойств документа
+    FAST = "fast"
+    # Таблица ассетов, а без неё - эвристический поиск по всем потокам
+    STANDARD = "standard"
+    # Поиск по всем потокам даже при наличии таблицы, откат от
+    # расширения ищет и прочие ассеты (IES, материалы)
+    EXHAUSTIVE = "exhaustive"
+    
+    def deeper(self) -> Optional['ParseMode']:
+        """Следующий по глубине режим (None для самого глубокого)"""
+        order = list(ParseMode)
+        index = order.index(self)
+        return order[index + 1] if index + 1 < len(order) else None
+
+
+@dataclass
+class ParseProfile:
+    """Профиль разбора сцены: прочитанные байты, время этапов, счётчики путей"""
+    # Байт, переданных декодеру или сканеру, по потокам
+    stream_bytes: Dict[str, int] = field(default_factory=dict)
+    # Время этапов, сек: ole_open, ole_read, inflate, metadata, fingerprint,
+    # scan, resolve, clean, cache
+    timings: Dict[str, float] = field(default_factory=dict)
+    # Сжатая сцена: прочитано с диска и получено после распаковки
+    compressed_bytes: int = 0
+    inflated_bytes: int = 0
+    # Байт потоков, находки которых взяты из кэша по отпечатку
+    reused_bytes: int = 0
+    # Кандидаты в пути по источнику: metadata, drive, unc, wdrive, ext, wext
+    found: Dict[str, int] = field(default_factory=dict)
+    accepted: int = 0
+    # Отклонённые кандидаты по причине (см. MaxFileParser.REJECT_REASONS)
+    rejected: Dict[str, int] = field(default_factory=dict)
+    
+    def add_time(self, stage: str, seconds: float):
+        self.timings[stage] = self.timings.get(stage, 0.0) + seconds
+    
+    @property
+    def total_found(self) -> int:
+        return sum(self.found.values())
+    
+    @property
+    def total_bytes(self) -> int:
+        return sum(self.stream_bytes.values())
+
+
+class FoundAsset(NamedTuple):
+    """Ассет, найденный при разборе сцены"""
+    kind: str     # texture, proxy, other
+    path: str
+    stream: str   # Поток сцены, в котором найден путь
+    offset: int   # Смещение в потоке (для таблицы ассетов - начало записи)
+
+
+# Вид ассета -> поле SceneAssets
+ASSET_KIND_FIELDS = {
+    'texture': 'textures',
+    'proxy': 'proxies',
+    'other': 'other_assets',
+}
+
 
 @dataclass
 class SceneAssets:
     """Контейнер для ассетов сцены"""
     scene_path: Path
-    textures: Set[str] = field(default_factory=set)
-    proxies: Set[str] = field(default_factory=set)
-    other_assets: Set[str] = field(default_factory=set)
+    textures: PathSet = field(default_factory=PathSet)
+    proxies: PathSet = field(default_factory=PathSet)
+    other_assets: PathSet = field(default_factory=PathSet)
     errors: List[str] = field(default_factory=list)
     debug_info: List[str] = field(default_factory=list)
     
+    # Режим, которым получен результат, и время каждого прохода (сек)
+    parse_mode: ParseMode = ParseMode.STANDARD
+    mode_timings: Dict[str, float] = field(default_factory=dict)
+    # Ассеты взяты из таблицы FileAssetMetaData
+    metadata_found: bool = False
+    # Результат взят из кэша разбора
+    from_cache: bool = False
+    # Разбор прерван исключением (нет доступа, файл занят) - в кэш не пишется
+    failed: bool = False
+    # Профиль последнего прохода разбора
+    profile: ParseProfile = field(default_factory=ParseProfile)
+    
     @property
-    def all_assets(self) -> Set[str]:
+    def all_assets(self) -> PathSet:
         return self.textures | self.proxies | self.other_assets
     
-    def get_existing_assets(self) -> Dict[str, List[Path]]:
-        """Возвращает только существующие файлы"""
+    def add(self, kind: str, path: str) -> bool:
+        """Добавляет путь в набор своего вида; False, если он уже есть"""
+        paths = getattr(self, ASSET_KIND_FIELDS[kind])
+        if path in paths:
+            return False
+        paths.add(path)
+        return True
+    
+    @property
+    def looks_incomplete(self) -> bool:
+        """Результат неглубокого разбора, которому не стоит доверять"""
+        if self.errors or self.metadata_found:
+            return False
+        if self.parse_mode == ParseMode.FAST:
+            return True
+        return self.parse_mode == ParseMode.STANDARD and not self.all_assets
+    
+    def to_dict(self) -> Dict:
+        """Преобразует в словарь для сохранения в кэше"""
+        return {
+            'textures': sorted(self.textures),
+            'proxies': sorted(self.proxies),
+            'other_assets': sorted(self.other_assets),
+            'errors': self.errors,
+            'metadata_found': self.metadata_found,
+        }
+    
+    @classmethod
+    def from_dict(cls, scene_path: Path, parse_mode: ParseMode, data: Dict) -> 'SceneAssets':
+        """Создает из словаря, сохранённого в кэше"""
+        return cls(
+            scene_path=scene_path,
+            textures=PathSet(data.get('textures', [])),
+            proxies=PathSet(data.get('proxies', [])),
+            other_assets=PathSet(data.get('other_assets', [])),
+            errors=list(data.get('errors', [])),
+            parse_mode=parse_mode,
+            metadata_found=data.get('metadata_found', False),
+            from_cache=True,
+        )
+    
+    def get_existing_assets(self, dir_cache: Optional[DirectoryCache] = None,
+                            path_mapper: Optional[PathMapper] = None) -> Dict[str, List[Path]]:
+        """
+        Возвращает только существующие файлы
+        
+        Args:
+            dir_cache: Кэш листингов папок прохода (если None - создаётся свой)
+            path_mapper: Перевод Windows-путей в пути этой машины; найденные
+                файлы возвращаются по переведённым путям
+        """
+        if dir_cache is None:
+            dir_cache = DirectoryCache()
         result = {
             'textures': [],
             'proxies': [],
             'other': []
         }
         
-        for tex in self.textures:
-            path = Path(tex)
-            if path.exists():
-                result['textures'].append(path)
-                
-        for proxy in self.proxies:
-            path = Path(proxy)
-            if path.exists():
-                result['proxies'].append(path)
-                
-        for other in self.other_assets:
-            path = Path(other)
-            if path.exists():
-                result['other'].append(path)
+        for key, paths in (('textures', self.textures), ('proxies', self.proxies),
+                           ('other', self.other_assets)):
+            for asset in paths:
+                if path_mapper:
+                    path = path_mapper.resolve(asset, dir_cache)
+                    if path is not None:
+                        result[key].append(path)
+                    continue
+                path = Path(asset)
+                if dir_cache.exists(path):
+                    result[key].append(path)
                 
         return result
 
@@ -75,15 +218,61 @@ class MaxFileParser:
         '.obj',     # OBJ (часто используется как прокси)
     }
     
-    def __init__(self, debug: bool = False):
+    # Прочие ассеты (IES, HDRI, материалы)
+    OTHER_EXTENSIONS = {'.ies', '.hdri', '.mat', '.vismat'}
+    
+    # Типы записей FileAssetMetaData для файлов с незнакомым расширением
+    METADATA_TEXTURE_TYPES = {'Bitmap'}
+    METADATA_OTHER_TYPES = {'Photometric'}
+    
+    # Размер окна сканирования потока и перекрытие соседних окон.
+    # Перекрытие больше максимальной длины пути (500 символов UTF-16),
+    # поэтому путь на границе окон целиком попадает в одно из них
+    SCAN_WINDOW_SIZE = 4 * 1024 * 1024
+    SCAN_WINDOW_OVERLAP = 4 * 1024
+    
+    # Потоки от этого размера сканируются частями в пуле процессов.
+    # Процессы сами отображают файл в память - данные не пересылаются
+    PARALLEL_SCAN_THRESHOLD = 1024 * 1024 * 1024
+    PARALLEL_CHUNK_SIZE = 64 * 1024 * 1024
+    
+    # Причины отклонения кандидатов в пути (для профиля разбора)
+    REJECT_REASONS = {
+        'empty': 'пустая строка',
+        'too_short': 'короче 5 символов',
+        'no_extension': 'нет расширения',
+        'bad_path': 'некорректный путь',
+        'unknown_extension': 'неизвестное расширение',
+        'system_path': 'системный путь',
+    }
+    
+    # Версия логики извлечения путей: её смена сбрасывает кэш разбора
+    PARSER_VERSION = "6"
+    
+    def __init__(self, debug: bool = False, cache: Optional[ParseCache] = None,
+                 scan_workers: int = 1, parallel_threshold: Optional[int] = None):
+        """
+        Args:
+            debug: Собирать отладочную информацию
+            cache: Кэш результатов разбора
+            scan_workers: Число процессов для сканирования одного большого потока
+            parallel_threshold: Размер потока, с которого включается
+                параллельное сканирование (None - PARALLEL_SCAN_THRESHOLD)
+        """
         self.debug = debug
+        self.cache = cache
+        self.scan_workers = max(1, scan_workers)
+        self.parallel_threshold = (parallel_threshold if parallel_threshold is not None
+                                   else self.PARALLEL_SCAN_THRESHOLD)
     
-    def parse_scene(self, max_file_path: str | Path) -> SceneAssets:
+    def parse_scene(self, max_file_path: str | Path,
+                    mode: ParseMode = ParseMode.STANDARD) -> SceneAssets:
         """
         Парсит .max файл и извлекает все пути к ассетам
         """
         max_file_path = Path(max_file_path)
-        assets = SceneAssets(scene_path=max_file_path)
+        assets = SceneAssets(scene_path=max_file_path, parse_mode=mode)
+        started = time.perf_counter()
         
         if not max_file_path.exists():
             assets.errors.append(f"Файл не найден: {max_file_path}")
@@ -93,311 +282,867 @@ class MaxFileParser:
             assets.errors.append(f"Неверный формат файла: {max_file_path}")
             return assets
         
+        stat = None
+        if self.cache is not None:
+            try:
+                stat = max_file_path.stat()
+            except OSError:
+                stat = None
+            cached = self._load_cached(max_file_path, mode, stat) if stat else None
+            if cached is not None:
+                return cached
+        
+        for _ in self.iter_assets(max_file_path, mode, assets):
+            pass
+        
+        assets.mode_timings[mode.value] = time.perf_counter() - started
+        
+        # Сбой чтения может быть временным: такой результат не кэшируем,
+        # иначе он возвращался бы до изменения сцены
+        if stat is not None and not assets.failed:
+            self.cache.put(max_file_path, stat, mode.value, self.PARSER_VERSION, assets.to_dict())
+        
+        if self.debug:
+            assets.debug_info.append(f"Найдено текстур: {len(assets.textures)}")
+            assets.debug_info.append(f"Найдено прокси: {len(assets.proxies)}")
+            assets.debug_info.append(
+                f"Режим {mode.value}: {assets.mode_timings[mode.value] * 1000:.1f} мс")
+        
+        return assets
+    
+    def iter_assets(self, max_file_path: str | Path,
+                    mode: ParseMode = ParseMode.STANDARD,
+                    assets: Optional[SceneAssets] = None) -> Iterator[FoundAsset]:
+        """
+        Отдаёт ассеты сцены по мере нахождения, без повторов.
+        
+        Пути отдаются в окончательном виде, как в parse_scene. Ассеты,
+        ошибки и профиль накапливаются в assets, если он передан.
+        Кэш разбора не используется.
+        """
+        max_file_path = Path(max_file_path)
+        if assets is None:
+            assets = SceneAssets(scene_path=max_file_path, parse_mode=mode)
+        
+        if not max_file_path.exists():
+            assets.errors.append(f"Файл не найден: {max_file_path}")
+            return
+        
+        if max_file_path.suffix.lower() != '.max':
+            assets.errors.append(f"Неверный формат файла: {max_file_path}")
+            return
+        
+        profile = assets.profile
         try:
-            if not olefile.isOleFile(str(max_file_path)):
-                assets.errors.append(f"Файл не является OLE: {max_file_path}")
-                return assets
-            
-            with olefile.OleFileIO(str(max_file_path)) as ole:
-                self._extract_from_ole(ole, assets)
+            opened = time.perf_counter()
+            with CompoundFile(max_file_path) as cfb:
+                profile.add_time('ole_open', time.perf_counter() - opened)
+                yield from self._unique(self._extract_from_ole(cfb, assets, mode), assets)
                 
+        except NotCompoundFileError:
+            if not self._is_compressed(max_file_path):
+                assets.errors.append(f"Файл не является OLE: {max_file_path}")
+                return
+            try:
+                yield from self._unique(self._extract_from_compressed(max_file_path, assets, mode), assets)
+            except Exception as e:
+                assets.errors.append(f"Ошибка распаковки {max_file_path}: {str(e)}")
+                assets.failed = True
         except Exception as e:
             assets.errors.append(f"Ошибка парсинга {max_file_path}: {str(e)}")
+            assets.failed = True
+    
+    def _unique(self, found: Iterable[FoundAsset], assets: SceneAssets) -> Iterator[FoundAsset]:
+        """Добавляет ассеты в SceneAssets и отдаёт только новые"""
         
-        # Резолвим относительные пути
-        self._resolve_relative_paths(assets)
+        for asset in found:
+            if assets.add(asset.kind, asset.path):
+                if self.debug and asset.kind != 'other':
+                    assets.debug_info.append(f"Found {asset.kind}: {asset.path}")
+                yield asset
+    
+    def get_cached(self, max_file_path: str | Path,
+                   mode: ParseMode = ParseMode.STANDARD) -> Optional[SceneAssets]:
+        """Результат из кэша разбора без разбора сцены (None, если его нет)"""
         
-        # Очищаем невалидные пути
-        self._clean_paths(assets)
+        if self.cache is None:
+            return None
+        max_file_path = Path(max_file_path)
+        try:
+            stat = max_file_path.stat()
+        except OSError:
+            return None
+        return self._load_cached(max_file_path, mode, stat)
+    
+    def read_scene_header(self, max_file_path: str | Path) -> SceneHeader:
+        """
+        Сведения о сцене (версия Max, рендер, автор, дата сохранения,
+        миниатюра) из потоков свойств документа. Читаются только их
+        сектора, сами потоки сцены не затрагиваются.
+        """
+        max_file_path = Path(max_file_path)
+
+        try:
+            with CompoundFile(max_file_path) as cfb:
+                streams = {}
+                for name in (SUMMARY_STREAM, DOC_SUMMARY_STREAM):
+                    try:
+                        streams[name] = cfb.read_stream([name])
+                    except KeyError:
+                        streams[name] = None
+            return parse_scene_header(max_file_path, streams[SUMMARY_STREAM],
+                                      streams[DOC_SUMMARY_STREAM])
+
+        except NotCompoundFileError:
+            header = SceneHeader(scene_path=max_file_path)
+            if self._is_compressed(max_file_path):
+                # Потоки свойств лежат внутри сжатых данных
+                header.compressed = True
+                header.error = "Сжатая сцена: сведения доступны только при полном разборе"
+            else:
+                header.error = f"Файл не является OLE: {max_file_path}"
+            return header
+        except Exception as e:
+            return SceneHeader(scene_path=max_file_path, failed=True,
+                               error=f"Ошибка чтения {max_file_path}: {str(e)}")
+
+    def read_thumbnail(self, max_file_path: str | Path) -> Optional[bytes]:
+        """
+        Миниатюра сцены в виде файла BMP (None, если её нет). Читается
+        только поток \\x05SummaryInformation.
+
+        Raises:
+            OSError: сцена не читается (сбой сети, файл занят). Такой
+                результат может быть временным, его нельзя кэшировать
+        """
+        try:
+            with CompoundFile(max_file_path) as cfb:
+                summary = cfb.read_stream([SUMMARY_STREAM])
+        except (KeyError, CompoundFileError):
+            # Нет потока свойств, сжатая сцена или не OLE - миниатюры нет
+            return None
+        return thumbnail_from_summary(summary)
+
+    def _load_cached(self, max_file_path: Path, mode: ParseMode,
+                     stat: os.stat_result) -> Optional[SceneAssets]:
+        started = time.perf_counter()
+        cached = self.cache.get(max_file_path, stat, mode.value, self.PARSER_VERSION)
+        if cached is None:
+            return None
         
+        assets = SceneAssets.from_dict(max_file_path, mode, cached)
+        assets.mode_timings[mode.value] = time.perf_counter() - started
+        assets.profile.add_time('cache', assets.mode_timings[mode.value])
         if self.debug:
-            assets.debug_info.append(f"Найдено текстур: {len(assets.textures)}")
-            assets.debug_info.append(f"Найдено прокси: {len(assets.proxies)}")
-        
+            assets.debug_info.append(f"{max_file_path.name}: результат из кэша разбора")
         return assets
     
-    def _extract_from_ole(self, ole: olefile.OleFileIO, assets: SceneAssets):
-        """Извлекает пути из OLE структуры"""
+    def _extract_from_ole(self, cfb: CompoundFile, assets: SceneAssets,
+                          mode: ParseMode = ParseMode.STANDARD) -> Iterator[FoundAsset]:
+        """
+        Извлекает пути из OLE структуры. Если в сцене есть таблица
+        FileAssetMetaData, берём ассеты из неё; иначе сканируем
+        каждый поток окнами
+        """
         
         if self.debug:
-            assets.debug_info.append(f"OLE streams: {ole.listdir()}")
+            assets.debug_info.append(f"OLE streams: {cfb.list_streams()}")
         
-        # Объединяем все данные для поиска
-        all_data = b''
+        profile = assets.profile
+        assets.metadata_found = yield from self._extract_from_metadata(cfb, assets)
         
-        for stream_path in ole.listdir():
-            try:
+        if mode == ParseMode.FAST:
+            # Потоки свойств документа (\x05SummaryInformation и т.п.)
+            # небольшие и содержат список внешних зависимостей
+            streams = [p for p in cfb.list_streams() if p[-1].startswith('\x05')]
+        elif mode == ParseMode.STANDARD and assets.metadata_found:
+            return
+        else:
+            streams = cfb.list_streams()
+        
+        exhaustive = mode == ParseMode.EXHAUSTIVE
+        
+        # Отпечатки потоков прошлого разбора: неизменённые потоки не сканируем
+        fingerprints = None
+        previous = {}
+        if self.cache is not None:
+            fingerprints = {}
+            previous = self.cache.get_streams(cfb.path, mode.value, self.PARSER_VERSION) or {}
+        
+        pool = None
+        try:
+            for stream_path in streams:
                 stream_name = '/'.join(stream_path)
-                data = ole.openstream(stream_path).read()
-                all_data += data
-                
-                if self.debug:
-                    assets.debug_info.append(f"Stream: {stream_name}, size: {len(data)}")
-                    
-            except Exception as e:
+                size = cfb.get_size(stream_path)
                 if self.debug:
-                    assets.debug_info.append(f"Error reading stream {stream_path}: {e}")
-                continue
+                    assets.debug_info.append(f"Stream: {stream_name}, size: {size}")
+                
+                stored = previous.get(stream_name)
+                if stored is not None and stored['size'] == size:
+                    stage = time.perf_counter()
+                    crc = self._stream_crc(cfb, stream_path)
+                    profile.add_time('fingerprint', time.perf_counter() - stage)
+                    if crc == stored['crc32']:
+                        profile.reused_bytes += size
+                        fingerprints[stream_name] = stored
+                        if self.debug:
+                            assets.debug_info.append(f"Stream {stream_name}: не изменился, находки из кэша")
+                        for kind, path_str, offset in stored['assets']:
+                            yield FoundAsset(kind, path_str, stream_name, offset)
+                        continue
+                
+                collected = {} if fingerprints is not None else None
+                if self.scan_workers > 1 and size >= self.parallel_threshold:
+                    if pool is None:
+                        from concurrent.futures import ProcessPoolExecutor
+                        pool = ProcessPoolExecutor(max_workers=self.scan_workers,
+                                                   initializer=_init_scan_worker,
+                                                   initargs=(type(self),))
+                    crc = yield from self._scan_stream_parallel(pool, cfb, stream_path, assets,
+                                                                exhaustive, collected)
+                else:
+                    crc = yield from self._scan_stream(cfb, stream_path, assets, exhaustive, collected)
+                
+                if collected is not None and crc is not None:
+                    fingerprints[stream_name] = {
+                        'size': size,
+                        'crc32': crc,
+                        'assets': [[a.kind, a.path, a.offset] for a in collected.values()],
+                    }
+        finally:
+            if pool is not None:
+                pool.shutdown()
         
-        # Извлекаем пути разными методами
-        self._extract_ascii_paths(all_data, assets)
-        self._extract_unicode_paths(all_data, assets)
-        self._extract_by_extension(all_data, assets)
+        if fingerprints is not None:
+            self.cache.put_streams(cfb.path, mode.value, self.PARSER_VERSION, fingerprints)
     
-    def _extract_ascii_paths(self, data: bytes, assets: SceneAssets):
-        """Извлекает ASCII пути"""
+    @staticmethod
+    def _stream_crc(cfb: CompoundFile, stream_path: List[str]) -> int:
+        """Отпечаток содержимого потока - CRC32 по его сегментам"""
         
-        # Паттерны для Windows путей
-        patterns = [
-            # Полный путь: C:\folder\file.ext
-            rb'([A-Za-z]:[\\\/](?:[^\x00-\x1f\\/:*?"<>|]+[\\\/])*[^\x00-\x1f\\/:*?"<>|]+\.(?:jpg|jpeg|png|tga|tif|tiff|bmp|gif|exr|hdr|psd|dds|tx|tex|vrmesh|abc|rs|ass|bgeo|obj|ies|hdri))',
-            # UNC путь: \\server\share\file.ext
-            rb'(\\\\[^\x00-\x1f\\/:*?"<>|]+(?:\\[^\x00-\x1f\\/:*?"<>|]+)+\.(?:jpg|jpeg|png|tga|tif|tiff|bmp|gif|exr|hdr|psd|dds|tx|tex|vrmesh|abc|rs|ass|bgeo|obj|ies|hdri))',
+        crc = 0
+        for segment in cfb.iter_segments(stream_path):
+            crc = zlib.crc32(segment, crc)
+        return crc
+    
+    @staticmethod
+    def _is_compressed(max_file_path: Path) -> bool:
+        """Сохранена ли сцена с Compress on Save"""
+        try:
+            with open(max_file_path, 'rb') as f:
+                return is_compressed_scene(f.read(2))
+        except OSError:
+            return False
+    
+    def _extract_from_compressed(self, max_file_path: Path, assets: SceneAssets,
+                                 mode: ParseMode = ParseMode.STANDARD) -> Iterator[FoundAsset]:
+        """
+        Сканирует сжатую сцену по мере распаковки.
+        
+        Структура OLE доступна только после распаковки всего файла, поэтому
+        распакованные данные сканируются сплошным потоком окнами, без
+        разбора на потоки и таблицы FileAssetMetaData. Быстрый режим
+        здесь ничего не сэкономит - он выполняется как стандартный.
+        """
+        
+        if mode == ParseMode.FAST:
+            assets.parse_mode = mode = ParseMode.STANDARD
+        exhaustive = mode == ParseMode.EXHAUSTIVE
+        profile = assets.profile
+        reader = InflatingReader(max_file_path, self.SCAN_WINDOW_SIZE // 4)
+        
+        # Распаковка и сканирование чередуются, время делим по границам окон
+        inflate_started = time.perf_counter()
+        for window, lo, hi, base in self._iter_windows(reader):
+            scan_started = time.perf_counter()
+            profile.add_time('inflate', scan_started - inflate_started)
+            
+            found = self._scan_found(window, lo, hi, base, exhaustive, assets, '')
+            profile.add_time('scan', time.perf_counter() - scan_started)
+            yield from found
+            inflate_started = time.perf_counter()
+        
+        profile.compressed_bytes = reader.compressed_bytes
+        profile.inflated_bytes = reader.inflated_bytes
+        if reader.truncated:
+            assets.errors.append(f"Сжатая сцена обрезана: {max_file_path}")
+        
+        if self.debug:
+            assets.debug_info.append(
+                f"Сжатая сцена: {reader.compressed_bytes} -> {reader.inflated_bytes} байт")
+    
+    def _scan_stream(self, cfb: CompoundFile, stream_path: List[str], assets: SceneAssets,
+                     exhaustive: bool, collected: Optional[Dict[str, FoundAsset]] = None
+                     ) -> Generator[FoundAsset, None, Optional[int]]:
+        """
+        Сканирует поток окнами в текущем процессе.
+        
+        Если передан collected, собирает в него находки потока и возвращает
+        CRC32 потока (None при ошибке чтения).
+        """
+        
+        profile = assets.profile
+        stream_name = '/'.join(stream_path)
+        crc = 0
+        try:
+            # Чтение (сборка окон из секторов) и сканирование чередуются,
+            # время делим по границам окон
+            segments = cfb.iter_segments(stream_path, self.SCAN_WINDOW_SIZE)
+            read_started = time.perf_counter()
+            for window, lo, hi, base in self._iter_windows(segments):
+                scan_started = time.perf_counter()
+                profile.add_time('ole_read', scan_started - read_started)
+                profile.stream_bytes[stream_name] = profile.stream_bytes.get(stream_name, 0) + hi - lo
+                
+                # Находки окна отдаём после замера, чтобы не учитывать время потребителя
+                found = self._scan_found(window, lo, hi, base, exhaustive, assets, stream_name)
+                if collected is not None:
+                    crc = zlib.crc32(memoryview(window)[lo:hi], crc)
+                    for asset in found:
+                        collected.setdefault(asset.path, asset)
+                profile.add_time('scan', time.perf_counter() - scan_started)
+                yield from found
+                read_started = time.perf_counter()
+            
+        except Exception as e:
+            if self.debug:
+                assets.debug_info.append(f"Error reading stream {stream_path}: {e}")
+            return None
+        return crc
+    
+    def _scan_found(self, window: Buffer, lo: int, hi: int, base: int, exhaustive: bool,
+                    assets: SceneAssets, stream_name: str) -> List[FoundAsset]:
+        """Принятые ассеты окна; base - смещение окна в потоке"""
+        
+        found = []
+        for start, path_str, kind in self._scan_window(window, lo, hi, exhaustive):
+            asset = self._process_found_path(path_str, assets, kind, stream_name, base + start)
+            if asset is not None:
+                found.append(asset)
+        return found
+    
+    def _scan_stream_parallel(self, pool: 'ProcessPoolExecutor', cfb: CompoundFile,
+                              stream_path: List[str], assets: SceneAssets, exhaustive: bool,
+                              collected: Optional[Dict[str, FoundAsset]] = None
+                              ) -> Generator[FoundAsset, None, Optional[int]]:
+        """
+        Сканирует большой поток частями в пуле процессов.
+        
+        Части кратны окну сканирования, поэтому окна в процессах совпадают
+        с окнами последовательного прохода. Путь принадлежит части, в которой
+        лежит его якорь, так что путь на стыке частей учитывается один раз.
+        """
+        
+        profile = assets.profile
+        stream_name = '/'.join(stream_path)
+        size = cfb.get_size(stream_path)
+        step = self.SCAN_WINDOW_SIZE
+        chunk = max(1, self.PARALLEL_CHUNK_SIZE // step) * step
+        
+        futures = [
+            pool.submit(_scan_chunk_in_worker, str(cfb.path), stream_path,
+                        start, min(start + chunk, size), size, exhaustive)
+            for start in range(0, size, chunk)
         ]
+        try:
+            # Результаты разбираем в порядке частей - как при последовательном проходе
+            for future in futures:
+                started = time.perf_counter()
+                found = []
+                for offset, path_str, kind in future.result():
+                    asset = self._process_found_path(path_str, assets, kind, stream_name, offset)
+                    if asset is not None:
+                        found.append(asset)
+                        if collected is not None:
+                            collected.setdefault(asset.path, asset)
+                profile.add_time('scan', time.perf_counter() - started)
+                yield from found
+            profile.stream_bytes[stream_name] = profile.stream_bytes.get(stream_name, 0) + size
+        except Exception as e:
+            if self.debug:
+                assets.debug_info.append(f"Error reading stream {stream_path}: {e}")
+            return None
+        finally:
+            for future in futures:
+                future.cancel()
         
-        for pattern in patterns:
-            try:
-                matches = re.findall(pattern, data, re.IGNORECASE)
-                for match in matches:
-                    self._process_found_path(match, assets)
-            except Exception as e:
-                if self.debug:
-                    assets.debug_info.append(f"ASCII pattern error: {e}")
+        if self.debug:
+            assets.debug_info.append(
+                f"Stream {stream_name}: {len(futures)} частей в {self.scan_workers} процессах")
+        
+        if collected is None:
+            return None
+        stage = time.perf_counter()
+        crc = self._stream_crc(cfb, stream_path)
+        profile.add_time('fingerprint', time.perf_counter() - stage)
+        return crc
     
-    def _extract_unicode_paths(self, data: bytes, assets: SceneAssets):
-        """Извлекает Unicode (UTF-16 LE) пути"""
+    def _scan_chunk(self, cfb: CompoundFile, stream_path: List[str], start: int,
+                    end: int, size: int, exhaustive: bool) -> List[Tuple[int, str, str]]:
+        """Кандидаты (смещение, путь, вид якоря) с якорем в области потока [start, end)"""
         
-        # Ищем паттерны типа "C\x00:\x00\\x00" (UTF-16 LE)
-        # Паттерн для диска
-        drive_pattern = rb'([A-Za-z]\x00:\x00[\\/]\x00)'
+        overlap = self.SCAN_WINDOW_OVERLAP
+        begin = max(start - overlap, 0)
+        segments = cfb.iter_segments(stream_path, self.SCAN_WINDOW_SIZE,
+                                     begin, min(end + overlap, size))
         
-        matches = list(re.finditer(drive_pattern, data))
+        found = []
+        for window, lo, hi, base in self._iter_windows(segments, start - begin, end - begin):
+            for offset, path_str, kind in self._scan_window(window, lo, hi, exhaustive):
+                found.append((begin + base + offset, path_str, kind))
+        return found
+    
+    def _extract_from_metadata(self, cfb: CompoundFile,
+                               assets: SceneAssets) -> Iterator[FoundAsset]:
+        """
+        Отдаёт ассеты из потока FileAssetMetaData3/2.
+        Возвращает (через StopIteration) False, если потока нет или он не разобрался
+        """
         
-        for match in matches:
-            start = match.start()
-            # Читаем до 500 символов (1000 байт в UTF-16)
-            end = min(start + 1000, len(data))
-            chunk = data[start:end]
+        started = time.perf_counter()
+        streams = {path[-1]: path for path in cfb.list_streams()}
+        for name in ASSET_METADATA_STREAMS:
+            stream_path = streams.get(name)
+            if stream_path is None:
+                continue
             
-            # Ищем конец строки (null-terminator или невалидный символ)
             try:
-                # Декодируем UTF-16 LE
-                decoded = ""
-                for i in range(0, len(chunk) - 1, 2):
-                    char_code = struct.unpack('<H', chunk[i:i+2])[0]
-                    if char_code == 0 or char_code > 127:
-                        # Проверяем кириллицу (0x0400-0x04FF)
-                        if 0x0400 <= char_code <= 0x04FF:
-                            decoded += chr(char_code)
-                        elif char_code == 0:
-                            break
-                        else:
-                            break
-                    else:
-                        decoded += chr(char_code)
-                
-                if decoded and len(decoded) > 5:
-                    self._process_found_path(decoded.encode('utf-8'), assets)
-                    
+                data = cfb.read_stream(stream_path)
+                assets.profile.stream_bytes[name] = len(data)
+                records = parse_asset_metadata(data, name)
             except Exception as e:
+                records = None
                 if self.debug:
-                    assets.debug_info.append(f"Unicode decode error: {e}")
+                    assets.debug_info.append(f"Error reading stream {name}: {e}")
+            
+            if records is None:
+                if self.debug:
+                    assets.debug_info.append(f"{name}: не удалось разобрать, используем поиск по потокам")
+                continue
+            
+            found = []
+            for record in records:
+                asset = self._process_metadata_record(record, assets, name)
+                if asset is not None:
+                    found.append(asset)
+            if self.debug:
+                assets.debug_info.append(f"{name}: записей {len(records)}")
+            assets.profile.add_time('metadata', time.perf_counter() - started)
+            yield from found
+            return True
+        
+        assets.profile.add_time('metadata', time.perf_counter() - started)
+        return False
     
-    def _extract_by_extension(self, data: bytes, assets: SceneAssets):
-        """Ищет пути по известным расширениям"""
+    def _process_metadata_record(self, record: AssetRecord, assets: SceneAssets,
+                                 stream_name: str = '') -> Optional[FoundAsset]:
+        """Классифицирует запись таблицы ассетов: по расширению, затем по типу"""
         
-        all_extensions = list(self.TEXTURE_EXTENSIONS) + list(self.PROXY_EXTENSIONS)
+        profile = assets.profile
+        profile.found['metadata'] = profile.found.get('metadata', 0) + 1
         
-        for ext in all_extensions:
-            # ASCII версия
-            ext_bytes = ext.encode('ascii')
-            self._find_paths_by_extension(data, ext_bytes, assets)
-            
-            # UTF-16 LE версия
-            ext_utf16 = ext.encode('utf-16-le')
-            self._find_paths_by_extension_utf16(data, ext_utf16, assets)
+        path_str = record.path.strip()
+        reason = self._check_path(path_str)
+        if reason is None:
+            kind = self._classify_path(path_str)
+        elif record.asset_type in self.METADATA_TEXTURE_TYPES:
+            kind = 'texture'
+        elif record.asset_type in self.METADATA_OTHER_TYPES:
+            kind = 'other'
+        else:
+            profile.rejected[reason] = profile.rejected.get(reason, 0) + 1
+            return None
+        profile.accepted += 1
+        return self._make_asset(kind, path_str, assets, stream_name, record.offset)
+    
+    def _iter_windows(self, segments: Iterable[Buffer], own_from: int = 0,
+                      own_to: Optional[int] = None) -> Iterator[Tuple[Buffer, int, int, int]]:
+        """
+        Собирает сегменты потока в окна фиксированного размера с перекрытием.
+        
+        Возвращает (окно, lo, hi, смещение окна в потоке): кандидат
+        принадлежит окну, если его якорь лежит в [lo, hi). Так каждый путь учитывается ровно в одном окне,
+        а перекрытие даёт достаточно контекста слева и справа от якоря.
+        Окно внутри одного сегмента отдаётся срезом без копирования,
+        копируются только окна на стыке несмежных секторов.
+        
+        own_from и own_to ограничивают собственные области окон, когда
+        сегменты - часть потока с контекстом по краям.
+        """
+        step = self.SCAN_WINDOW_SIZE
+        overlap = self.SCAN_WINDOW_OVERLAP
+        
+        pending = []            # (смещение в потоке, сегмент), ещё нужные окнам
+        received = 0            # Сколько байт потока уже получено
+        owned_start = own_from  # Начало следующей собственной области окна
+        
+        for segment in segments:
+            pending.append((received, segment))
+            received += len(segment)
+            while received >= owned_start + step + overlap:
+                if own_to is not None and owned_start >= own_to:
+                    return
+                begin = max(owned_start - overlap, 0)
+                lo = owned_start - begin
+                owned_end = owned_start + step if own_to is None else min(owned_start + step, own_to)
+                yield self._cut_window(pending, begin, owned_start + step + overlap), lo, owned_end - begin, begin
+                
+                owned_start += step
+                while pending and pending[0][0] + len(pending[0][1]) <= owned_start - overlap:
+                    pending.pop(0)
+        
+        if own_to is not None and owned_start >= own_to:
+            return
+        if received > owned_start:
+            begin = max(owned_start - overlap, 0)
+            owned_end = received if own_to is None else min(received, own_to)
+            yield self._cut_window(pending, begin, received), owned_start - begin, owned_end - begin, begin
+    
+    @staticmethod
+    def _cut_window(pending: List[Tuple[int, Buffer]], begin: int, end: int) -> Buffer:
+        """Вырезает из сегментов область потока [begin, end)"""
+        
+        pieces = []
+        for offset, segment in pending:
+            if offset >= end or offset + len(segment) <= begin:
+                continue
+            piece = segment[max(begin - offset, 0):end - offset]
+            if len(piece) == end - begin:
+                return piece
+            pieces.append(piece)
+        return b''.join(pieces)
+    
+    @classmethod
+    def _get_patterns(cls) -> Dict[str, 're.Pattern']:
+        """
+        Компилирует регулярные выражения сканера один раз на класс.
+        
+        Главное из них - объединённый шаблон якорей: буква диска и начало
+        UNC-пути (ASCII и UTF-16) плюс все расширения в обеих кодировках.
+        Он находит все места, где может быть путь, за один линейный проход.
+        """
+        patterns = cls.__dict__.get('_patterns')
+        if patterns is not None:
+            return patterns
+        
+        # Длинные расширения раньше коротких: .tiff не должен совпасть как .tif
+        def alternation(extensions: Set[str], encoding: str) -> bytes:
+            ordered = sorted(extensions, key=lambda e: (-len(e), e))
+            return b'|'.join(re.escape(ext[1:].encode(encoding)) for ext in ordered)
+        
+        scan_extensions = cls.TEXTURE_EXTENSIONS | cls.PROXY_EXTENSIONS
+        path_extensions = alternation(scan_extensions | cls.OTHER_EXTENSIONS, 'ascii')
+        
+        def anchors(extensions: Set[str]) -> 're.Pattern':
+            # Все якоря начинаются с одного из редких байтов ':', '\\', '.',
+            # а ветки проверяются уже после него. Так движок регулярных
+            # выражений быстро пропускает всё остальное за один проход.
+            # Якоря дисков и UNC не поглощают следующие байты, чтобы
+            # не скрыть соседний якорь.
+            return re.compile(
+                rb'[.:\\](?:'
+                rb'(?<=[A-Za-z]:)(?P<drive>(?=[\\/]))'
+                rb'|(?<=\\)(?P<unc>(?=\\))'
+                # Для UTF-16 путь от диска целиком (до 500 символов ASCII
+                # и кириллицы) захватывается в просмотре вперёд, так что
+                # концы всех таких путей находятся тем же проходом
+                rb'|(?<=[A-Za-z]\x00:)(?=(?P<wdrive>\x00[\\/]\x00(?:[\x01-\x7f]\x00|[\x00-\xff]\x04){0,497}))'
+                rb'|(?<=\.)(?P<ext>' + alternation(extensions, 'ascii') + rb')'
+                rb'|(?<=\.)(?P<wext>\x00(?:' + alternation(extensions, 'utf-16-le') + rb'))'
+                rb')'
+            )
+        
+        name_chars = rb'[^\x00-\x1f\\/:*?"<>|]'
+        patterns = {
+            # Полный путь: C:\folder\file.ext
+            'drive': re.compile(
+                rb'[A-Za-z]:[\\/](?:' + name_chars + rb'+[\\/])*' + name_chars
+                + rb'+\.(?:' + path_extensions + rb')', re.IGNORECASE),
+            # UNC путь: \\server\share\file.ext
+            'unc': re.compile(
+                rb'\\\\' + name_chars + rb'+(?:\\' + name_chars + rb'+)+\.(?:'
+                + path_extensions + rb')', re.IGNORECASE),
+            # Откат от расширения ищет только текстуры и прокси,
+            # в исчерпывающем режиме - все известные расширения
+            'anchors': anchors(scan_extensions),
+            'anchors_exhaustive': anchors(scan_extensions | cls.OTHER_EXTENSIONS),
+            # Непрерывная серия печатных символов (ищется по развёрнутым байтам)
+            'printable_run': re.compile(rb'[\x20-\x7e]*'),
+            # Серия допустимых символов UTF-16 LE (ASCII и кириллица), развёрнутая
+            'wide_run_reversed': re.compile(rb'(?:\x00[\x01-\x7f]|\x04[\x00-\xff])*'),
+        }
+        cls._patterns = patterns
+        return patterns
     
-    def _find_paths_by_extension(self, data: bytes, ext: bytes, assets: SceneAssets):
-        """Ищет пути с конкретным расширением (ASCII)"""
+    def _scan_window(self, data: Buffer, lo: int = 0, hi: Optional[int] = None,
+                     exhaustive: bool = False) -> Iterator[Tuple[int, str, str]]:
+        """
+        Находит кандидатов в пути за один проход по окну.
+        
+        Возвращает (смещение якоря, путь, вид якоря). Учитываются только
+        якоря из собственной области окна [lo, hi).
+        """
+        
+        if hi is None:
+            hi = len(data)
         
-        pos = 0
-        while True:
-            pos = data.find(ext, pos)
-            if pos == -1:
+        patterns = self._get_patterns()
+        drive_pattern = patterns['drive']
+        unc_pattern = patterns['unc']
+        
+        # Как и findall, не ищем пути внутри уже найденного пути того же вида
+        drive_end = 0
+        unc_end = 0
+        
+        anchor_pattern = patterns['anchors_exhaustive' if exhaustive else 'anchors']
+        for match in anchor_pattern.finditer(data):
+            kind = match.lastgroup
+            # Якоря диска совпадают на двоеточии, путь начинается с буквы
+            start = match.start()
+            if kind == 'drive':
+                start -= 1
+            elif kind == 'wdrive':
+                start -= 2
+            if start >= hi:
                 break
             
-            # Ищем начало пути (идём назад)
-            start = pos
-            for i in range(pos - 1, max(pos - 500, 0), -1):
-                byte = data[i]
-                # Проверяем на допустимые символы пути
-                if byte < 32 or byte > 126:
-                    start = i + 1
-                    break
-                # Проверяем на начало пути (буква диска)
-                if i > 0 and data[i] == ord(':') and (65 <= data[i-1] <= 90 or 97 <= data[i-1] <= 122):
-                    start = i - 1
-                    break
+            if kind == 'drive':
+                if start < drive_end:
+                    continue
+                found = drive_pattern.match(data, start)
+                if found:
+                    drive_end = found.end()
+                    if start >= lo:
+                        yield start, self._decode_path_bytes(found.group()), kind
             
-            # Извлекаем путь
-            end = pos + len(ext)
-            path_bytes = data[start:end]
+            elif kind == 'unc':
+                if start < unc_end:
+                    continue
+                found = unc_pattern.match(data, start)
+                if found:
+                    unc_end = found.end()
+                    if start >= lo:
+                        yield start, self._decode_path_bytes(found.group()), kind
             
-            self._process_found_path(path_bytes, assets)
+            elif start < lo:
+                continue
             
-            pos = end
-    
-    def _find_paths_by_extension_utf16(self, data: bytes, ext: bytes, assets: SceneAssets):
-        """Ищет пути с конкретным расширением (UTF-16 LE)"""
-        
-        pos = 0
-        while True:
-            pos = data.find(ext, pos)
-            if pos == -1:
-                break
+            elif kind == 'wdrive':
+                # Путь уже очерчен шаблоном - декодируем его одним вызовом
+                end = match.end('wdrive')
+                if end - start > 10:
+                    yield start, bytes(data[start:end]).decode('utf-16-le'), kind
             
-            # Ищем начало пути
-            start = pos
-            for i in range(pos - 2, max(pos - 1000, 0), -2):
-                if i < 0:
-                    break
-                    
-                char_code = struct.unpack('<H', data[i:i+2])[0] if i + 2 <= len(data) else 0
-                
-                # Проверяем на начало пути
-                if i >= 2:
-                    prev_code = struct.unpack('<H', data[i-2:i])[0]
-                    # Буква диска + двоеточие
-                    if char_code == ord(':') and (65 <= prev_code <= 90 or 97 <= prev_code <= 122):
-                        start = i - 2
-                        break
-                
-                # Невалидный символ
-                if char_code == 0 or (char_code > 127 and not (0x0400 <= char_code <= 0x04FF)):
-                    start = i + 2
-                    break
+            elif kind == 'ext':
+                path_start = self._find_path_start(data, start)
+                if path_start is not None:
+                    yield path_start, self._decode_path_bytes(bytes(data[path_start:match.end()])), kind
             
-            # Извлекаем и декодируем путь
-            end = pos + len(ext)
-            try:
-                path_str = data[start:end].decode('utf-16-le', errors='ignore')
-                if path_str:
-                    self._process_found_path(path_str.encode('utf-8'), assets)
-            except Exception:
-                pass
-            
-            pos = end
+            else:
+                path_start = self._find_path_start_utf16(data, start)
+                if path_start is not None:
+                    yield path_start, bytes(data[path_start:match.end()]).decode('utf-16-le', errors='ignore'), kind
     
-    def _process_found_path(self, path_data: bytes, assets: SceneAssets):
-        """Обрабатывает найденный путь"""
+    @staticmethod
+    def _decode_path_bytes(path_data: bytes) -> str:
+        """Декодирует 8-битный путь: пробуем разные кодировки"""
         
-        # Пробуем разные кодировки
-        path_str = None
-        for encoding in ['utf-8', 'cp1251', 'latin-1']:
+        for encoding in ['utf-8', 'cp1251']:
             try:
-                path_str = path_data.decode(encoding).strip()
-                break
+                return path_data.decode(encoding)
             except UnicodeDecodeError:
                 continue
+        return path_data.decode('latin-1')
+    
+    def _find_path_start(self, data: Buffer, pos: int) -> Optional[int]:
+        """
+        Ищет начало ASCII пути перед расширением: идём назад не дальше
+        500 байт до непечатного символа или буквы диска
+        """
         
-        if not path_str:
-            return
+        floor = max(pos - 500, 0) + 1
+        if floor >= pos:
+            return None
+        
+        # Длина серии печатных символов перед расширением
+        tail = bytes(data[floor:pos])[::-1]
+        run = len(self._get_patterns()['printable_run'].match(tail).group())
+        run_start = pos - run
+        
+        # Ближайшее к расширению двоеточие после буквы диска
+        # (поиск вперёд по развёрнутому хвосту: у memoryview нет rfind)
+        k = tail.find(b':', 0, run)
+        while k != -1:
+            colon = pos - 1 - k
+            if colon > 0 and (65 <= data[colon - 1] <= 90 or 97 <= data[colon - 1] <= 122):
+                return colon - 1
+            k = tail.find(b':', k + 1, run)
+        
+        if run_start > floor:
+            return run_start
+        # Упёрлись в границу поиска - пути нет
+        return None
+    
+    def _find_path_start_utf16(self, data: Buffer, pos: int) -> Optional[int]:
+        """Ищет начало UTF-16 LE пути перед расширением (не дальше 500 символов)"""
+        
+        floor = max(pos - 1000, 0) + 1
+        lowest = floor + ((pos - floor) % 2)
+        if lowest >= pos:
+            return None
+        
+        tail = bytes(data[lowest:pos])[::-1]
+        run = len(self._get_patterns()['wide_run_reversed'].match(tail).group())
+        run_start = pos - run
+        
+        # Ближайшее к расширению двоеточие после буквы диска;
+        # в развёрнутом хвосте ':\x00' выглядит как '\x00:'
+        k = tail.find(b'\x00:', 0, run)
+        while k != -1:
+            i = pos - 2 - k
+            if k % 2 == 0 and i >= 2:
+                prev_code = data[i - 2] | (data[i - 1] << 8)
+                if 65 <= prev_code <= 90 or 97 <= prev_code <= 122:
+                    return i - 2
+            k = tail.find(b'\x00:', k + 1, run)
+        
+        if run_start > lowest:
+            return run_start
+        return None
+    
+    def _process_found_path(self, path_str: str, assets: SceneAssets, source: str = 'scan',
+                            stream_name: str = '', offset: int = 0) -> Optional[FoundAsset]:
+        """Обрабатывает найденный путь; возвращает ассет, если путь принят"""
+        
+        profile = assets.profile
+        profile.found[source] = profile.found.get(source, 0) + 1
         
         # Очищаем путь
-        path_str = path_str.strip('\x00').strip()
+        path_str = path_str.strip().strip('\x00').strip()
         
         # Проверяем валидность
-        if not self._is_valid_path(path_str):
-            return
+        reason = self._check_path(path_str) if path_str else 'empty'
+        if reason is not None:
+            profile.rejected[reason] = profile.rejected.get(reason, 0) + 1
+            return None
         
         # Классифицируем
-        self._classify_path(path_str, assets)
+        profile.accepted += 1
+        return self._make_asset(self._classify_path(path_str), path_str, assets, stream_name, offset)
     
     def _is_valid_path(self, path_str: str) -> bool:
         """Проверяет валидность пути"""
+        return self._check_path(path_str) is None
+    
+    def _check_path(self, path_str: str) -> Optional[str]:
+        """Проверяет путь; возвращает причину отклонения или None"""
         
-        if not path_str or len(path_str) < 5:
-            return False
+        if not path_str:
+            return 'empty'
+        if len(path_str) < 5:
+            return 'too_short'
         
         # Должен содержать расширение
         if '.' not in path_str:
-            return False
+            return 'no_extension'
         
         # Получаем расширение
         try:
             ext = Path(path_str).suffix.lower()
         except Exception:
-            return False
+            return 'bad_path'
         
         if not ext:
-            return False
+            return 'no_extension'
         
         # Проверяем на известные расширения
-        all_extensions = self.TEXTURE_EXTENSIONS | self.PROXY_EXTENSIONS | {'.ies', '.hdri', '.mat', '.vismat'}
+        all_extensions = self.TEXTURE_EXTENSIONS | self.PROXY_EXTENSIONS | self.OTHER_EXTENSIONS
         if ext not in all_extensions:
-            return False
+            return 'unknown_extension'
         
         # Фильтруем системные пути
         lower_path = path_str.lower()
         if any(x in lower_path for x in ['windows', 'system32', 'program files\\autodesk', 
                                           'program files\\chaos', '.dll', '.exe', 
                                           'en-us', 'mui', 'autodesk\\3ds max']):
-            return False
+            return 'system_path'
         
-        return True
+        return None
     
-    def _classify_path(self, path_str: str, assets: SceneAssets):
-        """Классифицирует путь по типу ассета"""
+    def _classify_path(self, path_str: str) -> Optional[str]:
+        """Вид ассета по расширению: texture, proxy, other"""
         
         try:
             ext = Path(path_str).suffix.lower()
         except Exception:
-            return
+            return None
         
         if ext in self.TEXTURE_EXTENSIONS:
-            assets.textures.add(path_str)
-            if self.debug:
-                assets.debug_info.append(f"Found texture: {path_str}")
+            return 'texture'
         elif ext in self.PROXY_EXTENSIONS:
-            assets.proxies.add(path_str)
-            if self.debug:
-                assets.debug_info.append(f"Found proxy: {path_str}")
-        elif ext in {'.ies', '.hdri', '.mat', '.vismat'}:
-            assets.other_assets.add(path_str)
-    
-    def _resolve_relative_paths(self, assets: SceneAssets):
-        """Резолвит относительные пути"""
-        
-        scene_dir = assets.scene_path.parent
-        
-        def resolve_path(path_str: str) -> str:
-            if path_str.startswith('..') or path_str.startswith('.\\') or path_str.startswith('./'):
-                try:
-                    resolved = (scene_dir / path_str).resolve()
-                    return str(resolved)
-                except Exception:
-                    pass
-            return path_str
-        
-        assets.textures = {resolve_path(p) for p in assets.textures}
-        assets.proxies = {resolve_path(p) for p in assets.proxies}
-        assets.other_assets = {resolve_path(p) for p in assets.other_assets}
-    
-    def _clean_paths(self, assets: SceneAssets):
-        """Очищает пути от мусора"""
-        
-        def clean_set(paths: Set[str]) -> Set[str]:
-            cleaned = set()
-            for p in paths:
-                # Убираем дубликаты с разным регистром
-                # Нормализуем слэши
-                normalized = p.replace('/', '\\')
-                # Убираем двойные слэши
-                while '\\\\' in normalized and not normalized.startswith('\\\\'):
-                    normalized = normalized.replace('\\\\', '\\')
-                cleaned.add(normalized)
-            return cleaned
-        
-        assets.textures = clean_set(assets.textures)
-        assets.proxies = clean_set(assets.proxies)
-        assets.other_assets = clean_set(assets.other_assets)
+            return 'proxy'
+        elif ext in self.OTHER_EXTENSIONS:
+            return 'other'
+        return None
+    
+    def _make_asset(self, kind: Optional[str], path_str: str, assets: SceneAssets,
+                    stream_name: str, offset: int) -> Optional[FoundAsset]:
+        """Приводит принятый путь к окончательному виду"""
+        
+        if kind is None:
+            return None
+        
+        profile = assets.profile
+        stage = time.perf_counter()
+        path_str = self._resolve_path(path_str, assets.scene_path.parent)
+        resolved = time.perf_counter()
+        path_str = self._normalize_path(path_str)
+        profile.add_time('resolve', resolved - stage)
+        profile.add_time('clean', time.perf_counter() - resolved)
+        return FoundAsset(kind, path_str, stream_name, offset)
+    
+    @staticmethod
+    def _resolve_path(path_str: str, scene_dir: Path) -> str:
+        """Резолвит относительный путь от папки сцены"""
+        
+        if path_str.startswith('..') or path_str.startswith('.\\') or path_str.startswith('./'):
+            try:
+                resolved = (scene_dir / path_str).resolve()
+                return str(resolved)
+            except Exception:
+                pass
+        return path_str
+    
+    @staticmethod
+    def _normalize_path(path_str: str) -> str:
+        """Очищает путь от мусора"""
+        
+        # Нормализуем слэши
+        normalized = path_str.replace('/', '\\')
+        # Убираем двойные слэши
+        while '\\\\' in normalized and not normalized.startswith('\\\\'):
+            normalized = normalized.replace('\\\\', '\\')
+        return normalized
+
+
+# Парсер процесса пула сканирования: создаётся один раз на процесс
+_scan_parser: Optional[MaxFileParser] = None
+# Последний открытый в процессе файл сцены: (путь, файл)
+_scan_file: Optional[Tuple[str, CompoundFile]] = None
+
+
+def _init_scan_worker(parser_class: type):
+    """Инициализация процесса пула сканирования"""
+    global _scan_parser
+    _scan_parser = parser_class()
+
+
+def _scan_chunk_in_worker(scene_path: str, stream_path: List[str], start: int,
+                          end: int, size: int, exhaustive: bool) -> List[Tuple[int, str, str]]:
+    """Сканирование части потока в процессе пула"""
+    global _scan_file
+    if _scan_file is None or _scan_file[0] != scene_path:
+        if _scan_file is not None:
+            _scan_file[1].close()
+        _scan_file = (scene_path, CompoundFile(scene_path))
+    return _scan_parser._scan_chunk(_scan_file[1], stream_path, start, end, size, exhaustive)
@@ -10,6 +10,8 @@ from pathlib import Path
 from typing import List, Dict, Optional, Callable, Tuple
 from dataclasses import dataclass
 
+from .dir_cache import DirectoryCache
+
 
 @dataclass
 class PathMapping:
@@ -527,6 +529,8 @@ class MaxPathUpdater:
             Список маппингов путей
         """
         mappings = []
+        # Операции указывают в немногие папки - листаем каждую один раз
+        dir_cache = DirectoryCache()
         
         # Получаем все возможные варианты старого пути (может быть относительный, абсолютный)
         scene_folder = scene_path.parent
@@ -543,7 +547,7 @@ class MaxPathUpdater:
                 else:
                     continue
                 
-                if not old_path.exists() and new_path.exists():
+                if not dir_cache.exists(old_path) and dir_cache.exists(new_path):
                     # Файл был перемещен, создаем маппинг
                     # Добавляем разные варианты старого пути
                     mappings.append(PathMapping(
@@ -0,0 +1,360 @@
+"""
+Чтение составных файлов OLE (Compound File Binary) через mmap.
+
+Файл отображается в память один раз, цепочки секторов FAT и miniFAT
+разбираются здесь же, а потоки отдаются сегментами memoryview без
+копирования: подряд идущие сектора образуют один сегмент.
+"""
+
+import mmap
+import sys
+from array import array
+from bisect import bisect_right
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+
+# Сигнатура составного файла
+CFB_MAGIC = b'\xD0\xCF\x11\xE0\xA1\xB1\x1A\xE1'
+
+# Специальные значения в таблицах секторов
+MAXREGSECT = 0xFFFFFFFA
+ENDOFCHAIN = 0xFFFFFFFE
+FREESECT = 0xFFFFFFFF
+NOSTREAM = 0xFFFFFFFF
+
+# Типы записей каталога
+STGTY_STORAGE = 1
+STGTY_STREAM = 2
+STGTY_ROOT = 5
+
+DIRENTRY_SIZE = 128
+HEADER_SIZE = 512
+
+
+class CompoundFileError(Exception):
+    """Повреждённый или неподдерживаемый составной файл"""
+
+
+class NotCompoundFileError(CompoundFileError):
+    """Файл не является составным файлом OLE"""
+
+
+class DirEntry:
+    """Запись каталога составного файла"""
+
+    __slots__ = ('sid', 'name', 'entry_type', 'left', 'right', 'child',
+                 'start', 'size')
+
+    def __init__(self, sid: int, name: str, entry_type: int, left: int,
+                 right: int, child: int, start: int, size: int):
+        self.sid = sid
+        self.name = name
+        self.entry_type = entry_type
+        self.left = left
+        self.right = right
+        self.child = child
+        self.start = start
+        self.size = size
+
+
+class CompoundFile:
+    """
+    Составной файл OLE, отображённый в память.
+
+    Использование:
+        with CompoundFile(path) as cfb:
+            for stream_path in cfb.list_streams():
+                for segment in cfb.iter_segments(stream_path):
+                    ...
+
+    Сегменты - срезы memoryview над mmap; их нужно отпустить
+    до закрытия файла.
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self._file = open(self.path, 'rb')
+        self._mmap: Optional[mmap.mmap] = None
+        self._view: Optional[memoryview] = None
+        try:
+            self._open()
+        except Exception:
+            self.close()
+            raise
+
+    def _open(self):
+        """Отображает файл в память и читает заголовок, FAT и каталог"""
+
+        size = self.path.stat().st_size
+        if size < HEADER_SIZE:
+            raise NotCompoundFileError("Файл меньше заголовка OLE")
+
+        self._file.seek(0)
+        if self._file.read(len(CFB_MAGIC)) != CFB_MAGIC:
+            raise NotCompoundFileError("Неверная сигнатура OLE")
+
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._mmap)
+        self.file_size = len(self._mmap)
+
+        header = self._uint32s(0, HEADER_SIZE)
+        sector_shift = self._view[30] | (self._view[31] << 8)
+        mini_sector_shift = self._view[32] | (self._view[33] << 8)
+        if sector_shift not in (9, 12) or mini_sector_shift != 6:
+            raise CompoundFileError(f"Неподдерживаемый размер сектора: 2^{sector_shift}")
+
+        self.sector_size = 1 << sector_shift
+        self.mini_sector_size = 1 << mini_sector_shift
+        self.mini_stream_cutoff = header[14]
+
+        first_dir_sector = header[12]
+        first_minifat_sector = header[15]
+        first_difat_sector = header[17]
+        difat_count = header[18]
+
+        self.fat = self._read_fat(header[19:128], first_difat_sector, difat_count)
+        self.entries = self._read_directory(first_dir_sector)
+        if not self.entries or self.entries[0].entry_type != STGTY_ROOT:
+            raise CompoundFileError("Не найдена корневая запись каталога")
+
+        root = self.entries[0]
+        self.minifat = array('I')
+        for offset, length in self._chain_extents(first_minifat_sector):
+            self.minifat.extend(self._uint32s(offset, length))
+        # Мини-поток хранится в обычных секторах, начиная с корневой записи
+        self._ministream_extents = self._chain_extents(root.start, root.size)
+        self._ministream_starts = []
+        position = 0
+        for _, length in self._ministream_extents:
+            self._ministream_starts.append(position)
+            position += length
+        self._ministream_size = position
+
+        self._paths = self._build_paths()
+
+    def close(self):
+        """Закрывает файл. Живые сегменты не дают закрыть mmap сразу"""
+
+        if self._view is not None:
+            self._view.release()
+            self._view = None
+        if self._mmap is not None:
+            try:
+                self._mmap.close()
+            except BufferError:
+                # Сегмент ещё используется - mmap закроется сборщиком мусора
+                pass
+            self._mmap = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self) -> 'CompoundFile':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    # --- Таблицы секторов ---
+
+    def _uint32s(self, offset: int, length: int) -> array:
+        """Массив uint32 (little-endian) из области файла"""
+
+        values = array('I')
+        values.frombytes(self._view[offset:offset + (length // 4) * 4])
+        if sys.byteorder == 'big':
+            values.byteswap()
+        return values
+
+    def _sector_offset(self, sect: int) -> int:
+        """Смещение сектора в файле (сектор 0 идёт сразу после заголовка)"""
+        return (sect + 1) * self.sector_size
+
+    def _read_fat(self, header_difat: array, difat_sector: int, difat_count: int) -> array:
+        """Собирает FAT по списку её секторов из заголовка и цепочки DIFAT"""
+
+        fat_sectors = [s for s in header_difat if s <= MAXREGSECT]
+        per_sector = self.sector_size // 4 - 1
+        seen = set()
+
+        while difat_count > 0 and difat_sector <= MAXREGSECT and difat_sector not in seen:
+            seen.add(difat_sector)
+            offset = self._sector_offset(difat_sector)
+            if offset + self.sector_size > self.file_size:
+                break
+            values = self._uint32s(offset, self.sector_size)
+            fat_sectors.extend(s for s in values[:per_sector] if s <= MAXREGSECT)
+            difat_sector = values[per_sector]
+            difat_count -= 1
+
+        fat = array('I')
+        for sect in fat_sectors:
+            offset = self._sector_offset(sect)
+            if offset + self.sector_size > self.file_size:
+                break
+            fat.extend(self._uint32s(offset, self.sector_size))
+        return fat
+
+    def _chain_extents(self, start: int, size: Optional[int] = None) -> List[Tuple[int, int]]:
+        """
+        Переводит цепочку FAT в список областей файла (смещение, длина).
+        Подряд идущие сектора объединяются в одну область.
+        """
+
+        extents: List[Tuple[int, int]] = []
+        remaining = size if size is not None else float('inf')
+        sector_size = self.sector_size
+        fat = self.fat
+        sect = start
+        visited = 0
+
+        while remaining > 0 and sect < len(fat) and visited <= len(fat):
+            offset = self._sector_offset(sect)
+            if offset >= self.file_size:
+                break
+            length = min(sector_size, remaining, self.file_size - offset)
+            if extents and extents[-1][0] + extents[-1][1] == offset:
+                extents[-1] = (extents[-1][0], extents[-1][1] + length)
+            else:
+                extents.append((offset, length))
+            remaining -= length
+            visited += 1
+            sect = fat[sect]
+
+        return extents
+
+    def _mini_chain_extents(self, start: int, size: int) -> List[Tuple[int, int]]:
+        """Переводит цепочку miniFAT в области файла через сектора мини-потока"""
+
+        extents: List[Tuple[int, int]] = []
+        mini_size = self.mini_sector_size
+        minifat = self.minifat
+        remaining = size
+        sect = start
+        visited = 0
+
+        while remaining > 0 and sect < len(minifat) and visited <= len(minifat):
+            offset = self._ministream_offset(sect * mini_size)
+            if offset is None:
+                break
+            length = min(mini_size, remaining)
+            if extents and extents[-1][0] + extents[-1][1] == offset:
+                extents[-1] = (extents[-1][0], extents[-1][1] + length)
+            else:
+                extents.append((offset, length))
+            remaining -= length
+            visited += 1
+            sect = minifat[sect]
+
+        return extents
+
+    def _ministream_offset(self, position: int) -> Optional[int]:
+        """Смещение в файле для позиции внутри мини-потока"""
+
+        if position >= self._ministream_size:
+            return None
+        index = bisect_right(self._ministream_starts, position) - 1
+        return self._ministream_extents[index][0] + position - self._ministream_starts[index]
+
+    # --- Каталог ---
+
+    def _read_directory(self, first_sector: int) -> List[DirEntry]:
+        """Читает все записи каталога"""
+
+        entries = []
+        view = self._view
+        for offset, length in self._chain_extents(first_sector):
+            for pos in range(offset, offset + length - DIRENTRY_SIZE + 1, DIRENTRY_SIZE):
+                fields = self._uint32s(pos + 64, DIRENTRY_SIZE - 64)
+                name_length = min(fields[0] & 0xFFFF, 64)
+                entry_type = view[pos + 66]
+                name = bytes(view[pos:pos + max(name_length - 2, 0)]).decode('utf-16-le', errors='replace')
+                size = fields[14]
+                if self.sector_size > 512:
+                    size |= fields[15] << 32
+                entries.append(DirEntry(
+                    sid=len(entries), name=name, entry_type=entry_type,
+                    left=fields[1], right=fields[2], child=fields[3],
+                    start=fields[13], size=size,
+                ))
+        return entries
+
+    def _build_paths(self) -> Dict[Tuple[str, ...], DirEntry]:
+        """Строит пути потоков обходом красно-чёрных деревьев каталога"""
+
+        paths: Dict[Tuple[str, ...], DirEntry] = {}
+        visited = {0}
+        # Стек: (sid узла дерева, путь хранилища)
+        stack = [(self.entries[0].child, ())]
+
+        while stack:
+            sid, parent = stack.pop()
+            if sid == NOSTREAM or sid >= len(self.entries) or sid in visited:
+                continue
+            visited.add(sid)
+            entry = self.entries[sid]
+            stack.append((entry.left, parent))
+            stack.append((entry.right, parent))
+
+            path = parent + (entry.name,)
+            if entry.entry_type == STGTY_STREAM:
+                paths[path] = entry
+            elif entry.entry_type == STGTY_STORAGE:
+                stack.append((entry.child, path))
+
+        return dict(sorted(paths.items()))
+
+    # --- Потоки ---
+
+    def list_streams(self) -> List[List[str]]:
+        """Пути всех потоков, как olefile.listdir()"""
+        return [list(path) for path in self._paths]
+
+    def get_size(self, stream_path: List[str]) -> int:
+        """Размер потока в байтах"""
+        return self._find(stream_path).size
+
+    def _find(self, stream_path: List[str]) -> DirEntry:
+        entry = self._paths.get(tuple(stream_path))
+        if entry is None:
+            raise KeyError(f"Поток не найден: {'/'.join(stream_path)}")
+        return entry
+
+    def stream_extents(self, stream_path: List[str]) -> List[Tuple[int, int]]:
+        """Области файла (смещение, длина), из которых состоит поток"""
+
+        entry = self._find(stream_path)
+        if entry.size < self.mini_stream_cutoff:
+            return self._mini_chain_extents(entry.start, entry.size)
+        return self._chain_extents(entry.start, entry.size)
+
+    def iter_segments(self, stream_path: List[str],
+                      max_segment: Optional[int] = None,
+                      start: int = 0, stop: Optional[int] = None) -> Iterator[memoryview]:
+        """
+        Отдаёт поток сегментами memoryview без копирования.
+        Каждый сегмент - непрерывная область файла не длиннее max_segment.
+        start и stop ограничивают область потока [start, stop).
+        """
+
+        position = 0
+        for offset, length in self.stream_extents(stream_path):
+            if stop is not None and position >= stop:
+                break
+            skip = max(start - position, 0)
+            position += length
+            if skip >= length:
+                continue
+            end = offset + length
+            if stop is not None and position > stop:
+                end -= position - stop
+            offset += skip
+            step = max_segment or length
+            while offset < end:
+                yield self._view[offset:min(offset + step, end)]
+                offset += step
+
+    def read_stream(self, stream_path: List[str]) -> bytes:
+        """Читает поток целиком (для небольших служебных потоков)"""
+        return b''.join(self.iter_segments(stream_path))
@@ -0,0 +1,258 @@
+"""
+Кэш результатов разбора сцен на диске (SQLite)
+
+Запись привязана к абсолютному пути, размеру и mtime_ns файла, режиму
+разбора и версии парсера: если что-то из этого изменилось, сцена
+разбирается заново. Размер кэша ограничен, старые записи вытесняются.
+
+Для повторного разбора изменённой сцены хранятся ещё отпечатки потоков
+(размер и CRC32) с найденными в каждом потоке ассетами: заново
+сканируются только потоки, отпечаток которых изменился.
+
+Очистка из командной строки:
+    python -m core cache clear
+    python -m core cache stats
+"""
+
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+
+def default_cache_dir() -> Path:
+    """Пользовательская папка кэша (LOCALAPPDATA / XDG_CACHE_HOME)"""
+
+    if sys.platform == 'win32' and os.environ.get('LOCALAPPDATA'):
+        return Path(os.environ['LOCALAPPDATA']) / "MaxAssetManager" / "Cache"
+    if os.environ.get('XDG_CACHE_HOME'):
+        return Path(os.environ['XDG_CACHE_HOME']) / "MaxAssetManager"
+    home_cache = Path.home() / ".cache"
+    if home_cache.is_dir():
+        return home_cache / "MaxAssetManager"
+    return Path(tempfile.gettempdir()) / "MaxAssetManager_Cache"
+
+
+class ParseCache:
+    """Кэш SceneAssets по идентичности файла сцены"""
+
+    # Предел размера данных в кэше по умолчанию
+    DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+    # После вытеснения размер опускается до этой доли предела
+    EVICT_TO_RATIO = 0.9
+
+    def __init__(self, cache_file: Optional[Path] = None,
+                 max_bytes: int = DEFAULT_MAX_BYTES):
+        """
+        Args:
+            cache_file: Файл базы (если None, используется папка кэша пользователя)
+            max_bytes: Предел суммарного размера сохранённых результатов
+        """
+        if cache_file is None:
+            cache_file = default_cache_dir() / "parse_cache.sqlite"
+
+        self.cache_file = Path(cache_file)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        """Открывает базу при первом обращении"""
+
+        if self._conn is None:
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            # Кэшем пользуются потоки анализа, доступ сериализуется блокировкой
+            conn = sqlite3.connect(str(self.cache_file), timeout=10,
+                                   check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS scenes (
+                    path TEXT NOT NULL,
+                    parse_mode TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    mtime_ns INTEGER NOT NULL,
+                    parser_version TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    payload_size INTEGER NOT NULL,
+                    last_used REAL NOT NULL,
+                    PRIMARY KEY (path, parse_mode)
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS scenes_last_used ON scenes(last_used)")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS streams (
+                    path TEXT NOT NULL,
+                    parse_mode TEXT NOT NULL,
+                    parser_version TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    payload_size INTEGER NOT NULL,
+                    last_used REAL NOT NULL,
+                    PRIMARY KEY (path, parse_mode)
+                )
+            """)
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    @staticmethod
+    def _key_path(scene_path: Path) -> str:
+        return os.path.normcase(os.path.abspath(scene_path))
+
+    def get(self, scene_path: Path, stat: os.stat_result, parse_mode: str,
+            parser_version: str) -> Optional[Dict]:
+        """Возвращает сохранённый результат, если файл не менялся"""
+
+        try:
+            with self._lock:
+                conn = self._connect()
+                row = conn.execute(
+                    "SELECT size, mtime_ns, parser_version, payload FROM scenes "
+                    "WHERE path = ? AND parse_mode = ?",
+                    (self._key_path(scene_path), parse_mode)).fetchone()
+                if row is None:
+                    return None
+                size, mtime_ns, version, payload = row
+                if size != stat.st_size or mtime_ns != stat.st_mtime_ns or version != parser_version:
+                    return None
+                conn.execute(
+                    "UPDATE scenes SET last_used = ? WHERE path = ? AND parse_mode = ?",
+                    (time.time(), self._key_path(scene_path), parse_mode))
+                conn.commit()
+            return json.loads(payload)
+        except (sqlite3.Error, ValueError):
+            return None
+
+    def put(self, scene_path: Path, stat: os.stat_result, parse_mode: str,
+            parser_version: str, data: Dict):
+        """Сохраняет результат разбора и вытесняет старые записи при переполнении"""
+
+        payload = json.dumps(data, ensure_ascii=False)
+        try:
+            with self._lock:
+                conn = self._connect()
+                conn.execute(
+                    "INSERT OR REPLACE INTO scenes VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (self._key_path(scene_path), parse_mode, stat.st_size,
+                     stat.st_mtime_ns, parser_version, payload,
+                     len(payload.encode('utf-8')), time.time()))
+                self._evict(conn)
+                conn.commit()
+        except sqlite3.Error:
+            pass
+
+    def get_streams(self, scene_path: Path, parse_mode: str,
+                    parser_version: str) -> Optional[Dict[str, Dict]]:
+        """
+        Отпечатки потоков прошлого разбора сцены:
+        {имя потока: {'size', 'crc32', 'assets': [[вид, путь, смещение], ...]}}
+        """
+
+        try:
+            with self._lock:
+                conn = self._connect()
+                row = conn.execute(
+                    "SELECT parser_version, payload FROM streams "
+                    "WHERE path = ? AND parse_mode = ?",
+                    (self._key_path(scene_path), parse_mode)).fetchone()
+                if row is None or row[0] != parser_version:
+                    return None
+                conn.execute(
+                    "UPDATE streams SET last_used = ? WHERE path = ? AND parse_mode = ?",
+                    (time.time(), self._key_path(scene_path), parse_mode))
+                conn.commit()
+            return json.loads(row[1])
+        except (sqlite3.Error, ValueError):
+            return None
+
+    def put_streams(self, scene_path: Path, parse_mode: str, parser_version: str,
+                    streams: Dict[str, Dict]):
+        """Сохраняет отпечатки потоков сцены"""
+
+        payload = json.dumps(streams, ensure_ascii=False)
+        try:
+            with self._lock:
+                conn = self._connect()
+                conn.execute(
+                    "INSERT OR REPLACE INTO streams VALUES (?, ?, ?, ?, ?, ?)",
+                    (self._key_path(scene_path), parse_mode, parser_version, payload,
+                     len(payload.encode('utf-8')), time.time()))
+                self._evict(conn)
+                conn.commit()
+        except sqlite3.Error:
+            pass
+
+    def _evict(self, conn: sqlite3.Connection):
+        """Удаляет давно не использованные записи сверх предела размера"""
+
+        total = conn.execute(
+            "SELECT (SELECT COALESCE(SUM(payload_size), 0) FROM scenes) + "
+            "(SELECT COALESCE(SUM(payload_size), 0) FROM streams)").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        target = total - int(self.max_bytes * self.EVICT_TO_RATIO)
+        freed = 0
+        stale = {'scenes': [], 'streams': []}
+        for table, path, mode, payload_size in conn.execute(
+                "SELECT 'scenes', path, parse_mode, payload_size, last_used FROM scenes "
+                "UNION ALL "
+                "SELECT 'streams', path, parse_mode, payload_size, last_used FROM streams "
+                "ORDER BY last_used"):
+            stale[table].append((path, mode))
+            freed += payload_size
+            if freed >= target:
+                break
+        conn.executemany("DELETE FROM scenes WHERE path = ? AND parse_mode = ?", stale['scenes'])
+        conn.executemany("DELETE FROM streams WHERE path = ? AND parse_mode = ?", stale['streams'])
+
+    def invalidate(self, scene_path: Path):
+        """Удаляет записи одной сцены"""
+
+        try:
+            with self._lock:
+                conn = self._connect()
+                conn.execute("DELETE FROM scenes WHERE path = ?", (self._key_path(scene_path),))
+                conn.execute("DELETE FROM streams WHERE path = ?", (self._key_path(scene_path),))
+                conn.commit()
+        except sqlite3.Error:
+            pass
+
+    def clear(self):
+        """Удаляет все записи"""
+
+        with self._lock:
+            conn = self._connect()
+            conn.execute("DELETE FROM scenes")
+            conn.execute("DELETE FROM streams")
+            conn.commit()
+            conn.execute("VACUUM")
+
+    def get_stats(self) -> Dict:
+        """Количество записей и занимаемый размер"""
+
+        with self._lock:
+            conn = self._connect()
+            count, total = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(payload_size), 0) FROM scenes").fetchone()
+            stream_count, stream_total = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(payload_size), 0) FROM streams").fetchone()
+        return {
+            'entries': count,
+            'stream_entries': stream_count,
+            'payload_size': total + stream_total,
+            'max_size': self.max_bytes,
+            'cache_file': str(self.cache_file),
+        }
+
@@ -0,0 +1,178 @@
+"""
+Перевод путей из сцен в пути этой машины
+
+Пути в сценах записаны на Windows: C:\\Projects\\..., \\\\server\\share\\...
+На Linux-узлах (рендер, аудит) такие пути не существуют, поэтому буквы
+дисков и UNC-префиксы переводятся в точки монтирования по правилам:
+
+    C:                  -> /mnt/c
+    \\\\server\\projects -> /mnt/projects
+
+Правила задаются в коде, JSON-файлом ({"префикс": "корень"}) или
+переменной окружения MAX_ASSET_PATH_MAP: путь к такому файлу или
+правила "префикс=корень" через ';'.
+
+Windows не различает регистр, а Linux различает: после перевода имена
+папок и файла ищутся в листингах папок без учёта регистра
+(DirectoryCache). Перевод папки запоминается, поэтому на 100 тысяч путей
+приходится столько листингов, сколько в них разных папок.
+"""
+
+import json
+import ntpath
+import os
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+from .dir_cache import DirectoryCache, is_windows_path
+
+
+# Переменная окружения с правилами по умолчанию
+PATH_MAP_ENV = 'MAX_ASSET_PATH_MAP'
+
+
+def _normalize_prefix(prefix: str) -> str:
+    """Префикс для сравнения: обратные слэши, без регистра и концевого слэша"""
+    prefix = prefix.replace('/', '\\')
+    if prefix.strip('\\'):
+        prefix = prefix.rstrip('\\')
+    return prefix.casefold()
+
+
+def parse_rule(text: str) -> Tuple[str, str]:
+    """
+    Правило из строки "префикс=корень"
+
+    Raises:
+        ValueError: нет '=' или одна из частей пуста
+    """
+    prefix, sep, root = text.partition('=')
+    prefix, root = prefix.strip(), root.strip()
+    if not sep or not prefix or not root:
+        raise ValueError(f"Правило должно иметь вид ПРЕФИКС=КОРЕНЬ: {text!r}")
+    return prefix, root
+
+
+class PathMapper:
+    """Правила перевода Windows-префиксов в корни этой машины"""
+
+    def __init__(self, rules: Union[Dict[str, str], Iterable[Tuple[str, str]], None] = None):
+        """
+        Args:
+            rules: Префикс -> корень (буква диска "C:", UNC "\\\\server\\share"
+                или любая папка)
+        """
+        # (префикс для сравнения, префикс как задан, корень), длинные префиксы первыми
+        self._rules: List[Tuple[str, str, str]] = []
+        # Папка из сцены (без регистра) -> папка на этой машине
+        self._dirs: Dict[str, Optional[str]] = {}
+        if rules:
+            items = rules.items() if isinstance(rules, dict) else rules
+            for prefix, root in items:
+                self.add_rule(prefix, root)
+
+    def __bool__(self) -> bool:
+        return bool(self._rules)
+
+    def __len__(self) -> int:
+        return len(self._rules)
+
+    @property
+    def rules(self) -> List[Tuple[str, str]]:
+        return [(prefix, root) for _, prefix, root in self._rules]
+
+    def add_rule(self, prefix: str, root: Union[str, Path]):
+        self._rules.append((_normalize_prefix(prefix), prefix, os.fspath(root)))
+        self._rules.sort(key=lambda rule: len(rule[0]), reverse=True)
+        self._dirs.clear()
+
+    def to_dict(self) -> Dict[str, str]:
+        return dict(self.rules)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, str]) -> 'PathMapper':
+        return cls(data)
+
+    @classmethod
+    def load(cls, path: Path) -> 'PathMapper':
+        """
+        Правила из JSON-файла
+
+        Raises:
+            OSError, ValueError: файл не читается или не является объектом JSON
+        """
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if not isinstance(data, dict):
+            raise ValueError(f"{path}: ожидается объект {{\"префикс\": \"корень\"}}")
+        return cls.from_dict(data)
+
+    @classmethod
+    def from_env(cls) -> Optional['PathMapper']:
+        """Правила из MAX_ASSET_PATH_MAP или None, если переменная не задана"""
+
+        value = os.environ.get(PATH_MAP_ENV, '').strip()
+        if not value:
+            return None
+        if os.path.isfile(value):
+            return cls.load(Path(value))
+        return cls(parse_rule(rule) for rule in value.split(';') if rule.strip())
+
+    def _map_directory(self, directory: str) -> Optional[str]:
+        """Папка из сцены -> папка на этой машине по правилам (без обращения к диску)"""
+
+        normalized = directory.replace('/', '\\')
+        for prefix, _, root in self._rules:
+            if normalized[:len(prefix)].casefold() != prefix:
+                continue
+            rest = normalized[len(prefix):]
+            if rest and not rest.startswith('\\') and not prefix.endswith('\\'):
+                # "C:\Projects2" не подходит под префикс "C:\Projects"
+                continue
+            parts = [part for part in rest.split('\\') if part not in ('', '.')]
+            return os.path.join(root, *parts)
+        return None
+
+    def map_path(self, path: str) -> Optional[str]:
+        """
+        Путь на этой машине по правилам, без обращения к диску.
+        None - ни одно правило не подходит.
+        """
+
+        directory, name = ntpath.split(path)
+        key = directory.casefold()
+        try:
+            local_directory = self._dirs[key]
+        except KeyError:
+            local_directory = self._dirs[key] = self._map_directory(directory)
+        if local_directory is None:
+            return None
+        return os.path.join(local_directory, name) if name else local_directory
+
+    def entry(self, path: Union[str, Path], dir_cache: DirectoryCache) -> Optional[os.DirEntry]:
+        """
+        Запись файла на диске для пути из сцены или None.
+
+        Путь, подходящий под правило, переводится и ищется без учёта
+        регистра. Остальные пути ищутся как есть; Windows-путь без правила
+        вне Windows существовать не может.
+        """
+
+        path = os.fspath(path)
+        local_path = self.map_path(path)
+        if local_path is not None:
+            return dir_cache.entry(local_path, ignore_case=True)
+        if is_windows_path(path) and os.name != 'nt':
+            return None
+        return dir_cache.entry(path)
+
+    def resolve(self, path: Union[str, Path],
+                dir_cache: Optional[DirectoryCache] = None) -> Optional[Path]:
+        """Существующий файл на этой машине для пути из сцены или None"""
+        entry = self.entry(path, dir_cache if dir_cache is not None else DirectoryCache())
+        try:
+            if entry is not None and (entry.is_file() or entry.is_dir()):
+                return Path(entry.path)
+        except OSError:
+            pass
+        return None
@@ -0,0 +1,211 @@
+"""
+Общая таблица путей ассетов.
+
+Сцены одного проекта ссылаются на одни и те же библиотечные файлы, поэтому
+каждый путь хранится в таблице один раз и получает целочисленный номер.
+Наборы путей сцен (PathSet) хранят только номера в array('I'), а строки,
+Path и имена файлов строятся по требованию и кэшируются в таблице.
+"""
+
+import ntpath
+import threading
+from array import array
+from bisect import bisect_left
+from collections.abc import MutableSet
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional
+
+
+class PathTable:
+    """Таблица путей: строка <-> номер, с ленивыми Path и именами файлов"""
+
+    def __init__(self):
+        self._ids: Dict[str, int] = {}
+        self._paths: List[str] = []
+        self._path_objects: List[Optional[Path]] = []
+        self._lower_names: List[Optional[str]] = []
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._paths)
+
+    def intern(self, path: str) -> int:
+        """Номер пути; новый путь добавляется в таблицу"""
+
+        path_id = self._ids.get(path)
+        if path_id is not None:
+            return path_id
+        with self._lock:
+            path_id = self._ids.get(path)
+            if path_id is None:
+                # Строка может быть срезом большого буфера - храним свою копию
+                path = str(path)
+                path_id = len(self._paths)
+                self._paths.append(path)
+                self._path_objects.append(None)
+                self._lower_names.append(None)
+                self._ids[path] = path_id
+        return path_id
+
+    def lookup(self, path: str) -> Optional[int]:
+        """Номер пути без добавления в таблицу"""
+        return self._ids.get(path)
+
+    def path(self, path_id: int) -> str:
+        return self._paths[path_id]
+
+    def as_path(self, path_id: int) -> Path:
+        """Path для пути (создаётся один раз)"""
+
+        path_object = self._path_objects[path_id]
+        if path_object is None:
+            path_object = Path(self._paths[path_id])
+            self._path_objects[path_id] = path_object
+        return path_object
+
+    def lower_name(self, path_id: int) -> str:
+        """
+        Имя файла в нижнем регистре (вычисляется один раз). Пути сцен
+        записаны на Windows, поэтому имя отделяется и по обратному слэшу
+        на любой системе.
+        """
+
+        name = self._lower_names[path_id]
+        if name is None:
+            name = ntpath.basename(self._paths[path_id]).lower()
+            self._lower_names[path_id] = name
+        return name
+
+
+# Таблица процесса: общая для всех сцен и результатов анализа
+_default_table = PathTable()
+
+
+def default_path_table() -> PathTable:
+    return _default_table
+
+
+class PathSet(MutableSet):
+    """
+    Набор путей с API множества строк поверх номеров в общей таблице.
+
+    Номера хранятся отсортированным array('I'); изменения копятся
+    отдельно и сливаются в массив при первом обходе.
+    """
+
+    __slots__ = ('table', '_ids', '_added', '_removed')
+
+    def __init__(self, paths: Iterable[str] = (), table: Optional[PathTable] = None):
+        self.table = table if table is not None else _default_table
+        self._ids = array('I')
+        self._added: set = set()
+        self._removed: set = set()
+        for path in paths:
+            self.add(path)
+
+    @classmethod
+    def from_ids(cls, ids: Iterable[int], table: Optional[PathTable] = None) -> 'PathSet':
+        result = cls(table=table)
+        result._ids = array('I', sorted(set(ids)))
+        return result
+
+    @classmethod
+    def _from_iterable(cls, iterable: Iterable[str]) -> 'PathSet':
+        return cls(iterable)
+
+    def _compact(self) -> array:
+        """Сливает отложенные изменения в отсортированный массив номеров"""
+
+        if self._added or self._removed:
+            ids = set(self._ids)
+            ids |= self._added
+            ids -= self._removed
+            self._ids = array('I', sorted(ids))
+            self._added = set()
+            self._removed = set()
+        return self._ids
+
+    def ids(self) -> array:
+        """Отсортированные номера путей"""
+        return self._compact()
+
+    def _same_table(self, other) -> bool:
+        return isinstance(other, PathSet) and other.table is self.table
+
+    # --- Set ---
+
+    def __contains__(self, path) -> bool:
+        if not isinstance(path, str):
+            return False
+        path_id = self.table.lookup(path)
+        if path_id is None or path_id in self._removed:
+            return False
+        if path_id in self._added:
+            return True
+        ids = self._ids
+        index = bisect_left(ids, path_id)
+        return index < len(ids) and ids[index] == path_id
+
+    def __iter__(self) -> Iterator[str]:
+        path = self.table.path
+        for path_id in self._compact():
+            yield path(path_id)
+
+    def __len__(self) -> int:
+        return len(self._compact())
+
+    def add(self, path: str):
+        path_id = self.table.intern(path)
+        self._removed.discard(path_id)
+        self._added.add(path_id)
+
+    def discard(self, path: str):
+        path_id = self.table.lookup(path)
+        if path_id is not None:
+            self._added.discard(path_id)
+            self._removed.add(path_id)
+
+    def copy(self) -> 'PathSet':
+        result = PathSet(table=self.table)
+        result._ids = array('I', self._compact())
+        return result
+
+    def update(self, *others: Iterable[str]):
+        for other in others:
+            if self._same_table(other):
+                ids = other.ids()
+                self._removed.difference_update(ids)
+                self._added.update(ids)
+            else:
+                for path in other:
+                    self.add(path)
+
+    def __or__(self, other):
+        if self._same_table(other):
+            return PathSet.from_ids(set(self._compact()) | set(other.ids()), self.table)
+        return super().__or__(other)
+
+    def __and__(self, other):
+        if self._same_table(other):
+            return PathSet.from_ids(set(self._compact()) & set(other.ids()), self.table)
+        return super().__and__(other)
+
+    def __sub__(self, other):
+        if self._same_table(other):
+            return PathSet.from_ids(set(self._compact()) - set(other.ids()), self.table)
+        return super().__sub__(other)
+
+    def __eq__(self, other):
+        if self._same_table(other):
+            return self._compact() == other.ids()
+        return super().__eq__(other)
+
+    __ror__ = __or__
+    __rand__ = __and__
+
+    def __repr__(self) -> str:
+        return f"PathSet({sorted(self)!r})"
+
+    # При передаче между процессами номера теряют смысл - передаём строки
+    def __reduce__(self):
+        return (PathSet, (list(self),))
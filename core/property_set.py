@@ -0,0 +1,229 @@
+"""
+Декодер потоков свойств OLE (\\x05SummaryInformation,
+\\x05DocumentSummaryInformation) по MS-OLEPS.
+
+Поток содержит один или несколько наборов свойств; каждое свойство -
+тип (VT_*) и значение. Разбираются типы, которые пишет 3ds Max:
+числа, строки, FILETIME, буфер обмена (миниатюра) и векторы.
+"""
+
+import struct
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+
+# Идентификаторы наборов свойств
+FMTID_SUMMARY_INFORMATION = bytes.fromhex('e0859ff2f94f6810ab9108002b27b3d9')
+FMTID_DOC_SUMMARY_INFORMATION = bytes.fromhex('02d5cdd59c2e1b10939708002b2cf9ae')
+
+# Свойства SummaryInformation
+PID_CODEPAGE = 1
+PID_TITLE = 2
+PID_SUBJECT = 3
+PID_AUTHOR = 4
+PID_KEYWORDS = 5
+PID_COMMENTS = 6
+PID_LASTAUTHOR = 8
+PID_LASTSAVE_DTM = 13
+PID_THUMBNAIL = 17
+PID_APPNAME = 18
+
+# Свойства DocumentSummaryInformation
+PID_HEADINGPAIR = 12
+PID_DOCPARTS = 13
+
+# Типы значений
+VT_I2 = 2
+VT_I4 = 3
+VT_BOOL = 11
+VT_VARIANT = 12
+VT_UI4 = 19
+VT_INT = 22
+VT_UINT = 23
+VT_LPSTR = 30
+VT_LPWSTR = 31
+VT_FILETIME = 64
+VT_BLOB = 65
+VT_CF = 71
+VT_VECTOR = 0x1000
+
+_FILETIME_EPOCH = datetime(1601, 1, 1, tzinfo=timezone.utc)
+_INT_FORMATS = {VT_I2: '<h', VT_I4: '<i', VT_UI4: '<I', VT_INT: '<i', VT_UINT: '<I'}
+
+
+class PropertySetError(Exception):
+    """Повреждённый поток свойств"""
+
+
+@dataclass
+class ClipboardData:
+    """Значение VT_CF: формат буфера обмена и данные"""
+    format: int
+    data: bytes
+
+
+def parse_property_streams(data: bytes) -> Dict[bytes, Dict[int, Any]]:
+    """Разбирает поток свойств: {FMTID набора: {PID: значение}}"""
+
+    if len(data) < 28 or data[:2] != b'\xfe\xff':
+        raise PropertySetError("Неверный заголовок потока свойств")
+
+    count = _uint32(data, 24)
+    sets = {}
+    for index in range(min(count, 16)):
+        entry = 28 + index * 20
+        if entry + 20 > len(data):
+            raise PropertySetError("Обрезан список наборов свойств")
+        fmtid = data[entry:entry + 16]
+        sets[fmtid] = _parse_property_set(data, _uint32(data, entry + 16))
+    return sets
+
+
+def _parse_property_set(data: bytes, start: int) -> Dict[int, Any]:
+    """Свойства одного набора. Нераспознанные типы пропускаются"""
+
+    if start + 8 > len(data):
+        raise PropertySetError("Набор свойств за пределами потока")
+    size = _uint32(data, start)
+    count = _uint32(data, start + 4)
+    end = min(start + size, len(data))
+
+    offsets: List[Tuple[int, int]] = []
+    for index in range(count):
+        entry = start + 8 + index * 8
+        if entry + 8 > end:
+            break
+        offsets.append((_uint32(data, entry), start + _uint32(data, entry + 4)))
+
+    # Кодовая страница нужна для строк VT_LPSTR, читаем её первой
+    codepage = 1252
+    for pid, offset in offsets:
+        if pid == PID_CODEPAGE:
+            try:
+                value = _read_value(data, offset, end, 'cp1252')
+            except (UnicodeDecodeError, PropertySetError):
+                continue
+            if isinstance(value, int):
+                codepage = value & 0xFFFF
+    encoding = _codepage_encoding(codepage)
+
+    properties = {PID_CODEPAGE: codepage}
+    for pid, offset in offsets:
+        # PID 0 - словарь имён пользовательских свойств, не нужен
+        if pid in (0, PID_CODEPAGE):
+            continue
+        try:
+            value = _read_value(data, offset, end, encoding)
+        except (UnicodeDecodeError, PropertySetError):
+            continue
+        if value is not None:
+            properties[pid] = value
+    return properties
+
+
+def _read_value(data: bytes, offset: int, end: int, encoding: str) -> Any:
+    """Значение TypedPropertyValue (тип, 2 байта выравнивания, данные)"""
+
+    if offset + 4 > end:
+        raise PropertySetError("Свойство за пределами набора")
+    vt = _unpack('<H', data, offset, end)
+    value, _ = _read_typed(data, offset + 4, end, vt, encoding)
+    return value
+
+
+def _read_typed(data: bytes, pos: int, end: int, vt: int, encoding: str) -> Tuple[Any, int]:
+    """Значение типа vt с позиции pos; возвращает (значение, позиция после него)"""
+
+    if vt & VT_VECTOR:
+        count = _unpack('<I', data, pos, end)
+        pos += 4
+        if count > 65536:
+            raise PropertySetError("Слишком длинный вектор")
+        items = []
+        for _ in range(count):
+            if vt & ~VT_VECTOR == VT_VARIANT:
+                item_vt = _unpack('<H', data, pos, end)
+                if item_vt & VT_VECTOR:
+                    # Вложенные векторы MS-OLEPS не допускает
+                    raise PropertySetError("Вектор внутри VT_VARIANT")
+                item, pos = _read_typed(data, pos + 4, end, item_vt, encoding)
+            else:
+                item, pos = _read_typed(data, pos, end, vt & ~VT_VECTOR, encoding)
+            items.append(item)
+        return items, pos
+
+    if vt in _INT_FORMATS:
+        value = _unpack(_INT_FORMATS[vt], data, pos, end)
+        return value, pos + 4
+    if vt == VT_BOOL:
+        return _unpack('<h', data, pos, end) != 0, pos + 4
+    if vt == VT_LPSTR:
+        size = _unpack('<I', data, pos, end)
+        raw = _slice(data, pos + 4, size, end)
+        text = raw.decode(encoding, errors='replace')
+        return text.split('\x00', 1)[0], pos + 4 + _padded(size)
+    if vt == VT_LPWSTR:
+        length = _unpack('<I', data, pos, end)
+        raw = _slice(data, pos + 4, length * 2, end)
+        return raw.decode('utf-16-le', errors='replace').split('\x00', 1)[0], pos + 4 + _padded(length * 2)
+    if vt == VT_FILETIME:
+        ticks = _unpack('<Q', data, pos, end)
+        return _filetime(ticks), pos + 8
+    if vt == VT_BLOB:
+        size = _unpack('<I', data, pos, end)
+        return _slice(data, pos + 4, size, end), pos + 4 + _padded(size)
+    if vt == VT_CF:
+        size = _unpack('<I', data, pos, end)
+        raw = _slice(data, pos + 4, size, end)
+        if size < 4:
+            raise PropertySetError("Пустое значение VT_CF")
+        clip_format = struct.unpack_from('<i', raw, 0)[0]
+        return ClipboardData(format=clip_format, data=raw[4:]), pos + 4 + _padded(size)
+
+    raise PropertySetError(f"Неподдерживаемый тип свойства: {vt:#x}")
+
+
+def _filetime(ticks: int) -> Optional[datetime]:
+    """FILETIME (сотни наносекунд с 1601 года) -> datetime UTC"""
+    if ticks == 0:
+        return None
+    try:
+        return _FILETIME_EPOCH + timedelta(microseconds=ticks // 10)
+    except OverflowError:
+        return None
+
+
+def _codepage_encoding(codepage: int) -> str:
+    if codepage == 1200:
+        return 'utf-16-le'
+    if codepage == 65001:
+        return 'utf-8'
+    encoding = f'cp{codepage}'
+    try:
+        ''.encode(encoding)
+    except LookupError:
+        return 'cp1252'
+    return encoding
+
+
+def _slice(data: bytes, pos: int, size: int, end: int) -> bytes:
+    if pos + size > end:
+        raise PropertySetError("Значение за пределами набора")
+    return bytes(data[pos:pos + size])
+
+
+def _padded(size: int) -> int:
+    """Значения выравниваются на 4 байта"""
+    return (size + 3) & ~3
+
+
+def _unpack(fmt: str, data: bytes, pos: int, end: int) -> Any:
+    """Число формата fmt с позиции pos, не выходя за конец набора"""
+    if pos + struct.calcsize(fmt) > end:
+        raise PropertySetError("Значение за пределами набора")
+    return struct.unpack_from(fmt, data, pos)[0]
+
+
+def _uint32(data: bytes, pos: int) -> int:
+    return struct.unpack_from('<I', data, pos)[0]
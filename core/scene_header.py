@@ -0,0 +1,243 @@
+"""
+Сведения о сцене из потоков свойств документа - без разбора самой сцены.
+
+\\x05SummaryInformation: автор, кто и когда сохранил, миниатюра.
+\\x05DocumentSummaryInformation: содержимое по разделам (General,
+Render Data, ...) - версия 3ds Max, рендер и т.п.
+"""
+
+import re
+import struct
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .property_set import (
+    FMTID_DOC_SUMMARY_INFORMATION, FMTID_SUMMARY_INFORMATION,
+    PID_APPNAME, PID_AUTHOR, PID_DOCPARTS, PID_HEADINGPAIR, PID_LASTAUTHOR,
+    PID_LASTSAVE_DTM, PID_THUMBNAIL, PID_TITLE, ClipboardData,
+    PropertySetError, parse_property_streams,
+)
+
+
+SUMMARY_STREAM = '\x05SummaryInformation'
+DOC_SUMMARY_STREAM = '\x05DocumentSummaryInformation'
+
+# Строки содержимого, из которых берутся сведения о сцене
+_MAX_VERSION_RE = re.compile(r'3ds\s*max\s+version\s*[:=]\s*([\d.]+)', re.IGNORECASE)
+_SAVED_AS_RE = re.compile(r'saved\s+as\s+version\s*[:=]\s*([\d.]+)', re.IGNORECASE)
+_BUILD_RE = re.compile(r'^build\s*[:=]\s*(\S+)', re.IGNORECASE)
+_RENDERER_RE = re.compile(r'^renderer\s+name\s*[:=]\s*(.+)$', re.IGNORECASE)
+# Формат буфера обмена миниатюры: DIB без заголовка файла BMP
+CF_DIB = 8
+_BI_BITFIELDS = 3
+
+# Семейство рендера - название без номера версии: "V-Ray 6, update 2" -> "V-Ray"
+_RENDERER_FAMILY_RE = re.compile(r'^(.*?)(?:[\s,]+\d.*|,.*)?$')
+
+
+@dataclass
+class SceneHeader:
+    """Сведения о сцене из потоков свойств документа"""
+    scene_path: Path
+    max_version: Optional[str] = None
+    saved_as_version: Optional[str] = None
+    build: Optional[str] = None
+    renderer: Optional[str] = None
+    title: Optional[str] = None
+    author: Optional[str] = None
+    saved_by: Optional[str] = None
+    last_saved: Optional[datetime] = None
+    app_name: Optional[str] = None
+    has_thumbnail: bool = False
+    # Сжатая сцена: потоки свойств недоступны без распаковки
+    compressed: bool = False
+    # Содержимое документа по разделам: {"General": [...], "Render Data": [...]}
+    contents: Dict[str, List[str]] = field(default_factory=dict)
+    error: Optional[str] = None
+    # Сцена не прочитана (нет доступа, файл занят) - в кэш не пишется
+    failed: bool = False
+
+    @property
+    def max_year(self) -> Optional[int]:
+        """Год версии 3ds Max: 26.00 -> 2024"""
+        version = self.saved_as_version or self.max_version
+        if not version:
+            return None
+        try:
+            major = int(version.split('.')[0])
+        except ValueError:
+            return None
+        return major + 1998 if major >= 10 else None
+
+    @property
+    def renderer_family(self) -> Optional[str]:
+        """Рендер без номера версии (для фильтров)"""
+        if not self.renderer:
+            return None
+        return _RENDERER_FAMILY_RE.match(self.renderer).group(1).strip() or self.renderer
+
+    def to_dict(self) -> Dict:
+        return {
+            'scene_path': str(self.scene_path),
+            'max_version': self.max_version,
+            'saved_as_version': self.saved_as_version,
+            'max_year': self.max_year,
+            'build': self.build,
+            'renderer': self.renderer,
+            'title': self.title,
+            'author': self.author,
+            'saved_by': self.saved_by,
+            'last_saved': self.last_saved.isoformat() if self.last_saved else None,
+            'app_name': self.app_name,
+            'has_thumbnail': self.has_thumbnail,
+            'compressed': self.compressed,
+            'contents': self.contents,
+            'error': self.error,
+        }
+
+    @classmethod
+    def from_dict(cls, scene_path: Path, data: Dict) -> 'SceneHeader':
+        """Создаёт из словаря to_dict (производные поля пропускаются)"""
+        last_saved = data.get('last_saved')
+        return cls(
+            scene_path=scene_path,
+            max_version=data.get('max_version'),
+            saved_as_version=data.get('saved_as_version'),
+            build=data.get('build'),
+            renderer=data.get('renderer'),
+            title=data.get('title'),
+            author=data.get('author'),
+            saved_by=data.get('saved_by'),
+            last_saved=datetime.fromisoformat(last_saved) if last_saved else None,
+            app_name=data.get('app_name'),
+            has_thumbnail=data.get('has_thumbnail', False),
+            compressed=data.get('compressed', False),
+            contents=data.get('contents') or {},
+            error=data.get('error'),
+        )
+
+
+def parse_scene_header(scene_path: Path, summary: Optional[bytes],
+                       doc_summary: Optional[bytes]) -> SceneHeader:
+    """Собирает SceneHeader из содержимого двух потоков свойств"""
+
+    header = SceneHeader(scene_path=scene_path)
+
+    if summary:
+        try:
+            props = parse_property_streams(summary).get(FMTID_SUMMARY_INFORMATION, {})
+        except PropertySetError as e:
+            header.error = header.error or f"{SUMMARY_STREAM[1:]}: {e}"
+            props = {}
+        header.title = _text(props.get(PID_TITLE))
+        header.author = _text(props.get(PID_AUTHOR))
+        header.saved_by = _text(props.get(PID_LASTAUTHOR))
+        header.app_name = _text(props.get(PID_APPNAME))
+        if isinstance(props.get(PID_LASTSAVE_DTM), datetime):
+            header.last_saved = props[PID_LASTSAVE_DTM]
+        thumbnail = props.get(PID_THUMBNAIL)
+        header.has_thumbnail = isinstance(thumbnail, ClipboardData) and bool(thumbnail.data)
+
+    if doc_summary:
+        try:
+            props = parse_property_streams(doc_summary).get(FMTID_DOC_SUMMARY_INFORMATION, {})
+        except PropertySetError as e:
+            header.error = header.error or f"{DOC_SUMMARY_STREAM[1:]}: {e}"
+            props = {}
+        header.contents = _group_doc_parts(props.get(PID_HEADINGPAIR), props.get(PID_DOCPARTS))
+        _read_contents(header)
+
+    return header
+
+
+def thumbnail_from_summary(summary: bytes) -> Optional[bytes]:
+    """
+    Миниатюра сцены из \\x05SummaryInformation в виде файла BMP
+    (None, если миниатюры нет или формат не DIB)
+    """
+
+    try:
+        props = parse_property_streams(summary).get(FMTID_SUMMARY_INFORMATION, {})
+    except PropertySetError:
+        return None
+    thumbnail = props.get(PID_THUMBNAIL)
+    if not isinstance(thumbnail, ClipboardData) or thumbnail.format != CF_DIB:
+        return None
+    return dib_to_bmp(thumbnail.data)
+
+
+def dib_to_bmp(dib: bytes) -> Optional[bytes]:
+    """Добавляет к DIB заголовок файла BMP (смещение пикселей считается по заголовку DIB)"""
+
+    if len(dib) < 12:
+        return None
+    header_size = struct.unpack_from('<I', dib, 0)[0]
+    if header_size == 12:
+        # BITMAPCOREHEADER: палитра из трёхбайтных записей
+        bit_count = struct.unpack_from('<H', dib, 10)[0]
+        palette = (1 << bit_count) * 3 if bit_count <= 8 else 0
+        masks = 0
+    elif 40 <= header_size <= len(dib):
+        bit_count, compression = struct.unpack_from('<HI', dib, 14)
+        colors_used = struct.unpack_from('<I', dib, 32)[0]
+        if not colors_used and bit_count <= 8:
+            colors_used = 1 << bit_count
+        palette = colors_used * 4
+        # Маски цветов идут за BITMAPINFOHEADER, в V4/V5 они внутри заголовка
+        masks = 12 if header_size == 40 and compression == _BI_BITFIELDS else 0
+    else:
+        return None
+
+    pixels_offset = 14 + header_size + masks + palette
+    if pixels_offset > 14 + len(dib):
+        return None
+    return b'BM' + struct.pack('<IHHI', 14 + len(dib), 0, 0, pixels_offset) + dib
+
+
+def _group_doc_parts(heading_pairs, doc_parts) -> Dict[str, List[str]]:
+    """
+    Раскладывает строки содержимого по разделам: HeadingPairs - пары
+    (название раздела, число строк), DocParts - все строки подряд
+    """
+
+    if not isinstance(doc_parts, list):
+        return {}
+    parts = [str(part) for part in doc_parts]
+    if not isinstance(heading_pairs, list):
+        return {'': parts}
+
+    contents: Dict[str, List[str]] = {}
+    position = 0
+    for index in range(0, len(heading_pairs) - 1, 2):
+        name, count = heading_pairs[index], heading_pairs[index + 1]
+        if not isinstance(name, str) or not isinstance(count, int) or count < 0:
+            break
+        contents.setdefault(name, []).extend(parts[position:position + count])
+        position += count
+    if position < len(parts):
+        contents.setdefault('', []).extend(parts[position:])
+    return contents
+
+
+def _read_contents(header: SceneHeader):
+    """Версия, сборка и рендер из строк содержимого"""
+
+    for parts in header.contents.values():
+        for part in parts:
+            part = part.strip()
+            if header.max_version is None and (match := _MAX_VERSION_RE.search(part)):
+                header.max_version = match.group(1)
+            elif header.saved_as_version is None and (match := _SAVED_AS_RE.search(part)):
+                header.saved_as_version = match.group(1)
+            elif header.build is None and (match := _BUILD_RE.match(part)):
+                header.build = match.group(1)
+            elif header.renderer is None and (match := _RENDERER_RE.match(part)):
+                header.renderer = match.group(1).strip()
+
+
+def _text(value) -> Optional[str]:
+    if isinstance(value, str) and value.strip():
+        return value.strip()
+    return None
@@ -0,0 +1,187 @@
+"""
+Кэш миниатюр сцен на диске (SQLite)
+
+Миниатюра привязана к абсолютному пути, размеру и mtime_ns сцены.
+Сцены без миниатюры тоже запоминаются (пустая запись), чтобы не читать
+их повторно; сбои чтения не запоминаются. Размер кэша ограничен, давно не показанные миниатюры
+вытесняются.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+from .parse_cache import default_cache_dir
+
+
+class ThumbnailCache:
+    """LRU-кэш миниатюр (BMP) по идентичности файла сцены"""
+
+    DEFAULT_MAX_BYTES = 128 * 1024 * 1024
+    EVICT_TO_RATIO = 0.9
+
+    def __init__(self, cache_file: Optional[Path] = None,
+                 max_bytes: int = DEFAULT_MAX_BYTES):
+        """
+        Args:
+            cache_file: Файл базы (если None, используется папка кэша пользователя)
+            max_bytes: Предел суммарного размера миниатюр
+        """
+        if cache_file is None:
+            cache_file = default_cache_dir() / "thumbnail_cache.sqlite"
+
+        self.cache_file = Path(cache_file)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        # Суммарный размер миниатюр: считается один раз, дальше ведётся при
+        # записи, чтобы не суммировать всю таблицу на каждую сцену
+        self._total: Optional[int] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        """Открывает базу при первом обращении"""
+
+        if self._conn is None:
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            # Миниатюры загружаются пулом потоков, доступ сериализуется блокировкой
+            conn = sqlite3.connect(str(self.cache_file), timeout=10,
+                                   check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS thumbnails (
+                    path TEXT PRIMARY KEY,
+                    size INTEGER NOT NULL,
+                    mtime_ns INTEGER NOT NULL,
+                    image BLOB NOT NULL,
+                    image_size INTEGER NOT NULL,
+                    last_used REAL NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS thumbnails_last_used ON thumbnails(last_used)")
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    @staticmethod
+    def _key_path(scene_path: Path) -> str:
+        return os.path.normcase(os.path.abspath(scene_path))
+
+    def get(self, scene_path: Path, stat: os.stat_result) -> Optional[bytes]:
+        """
+        Сохранённая миниатюра, если сцена не менялась. b'' - у сцены нет
+        миниатюры, None - записи нет
+        """
+
+        try:
+            with self._lock:
+                conn = self._connect()
+                row = conn.execute(
+                    "SELECT size, mtime_ns, image FROM thumbnails WHERE path = ?",
+                    (self._key_path(scene_path),)).fetchone()
+                if row is None:
+                    return None
+                size, mtime_ns, image = row
+                if size != stat.st_size or mtime_ns != stat.st_mtime_ns:
+                    return None
+                conn.execute("UPDATE thumbnails SET last_used = ? WHERE path = ?",
+                             (time.time(), self._key_path(scene_path)))
+                conn.commit()
+            return bytes(image)
+        except sqlite3.Error:
+            return None
+
+    def put(self, scene_path: Path, stat: os.stat_result, image: Optional[bytes]):
+        """Сохраняет миниатюру (None - у сцены нет миниатюры)"""
+
+        image = image or b''
+        key = self._key_path(scene_path)
+        try:
+            with self._lock:
+                conn = self._connect()
+                if self._total is None:
+                    self._total = conn.execute(
+                        "SELECT COALESCE(SUM(image_size), 0) FROM thumbnails").fetchone()[0]
+                old = conn.execute("SELECT image_size FROM thumbnails WHERE path = ?",
+                                   (key,)).fetchone()
+                conn.execute(
+                    "INSERT OR REPLACE INTO thumbnails VALUES (?, ?, ?, ?, ?, ?)",
+                    (key, stat.st_size, stat.st_mtime_ns,
+                     sqlite3.Binary(image), len(image), time.time()))
+                self._total += len(image) - (old[0] if old else 0)
+                self._evict(conn)
+                conn.commit()
+        except sqlite3.Error:
+            # Сумма могла разойтись с базой - пересчитаем при следующей записи
+            self._total = None
+
+    def get_or_read(self, scene_path: Path,
+                    reader: Callable[[Path], Optional[bytes]]) -> Optional[bytes]:
+        """
+        Миниатюра из кэша, а при промахе - прочитанная reader и сохранённая.
+        None, если миниатюры нет или сцена недоступна. Исключение reader
+        (сбой чтения) передаётся дальше и в кэш не попадает
+        """
+
+        scene_path = Path(scene_path)
+        try:
+            stat = scene_path.stat()
+        except OSError:
+            return None
+
+        image = self.get(scene_path, stat)
+        if image is None:
+            image = reader(scene_path)
+            self.put(scene_path, stat, image)
+        return image or None
+
+    def _evict(self, conn: sqlite3.Connection):
+        """Удаляет давно не показанные миниатюры сверх предела размера"""
+
+        if self._total <= self.max_bytes:
+            return
+
+        target = self._total - int(self.max_bytes * self.EVICT_TO_RATIO)
+        freed = 0
+        stale = []
+        for path, image_size in conn.execute(
+                "SELECT path, image_size FROM thumbnails ORDER BY last_used"):
+            stale.append((path,))
+            freed += image_size
+            if freed >= target:
+                break
+        conn.executemany("DELETE FROM thumbnails WHERE path = ?", stale)
+        self._total -= freed
+
+    def clear(self):
+        """Удаляет все миниатюры"""
+
+        with self._lock:
+            conn = self._connect()
+            conn.execute("DELETE FROM thumbnails")
+            conn.commit()
+            conn.execute("VACUUM")
+            self._total = 0
+
+    def get_stats(self) -> Dict:
+        """Количество записей и занимаемый размер"""
+
+        with self._lock:
+            conn = self._connect()
+            count, total = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(image_size), 0) FROM thumbnails").fetchone()
+        return {
+            'entries': count,
+            'payload_size': total,
+            'max_size': self.max_bytes,
+            'cache_file': str(self.cache_file),
+        }
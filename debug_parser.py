@@ -46,6 +46,8 @@ def debug_parse(max_file: str):
         for err in assets.errors:
             print(f"   {err}")
     
+    print_profile(assets)
+    
     if assets.debug_info:
         print(f"\n🔧 Отладочная информация:")
         for info in assets.debug_info[:50]:  # Первые 50
@@ -56,6 +58,55 @@ def debug_parse(max_file: str):
     return assets
 
 
+# Подписи этапов профиля разбора
+PROFILE_STAGES = [
+    ('cache', "Кэш разбора"),
+    ('ole_open', "Открытие OLE"),
+    ('ole_read', "Чтение потоков"),
+    ('inflate', "Распаковка"),
+    ('metadata', "Таблица ассетов"),
+    ('fingerprint', "Отпечатки потоков"),
+    ('scan', "Поиск путей"),
+    ('resolve', "Относительные пути"),
+    ('clean', "Очистка путей"),
+]
+
+
+def print_profile(assets):
+    """Печатает профиль разбора таблицами"""
+    
+    profile = assets.profile
+    
+    print(f"\n⏱️ Этапы разбора:")
+    total = sum(profile.timings.values())
+    for key, label in PROFILE_STAGES:
+        if key in profile.timings:
+            seconds = profile.timings[key]
+            share = seconds / total * 100 if total else 0.0
+            print(f"   {label:<22} {seconds * 1000:9.1f} мс  {share:5.1f}%")
+    
+    if profile.compressed_bytes:
+        print(f"\n🗜️ Сжатая сцена: {profile.compressed_bytes / 1024:.1f} КБ -> "
+              f"{profile.inflated_bytes / 1024:.1f} КБ")
+    
+    if profile.reused_bytes:
+        print(f"\n♻️ Потоки без изменений (из кэша): {profile.reused_bytes / 1024:.1f} КБ")
+    
+    if profile.stream_bytes:
+        print(f"\n📖 Прочитано из потоков: {profile.total_bytes / 1024:.1f} КБ")
+        for name, size in sorted(profile.stream_bytes.items(), key=lambda item: -item[1]):
+            print(f"   {name.lstrip(chr(5)):<32} {size / 1024:10.1f} КБ")
+    
+    print(f"\n🔍 Кандидатов в пути: {profile.total_found}, принято: {profile.accepted}")
+    for source, count in sorted(profile.found.items(), key=lambda item: -item[1]):
+        print(f"   {source:<32} {count:10d}")
+    if profile.rejected:
+        print(f"   Отклонено:")
+        for reason, count in sorted(profile.rejected.items(), key=lambda item: -item[1]):
+            label = MaxFileParser.REJECT_REASONS.get(reason, reason)
+            print(f"   - {label:<30} {count:10d}")
+
+
 def dump_raw_strings(max_file: str, output_file: str = None):
     """Извлекает все строки из .max файла для анализа"""
     
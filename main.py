@@ -3,15 +3,27 @@
 """
 3ds Max Asset Manager
 Программа для управления текстурами и прокси в сценах 3ds Max
+
+Без аргументов открывается окно программы. С командой (analyze, report,
+organize, update-paths, cache) работает как python -m core - без
+интерфейса и без загрузки PyQt6.
 """
 
 import sys
+import multiprocessing
 from pathlib import Path
 
 # Добавляем пути
 sys.path.insert(0, str(Path(__file__).parent))
 
-from ui.main_window import main
-
 if __name__ == "__main__":
+    # Разбор сцен идёт в пуле процессов - нужно для собранного exe
+    multiprocessing.freeze_support()
+    
+    # Аргументы Qt начинаются с '-', команды командной строки - нет
+    if len(sys.argv) > 1 and not sys.argv[1].startswith('-'):
+        from core.__main__ import main as cli_main
+        sys.exit(cli_main())
+    
+    from ui.main_window import main
     main()
@@ -19,7 +19,7 @@ from pathlib import Path
 # Добавляем путь к core
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from core.asset_analyzer import AnalysisResult, FileInfo
+from core.asset_analyzer import AnalysisDelta, AnalysisResult, FileInfo
 
 
 class FolderTreeWidget(QWidget):
@@ -28,6 +28,12 @@ class FolderTreeWidget(QWidget):
     def __init__(self):
         super().__init__()
         self.current_analysis: Optional[AnalysisResult] = None
+        # Элементы дерева для обновления по изменениям без перестройки
+        self.root_item: Optional[QTreeWidgetItem] = None
+        self.folder_items: Dict[str, QTreeWidgetItem] = {}
+        self.file_items: Dict[Path, QTreeWidgetItem] = {}
+        self.missing_root: Optional[QTreeWidgetItem] = None
+        self.missing_items: Dict[str, QTreeWidgetItem] = {}
         self.init_ui()
     
     def init_ui(self):
@@ -85,6 +91,11 @@ class FolderTreeWidget(QWidget):
         """Обновляет дерево на основе результатов анализа"""
         self.current_analysis = analysis
         self.tree.clear()
+        self.root_item = None
+        self.folder_items.clear()
+        self.file_items.clear()
+        self.missing_root = None
+        self.missing_items.clear()
         
         if not analysis.all_files_info:
             return
@@ -98,6 +109,7 @@ class FolderTreeWidget(QWidget):
         root_item = QTreeWidgetItem(self.tree)
         root_item.setText(0, str(analysis.folder_path))
         root_item.setExpanded(True)
+        self.root_item = root_item
         
         # Добавляем папки
         for folder_name in sorted(files_by_folder.keys()):
@@ -105,48 +117,157 @@ class FolderTreeWidget(QWidget):
         
         # Добавляем отсутствующие файлы
         if analysis.missing_files:
-            missing_item = QTreeWidgetItem(root_item)
-            missing_item.setText(0, "❌ Отсутствующие файлы")
-            missing_item.setForeground(0, QBrush(QColor(158, 158, 158)))
-            missing_item.setExpanded(False)
+            missing_item = self._create_missing_root(root_item)
             
             for missing_path in sorted(analysis.missing_files):
-                file_item = QTreeWidgetItem(missing_item)
-                try:
-                    file_name = Path(missing_path).name
-                    file_item.setText(0, file_name)
-                    file_item.setText(1, Path(missing_path).suffix)
-                    file_item.setText(2, "❌ Отсутствует")
-                    file_item.setForeground(2, QBrush(QColor(158, 158, 158)))
-                    file_item.setForeground(0, QBrush(QColor(158, 158, 158)))
-                except Exception:
-                    file_item.setText(0, str(missing_path))
-                    file_item.setText(2, "❌ Отсутствует")
-                    file_item.setForeground(2, QBrush(QColor(158, 158, 158)))
+                self._create_missing_item(missing_item, missing_path)
         
         self.tree.expandAll()
     
+    def _create_missing_root(self, root_item: QTreeWidgetItem) -> QTreeWidgetItem:
+        """Создает элемент группы отсутствующих файлов (последним в корне)"""
+        missing_item = QTreeWidgetItem(root_item)
+        missing_item.setText(0, "❌ Отсутствующие файлы")
+        missing_item.setForeground(0, QBrush(QColor(158, 158, 158)))
+        missing_item.setExpanded(False)
+        self.missing_root = missing_item
+        return missing_item
+    
+    def _create_missing_item(self, parent: QTreeWidgetItem, missing_path: str,
+                             index: Optional[int] = None) -> QTreeWidgetItem:
+        """Создает элемент отсутствующего файла"""
+        file_item = QTreeWidgetItem()
+        if index is None:
+            parent.addChild(file_item)
+        else:
+            parent.insertChild(index, file_item)
+        try:
+            file_name = Path(missing_path).name
+            file_item.setText(0, file_name)
+            file_item.setText(1, Path(missing_path).suffix)
+            file_item.setText(2, "❌ Отсутствует")
+            file_item.setForeground(2, QBrush(QColor(158, 158, 158)))
+            file_item.setForeground(0, QBrush(QColor(158, 158, 158)))
+        except Exception:
+            file_item.setText(0, str(missing_path))
+            file_item.setText(2, "❌ Отсутствует")
+            file_item.setForeground(2, QBrush(QColor(158, 158, 158)))
+        file_item.setData(0, Qt.ItemDataRole.UserRole, missing_path)
+        self.missing_items[missing_path] = file_item
+        return file_item
+    
+    def apply_delta(self, analysis: AnalysisResult, delta: AnalysisDelta):
+        """
+        Обновляет дерево по изменениям в папке: добавляет, удаляет и
+        перекрашивает только затронутые файлы
+        """
+        if self.root_item is None or analysis is not self.current_analysis:
+            self.update_tree(analysis)
+            return
+        
+        self.tree.setUpdatesEnabled(False)
+        try:
+            folders = set()
+            for file_info in delta.removed:
+                self._remove_file_item(file_info.path)
+                folders.add(file_info.folder)
+            for before, after in delta.changed:
+                if before.folder != after.folder:
+                    self._remove_file_item(before.path)
+                    folders.add(before.folder)
+                    self._insert_file_item(after)
+                else:
+                    item = self.file_items.get(after.path)
+                    if item is None:
+                        self._insert_file_item(after)
+                    else:
+                        self._fill_file_item(item, after)
+                folders.add(after.folder)
+            for file_info in delta.added:
+                self._insert_file_item(file_info)
+                folders.add(file_info.folder)
+            
+            for folder_name in folders:
+                self._update_folder_summary(analysis, folder_name)
+            
+            self._update_missing(delta)
+        finally:
+            self.tree.setUpdatesEnabled(True)
+    
+    def _remove_file_item(self, path: Path):
+        item = self.file_items.pop(path, None)
+        if item is not None and item.parent() is not None:
+            item.parent().removeChild(item)
+    
+    def _insert_file_item(self, file_info: FileInfo):
+        """Добавляет файл в папку, сохраняя сортировку по имени"""
+        folder_item = self.folder_items.get(file_info.folder)
+        if folder_item is None:
+            # Новая папка - на своё место среди папок (группа отсутствующих - последняя)
+            index = 0
+            names = sorted(self.folder_items)
+            while index < len(names) and names[index] < file_info.folder:
+                index += 1
+            folder_item = QTreeWidgetItem()
+            self.root_item.insertChild(index, folder_item)
+            folder_item.setText(0, f"📁 {file_info.folder}")
+            self.folder_items[file_info.folder] = folder_item
+        
+        index = 0
+        while (index < folder_item.childCount() and
+               folder_item.child(index).text(0) < file_info.name):
+            index += 1
+        file_item = QTreeWidgetItem()
+        folder_item.insertChild(index, file_item)
+        self._fill_file_item(file_item, file_info)
+        self.file_items[file_info.path] = file_item
+    
+    def _update_folder_summary(self, analysis: AnalysisResult, folder_name: str):
+        """Пересчитывает подпись папки; пустая папка убирается"""
+        folder_item = self.folder_items.get(folder_name)
+        if folder_item is None:
+            return
+        if folder_item.childCount() == 0:
+            self.root_item.removeChild(folder_item)
+            del self.folder_items[folder_name]
+            return
+        
+        files = [analysis.all_files_info[Path(folder_item.child(i).data(0, Qt.ItemDataRole.UserRole))]
+                 for i in range(folder_item.childCount())]
+        self._fill_folder_item(folder_item, files)
+    
+    def _update_missing(self, delta: AnalysisDelta):
+        """Добавляет и убирает отсутствующие файлы"""
+        for missing_path in delta.missing_removed:
+            item = self.missing_items.pop(missing_path, None)
+            if item is not None and self.missing_root is not None:
+                self.missing_root.removeChild(item)
+        
+        if delta.missing_added and self.missing_root is None:
+            self._create_missing_root(self.root_item)
+        for missing_path in sorted(delta.missing_added):
+            if missing_path in self.missing_items:
+                continue
+            index = 0
+            while (index < self.missing_root.childCount() and
+                   self.missing_root.child(index).data(0, Qt.ItemDataRole.UserRole) < missing_path):
+                index += 1
+            self._create_missing_item(self.missing_root, missing_path, index)
+        
+        if self.missing_root is not None and self.missing_root.childCount() == 0:
+            self.root_item.removeChild(self.missing_root)
+            self.missing_root = None
+    
     def _create_folder_item(self, parent: QTreeWidgetItem, folder_name: str, 
                            files: list, analysis: AnalysisResult) -> QTreeWidgetItem:
         """Создает элемент папки с файлами"""
         folder_item = QTreeWidgetItem(parent)
         folder_item.setText(0, f"📁 {folder_name}")
         folder_item.setExpanded(False)
+        self.folder_items[folder_name] = folder_item
         
         # Статистика папки
-        used_count = sum(1 for f in files if f.is_used)
-        unused_count = len(files) - used_count
-        total_size = 0
-        
-        for file_info in files:
-            try:
-                if file_info.path.exists():
-                    total_size += file_info.path.stat().st_size
-            except (OSError, AttributeError):
-                pass
-        
-        folder_item.setText(1, f"{len(files)} файлов")
-        folder_item.setText(2, f"✅ {used_count} | ⚠️ {unused_count}")
+        self._fill_folder_item(folder_item, files)
         
         # Добавляем файлы
         for file_info in sorted(files, key=lambda x: x.name):
@@ -154,10 +275,25 @@ class FolderTreeWidget(QWidget):
         
         return folder_item
     
+    def _fill_folder_item(self, folder_item: QTreeWidgetItem, files: list):
+        """Подпись папки: число файлов и сколько из них используется"""
+        used_count = sum(1 for f in files if f.is_used)
+        unused_count = len(files) - used_count
+        
+        folder_item.setText(1, f"{len(files)} файлов")
+        folder_item.setText(2, f"✅ {used_count} | ⚠️ {unused_count}")
+    
     def _create_file_item(self, parent: QTreeWidgetItem, file_info: FileInfo, 
                           analysis: AnalysisResult) -> QTreeWidgetItem:
         """Создает элемент файла"""
         file_item = QTreeWidgetItem(parent)
+        self._fill_file_item(file_item, file_info)
+        self.file_items[file_info.path] = file_item
+        return file_item
+    
+    def _fill_file_item(self, file_item: QTreeWidgetItem, file_info: FileInfo):
+        """Заполняет элемент файла: тип, статус с цветом, размер"""
+        file_item.setData(0, Qt.ItemDataRole.UserRole, str(file_info.path))
         
         # Имя файла
         file_item.setText(0, file_info.name)
@@ -183,23 +319,21 @@ class FolderTreeWidget(QWidget):
                 if len(file_info.used_in_scenes) > 2:
                     scenes_text += f" (+{len(file_info.used_in_scenes) - 2})"
                 file_item.setToolTip(2, f"Используется в: {scenes_text}")
+            else:
+                file_item.setToolTip(2, "")
         else:
             file_item.setText(2, "⚠️ Не используется")
             file_item.setForeground(2, QBrush(QColor(244, 67, 54)))  # Красный
             file_item.setForeground(0, QBrush(QColor(244, 67, 54)))
+            file_item.setToolTip(2, "")
         
         # Размер
-        try:
-            if file_info.path.exists():
-                size = file_info.path.stat().st_size
-                file_item.setText(3, self._format_size(size))
-            else:
-                file_item.setText(3, "—")
-                file_item.setForeground(3, QBrush(QColor(158, 158, 158)))
-        except (OSError, AttributeError):
+        if file_info.size is not None:
+            file_item.setText(3, self._format_size(file_info.size))
+            file_item.setForeground(3, QBrush())
+        else:
             file_item.setText(3, "—")
-        
-        return file_item
+            file_item.setForeground(3, QBrush(QColor(158, 158, 158)))
     
     def _format_size(self, size_bytes: int) -> str:
         """Форматирует размер файла"""
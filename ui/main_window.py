@@ -5,25 +5,31 @@
 import sys
 import os
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Iterable, Optional, Set
 
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
     QPushButton, QLabel, QLineEdit, QTextEdit, QFileDialog,
     QProgressBar, QGroupBox, QCheckBox, QTabWidget, QMessageBox,
-    QFrame, QListWidget, QListWidgetItem, QDialog, QDialogButtonBox
+    QFrame, QListWidget, QListWidgetItem, QDialog, QDialogButtonBox,
+    QComboBox, QSpinBox
 )
-from PyQt6.QtCore import Qt, QThread, pyqtSignal, QSettings
-from PyQt6.QtGui import QFont, QTextCursor, QColor, QBrush
+from PyQt6.QtCore import Qt, QThread, pyqtSignal, QSettings, QPoint, QSize, QTimer
+from PyQt6.QtGui import QFont, QTextCursor, QIcon, QImage, QPixmap
 
 # Добавляем путь к core
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from core import AssetAnalyzer, FileManager, AnalysisResult, OrganizeResult
-from core.asset_analyzer import FileInfo
+from core import (AssetAnalyzer, FileManager, AnalysisResult, OrganizeResult, ParseMode,
+                  SceneHeader)
+from core.asset_analyzer import FileInfo, FolderChanges
+from core.folder_walker import walk_files_parallel
+from core.folder_watcher import create_watcher
 from ui.statistics_widget import StatisticsWidget
 from ui.folder_tree_widget import FolderTreeWidget
 from ui.restore_menu_widget import RestoreMenuWidget
+from ui.scene_headers import SceneHeaderLoader
+from ui.scene_thumbnails import ThumbnailLoader
 
 
 class AnalyzerThread(QThread):
@@ -34,21 +40,33 @@ class AnalyzerThread(QThread):
     error = pyqtSignal(str)
     
     def __init__(self, path: Path, is_folder: bool = False, 
-                 recursive: bool = False):
+                 recursive: bool = False,
+                 parse_mode: ParseMode = ParseMode.STANDARD,
+                 workers: Optional[int] = None):
         super().__init__()
         self.path = path
         self.is_folder = is_folder
         self.recursive = recursive
-        self.analyzer = AssetAnalyzer(debug=True)
+        self.parse_mode = parse_mode
+        self.analyzer = AssetAnalyzer(debug=True, progress_callback=self._emit_progress,
+                                      workers=workers)
+    
+    def _emit_progress(self, message: str):
+        try:
+            self.progress.emit(str(message))
+        except (RuntimeError, TypeError):
+            pass
     
     def run(self):
         try:
             self.progress.emit(f"🔍 Начинаем анализ: {self.path}")
             
             if self.is_folder:
-                result = self.analyzer.analyze_folder(self.path, self.recursive)
+                result = self.analyzer.analyze_folder(self.path, self.recursive,
+                                                      parse_mode=self.parse_mode)
             else:
-                result = self.analyzer.analyze_single_scene(self.path)
+                result = self.analyzer.analyze_single_scene(self.path,
+                                                            parse_mode=self.parse_mode)
             
             self.progress.emit("✅ Анализ завершен")
             self.finished_analysis.emit(result)
@@ -58,6 +76,69 @@ class AnalyzerThread(QThread):
             self.error.emit(f"Ошибка анализа: {str(e)}\n{traceback.format_exc()}")
 
 
+class WatchThread(QThread):
+    """
+    Поток отслеживания папки проекта: ждёт событий файловой системы,
+    читает изменения с диска (разбор изменённых сцен) и отдаёт их в
+    поток интерфейса, где они применяются к результату анализа.
+    """
+    
+    progress = pyqtSignal(str)
+    changes_ready = pyqtSignal(object)
+    
+    # Пауза без событий, после которой серия изменений считается законченной
+    # (сохранение сцены и копирование папки дают много событий подряд)
+    SETTLE_SECONDS = 0.5
+    
+    def __init__(self, analysis: AnalysisResult, poll_interval: float = 5.0,
+                 workers: Optional[int] = None):
+        super().__init__()
+        self.analysis = analysis
+        self.poll_interval = poll_interval
+        self.analyzer = AssetAnalyzer(progress_callback=self._emit_progress, workers=workers)
+    
+    def _emit_progress(self, message: str):
+        try:
+            self.progress.emit(str(message))
+        except (RuntimeError, TypeError):
+            pass
+    
+    def run(self):
+        try:
+            watcher = create_watcher(str(self.analysis.folder_path),
+                                     AssetAnalyzer.ALL_EXTENSIONS | {'.max'}, ('unused',),
+                                     self.poll_interval, stat_extensions={'.max'})
+        except OSError as e:
+            self._emit_progress(f"⚠ Отслеживание папки недоступно: {e}")
+            return
+        
+        method = "inotify" if watcher.kind == 'inotify' else f"опрос раз в {self.poll_interval:g} с"
+        self._emit_progress(f"👁 Отслеживание папки включено ({method})")
+        
+        with watcher:
+            while not self.isInterruptionRequested():
+                events = watcher.read_events(1.0)
+                if not events:
+                    continue
+                while not self.isInterruptionRequested():
+                    more = watcher.read_events(self.SETTLE_SECONDS)
+                    if not more:
+                        break
+                    events.extend(more)
+                
+                try:
+                    changes = self.analyzer.collect_changes(self.analysis, events)
+                except Exception as e:
+                    self._emit_progress(f"⚠ Не удалось прочитать изменения в папке: {e}")
+                    continue
+                if not changes.is_empty:
+                    self.changes_ready.emit(changes)
+    
+    def stop(self):
+        self.requestInterruption()
+        self.wait()
+
+
 class OrganizerThread(QThread):
     """Поток для организации файлов"""
     
@@ -123,6 +204,9 @@ class OrganizerThread(QThread):
 class MainWindow(QMainWindow):
     """Главное окно приложения"""
     
+    # Размер миниатюры сцены в списке, пикселей
+    THUMBNAIL_SIZE = 48
+    
     def __init__(self):
         super().__init__()
         
@@ -130,8 +214,21 @@ class MainWindow(QMainWindow):
         self.current_analysis: Optional[AnalysisResult] = None
         self.analyzer_thread = None
         self.organizer_thread = None
+        self.watch_thread: Optional[WatchThread] = None
         self.file_manager: Optional[FileManager] = None
         self.last_organize_result = None
+        # Сведения о сценах папки из потоков свойств: путь -> SceneHeader.
+        # Читаются в фоне после того, как список сцен уже показан
+        self.scene_headers: Dict[str, SceneHeader] = {}
+        self.scene_folder: Optional[Path] = None
+        self.header_generation = 0
+        self.header_loader = SceneHeaderLoader(parent=self)
+        self.header_loader.headers_ready.connect(self.on_scene_headers_ready)
+        # Миниатюры сцен грузятся в фоне по мере прокрутки списка
+        self.scene_items: Dict[str, QListWidgetItem] = {}
+        self.thumbnails_loaded: Set[str] = set()
+        self.thumbnail_loader = ThumbnailLoader(icon_size=self.THUMBNAIL_SIZE, parent=self)
+        self.thumbnail_loader.thumbnail_ready.connect(self.on_thumbnail_ready)
         
         self.init_ui()
         self.load_settings()
@@ -226,6 +323,34 @@ class MainWindow(QMainWindow):
         # === Кнопки ===
         actions_layout = QHBoxLayout()
         
+        actions_layout.addWidget(QLabel("Режим разбора:"))
+        self.parse_mode_combo = QComboBox()
+        self.parse_mode_combo.addItem("Быстрый", ParseMode.FAST)
+        self.parse_mode_combo.addItem("Стандартный", ParseMode.STANDARD)
+        self.parse_mode_combo.addItem("Полный", ParseMode.EXHAUSTIVE)
+        self.parse_mode_combo.setCurrentIndex(1)
+        self.parse_mode_combo.setToolTip(
+            "Быстрый - только таблица ассетов сцены и свойства документа\n"
+            "Стандартный - таблица ассетов, без неё поиск путей по всему файлу\n"
+            "Полный - поиск по всему файлу всегда\n"
+            "Сцены с неполным результатом автоматически разбираются глубже")
+        actions_layout.addWidget(self.parse_mode_combo)
+        
+        actions_layout.addWidget(QLabel("Процессов:"))
+        self.workers_spin = QSpinBox()
+        self.workers_spin.setRange(0, os.cpu_count() or 1)
+        self.workers_spin.setSpecialValueText("авто")
+        self.workers_spin.setToolTip("Число процессов для разбора сцен папки (авто - по числу ядер)")
+        actions_layout.addWidget(self.workers_spin)
+        
+        self.watch_cb = QCheckBox("👁 Следить")
+        self.watch_cb.setToolTip(
+            "После анализа следить за папкой проекта и обновлять результат\n"
+            "без повторного анализа: новые, удалённые и изменённые файлы и сцены\n"
+            "(на сетевых ресурсах - опрос папки раз в несколько секунд)")
+        self.watch_cb.toggled.connect(self.on_watch_toggled)
+        actions_layout.addWidget(self.watch_cb)
+        
         self.analyze_btn = QPushButton("🔍 Анализировать")
         self.analyze_btn.setMinimumHeight(40)
         self.analyze_btn.clicked.connect(self.start_analysis)
@@ -327,10 +452,33 @@ class MainWindow(QMainWindow):
         scenes_group = QGroupBox("Найденные сцены")
         scenes_layout = QVBoxLayout(scenes_group)
         
+        # Фильтр по сведениям из заголовка сцены
+        filter_layout = QHBoxLayout()
+        filter_layout.addWidget(QLabel("Рендер:"))
+        self.renderer_filter_combo = QComboBox()
+        self.renderer_filter_combo.currentIndexChanged.connect(self.apply_scene_filter)
+        filter_layout.addWidget(self.renderer_filter_combo)
+        filter_layout.addWidget(QLabel("Версия Max:"))
+        self.version_filter_combo = QComboBox()
+        self.version_filter_combo.currentIndexChanged.connect(self.apply_scene_filter)
+        filter_layout.addWidget(self.version_filter_combo)
+        filter_layout.addStretch()
+        scenes_layout.addLayout(filter_layout)
+        
         self.scenes_list = QListWidget()
         self.scenes_list.itemDoubleClicked.connect(self.on_scene_double_clicked)
+        self.scenes_list.setIconSize(QSize(self.THUMBNAIL_SIZE, self.THUMBNAIL_SIZE))
+        # Одинаковая высота строк: список не измеряет каждую из тысяч строк
+        self.scenes_list.setUniformItemSizes(True)
         scenes_layout.addWidget(self.scenes_list)
         
+        # Миниатюры запрашиваются, когда прокрутка остановилась
+        self.thumbnail_timer = QTimer(self)
+        self.thumbnail_timer.setSingleShot(True)
+        self.thumbnail_timer.setInterval(100)
+        self.thumbnail_timer.timeout.connect(self.load_visible_thumbnails)
+        self.scenes_list.verticalScrollBar().valueChanged.connect(self.thumbnail_timer.start)
+        
         layout.addWidget(scenes_group)
         
         return tab
@@ -373,22 +521,173 @@ class MainWindow(QMainWindow):
     
     def scan_folder_for_scenes(self, folder: Path):
         self.scenes_list.clear()
-        
-        if self.recursive_cb.isChecked():
-            max_files = list(folder.rglob("*.max"))
-        else:
-            max_files = list(folder.glob("*.max"))
-        
+        self.thumbnail_loader.cancel()
+        self.header_loader.cancel()
+        self.scene_items = {}
+        self.thumbnails_loaded = set()
+        self.scene_headers = {}
+        self.scene_folder = folder
+        
+        max_files = sorted(Path(walked.path) for walked in walk_files_parallel(
+            folder, {'.max'}, recursive=self.recursive_cb.isChecked(),
+            threads=AssetAnalyzer.WALK_THREADS))
+        
+        # Строки - сразу из обхода; версия и рендер дописываются по мере
+        # чтения потоков свойств в фоне (неизменённые сцены - из кэша)
+        self.scenes_list.setUpdatesEnabled(False)
         for f in max_files:
             item = QListWidgetItem(f"📄 {f.relative_to(folder)}")
             item.setData(Qt.ItemDataRole.UserRole, str(f))
-            # Цветовая индикация: существующие файлы - нормальный цвет, несуществующие - серый
-            if not f.exists():
-                item.setForeground(QBrush(QColor(158, 158, 158)))
             self.scenes_list.addItem(item)
+            self.scene_items[str(f)] = item
+        self.scenes_list.setUpdatesEnabled(True)
         
+        self.update_scene_filters()
+        self.header_generation = self.header_loader.load(self.scene_items)
         self.log(f"📁 Найдено сцен: {len(max_files)}")
     
+    def on_scene_headers_ready(self, generation: int, headers: list):
+        """Дописывает в строки сведения о сценах, пришедшие из фона"""
+        if generation != self.header_generation:
+            # Сведения сцен предыдущей папки
+            return
+        
+        renderer = self.renderer_filter_combo.currentData()
+        year = self.version_filter_combo.currentData()
+        visibility_changed = False
+        for scene_path, header in headers:
+            item = self.scene_items.get(scene_path)
+            if item is None:
+                continue
+            self.scene_headers[scene_path] = header
+            relative = Path(scene_path).relative_to(self.scene_folder)
+            item.setText(f"📄 {relative}{self.format_scene_header(header)}")
+            item.setToolTip(self.scene_header_tooltip(header))
+            hidden = not self.scene_matches_filter(header, renderer, year)
+            if hidden != item.isHidden():
+                item.setHidden(hidden)
+                visibility_changed = True
+        
+        self.add_scene_filter_values(header for _, header in headers)
+        if visibility_changed:
+            self.thumbnail_timer.start()
+    
+    @staticmethod
+    def format_scene_header(header: SceneHeader) -> str:
+        """Краткие сведения о сцене для строки списка"""
+        details = []
+        if header.max_year:
+            details.append(f"Max {header.max_year}")
+        if header.renderer:
+            details.append(header.renderer)
+        if header.compressed:
+            details.append("сжата")
+        return f"  —  {', '.join(details)}" if details else ""
+    
+    @staticmethod
+    def scene_header_tooltip(header: SceneHeader) -> str:
+        lines = []
+        if header.max_version:
+            lines.append(f"3ds Max: {header.max_version}"
+                         + (f" (сборка {header.build})" if header.build else ""))
+        if header.renderer:
+            lines.append(f"Рендер: {header.renderer}")
+        if header.saved_by:
+            lines.append(f"Сохранил: {header.saved_by}")
+        if header.last_saved:
+            lines.append(f"Сохранена: {header.last_saved.astimezone():%d.%m.%Y %H:%M}")
+        if header.error:
+            lines.append(header.error)
+        return "\n".join(lines)
+    
+    def update_scene_filters(self):
+        """Заполняет фильтры значениями из найденных сцен"""
+        for combo in (self.renderer_filter_combo, self.version_filter_combo):
+            combo.blockSignals(True)
+            combo.clear()
+            combo.addItem("Все", None)
+            combo.blockSignals(False)
+        self.add_scene_filter_values(self.scene_headers.values())
+        
+        self.apply_scene_filter()
+    
+    def add_scene_filter_values(self, headers: Iterable[SceneHeader]):
+        """Добавляет в фильтры новые рендеры и версии, не сбрасывая выбор"""
+        renderers, years = set(), set()
+        for header in headers:
+            if header.renderer_family:
+                renderers.add(header.renderer_family)
+            if header.max_year:
+                years.add(header.max_year)
+        
+        # Рендеры - по алфавиту, версии - от новых к старым
+        for combo, values, newest_first in ((self.renderer_filter_combo, renderers, False),
+                                            (self.version_filter_combo, years, True)):
+            present = {combo.itemData(index) for index in range(1, combo.count())}
+            new_values = values - present
+            if not new_values:
+                continue
+            combo.blockSignals(True)
+            for value in new_values:
+                index = 1
+                while index < combo.count() and (
+                        combo.itemData(index) > value if newest_first else combo.itemData(index) < value):
+                    index += 1
+                combo.insertItem(index, f"Max {value}" if newest_first else value, value)
+            combo.blockSignals(False)
+    
+    @staticmethod
+    def scene_matches_filter(header: Optional[SceneHeader], renderer, year) -> bool:
+        """Сцена подходит под фильтр (сцены без сведений пока показываются)"""
+        return header is None or (
+            (renderer is None or header.renderer_family == renderer)
+            and (year is None or header.max_year == year)
+        )
+    
+    def apply_scene_filter(self):
+        """Скрывает сцены, не подходящие под выбранный рендер и версию"""
+        renderer = self.renderer_filter_combo.currentData()
+        year = self.version_filter_combo.currentData()
+        
+        shown = 0
+        for row in range(self.scenes_list.count()):
+            item = self.scenes_list.item(row)
+            header = self.scene_headers.get(item.data(Qt.ItemDataRole.UserRole))
+            visible = self.scene_matches_filter(header, renderer, year)
+            item.setHidden(not visible)
+            shown += visible
+        
+        if renderer is not None or year is not None:
+            self.log(f"🔎 Показано сцен: {shown} из {self.scenes_list.count()}")
+        self.thumbnail_timer.start()
+    
+    def load_visible_thumbnails(self):
+        """Запрашивает миниатюры сцен, видимых в списке"""
+        viewport = self.scenes_list.viewport()
+        first = self.scenes_list.indexAt(QPoint(0, 0)).row()
+        if first < 0:
+            return
+        last = self.scenes_list.indexAt(QPoint(0, viewport.height() - 1)).row()
+        if last < 0:
+            last = self.scenes_list.count() - 1
+        
+        visible = []
+        for row in range(first, last + 1):
+            item = self.scenes_list.item(row)
+            scene_path = item.data(Qt.ItemDataRole.UserRole)
+            if not item.isHidden() and scene_path not in self.thumbnails_loaded:
+                visible.append(scene_path)
+        self.thumbnail_loader.request(visible)
+    
+    def on_thumbnail_ready(self, scene_path: str, image: QImage):
+        item = self.scene_items.get(scene_path)
+        if item is None:
+            # Миниатюра сцены из предыдущей папки
+            return
+        self.thumbnails_loaded.add(scene_path)
+        if not image.isNull():
+            item.setIcon(QIcon(QPixmap.fromImage(image)))
+    
     def start_analysis(self):
         current_tab = self.tabs.currentIndex()
         
@@ -415,13 +714,16 @@ class MainWindow(QMainWindow):
             is_folder = True
             recursive = self.recursive_cb.isChecked()
         
+        self.stop_watching()
         self.set_ui_busy(True)
         self.log_text.clear()
         
         self.analyzer_thread = AnalyzerThread(
             path=path,
             is_folder=is_folder,
-            recursive=recursive
+            recursive=recursive,
+            parse_mode=self.parse_mode_combo.currentData(),
+            workers=self.workers_spin.value() or None
         )
         
         self.analyzer_thread.progress.connect(self.log)
@@ -449,6 +751,21 @@ class MainWindow(QMainWindow):
         for scene in result.scenes:
             self.log(f"   • {scene.name}")
         
+        # Режимы разбора и время проходов
+        mode_counts = {}
+        mode_seconds = {}
+        for scene_assets in result.scene_details.values():
+            mode = scene_assets.parse_mode.value
+            mode_counts[mode] = mode_counts.get(mode, 0) + 1
+            for timed_mode, seconds in scene_assets.mode_timings.items():
+                mode_seconds[timed_mode] = mode_seconds.get(timed_mode, 0.0) + seconds
+        if mode_counts:
+            self.log(f"\n⏱ Режимы разбора:")
+            for mode in (m.value for m in ParseMode):
+                if mode in mode_seconds:
+                    self.log(f"   {mode}: сцен {mode_counts.get(mode, 0)}, "
+                             f"время {mode_seconds[mode]:.2f} с")
+        
         self.log(f"\n📦 АССЕТЫ В СЦЕНЕ:")
         self.log(f"   🎨 Текстур: {len(result.used_textures)}")
         self.log(f"   📦 Прокси: {len(result.used_proxies)}")
@@ -472,19 +789,18 @@ class MainWindow(QMainWindow):
         file_count = 0
         used_count = 0
         
+        # Размеры сняты при сканировании папки
         for file_info in result.all_files_info.values():
-            try:
-                if file_info.path.exists():
-                    size = file_info.path.stat().st_size
-                    total_size += size
-                    file_count += 1
-                    if file_info.is_used:
-                        used_size += size
-                        used_count += 1
-                    else:
-                        unused_size += size
-            except (OSError, AttributeError):
-                pass
+            size = file_info.size
+            if size is None:
+                continue
+            total_size += size
+            file_count += 1
+            if file_info.is_used:
+                used_size += size
+                used_count += 1
+            else:
+                unused_size += size
         
         def format_size(size_bytes):
             for unit in ['Б', 'КБ', 'МБ', 'ГБ', 'ТБ']:
@@ -523,6 +839,59 @@ class MainWindow(QMainWindow):
         
         self.log("\n" + "=" * 60)
         self.log("💡 Перейдите на вкладки 'Статистика' и 'Структура папок' для детальной информации")
+        
+        self.start_watching()
+    
+    def on_watch_toggled(self, checked: bool):
+        if checked:
+            self.start_watching()
+        elif self.watch_thread is not None:
+            self.stop_watching()
+            self.log("👁 Отслеживание папки выключено")
+    
+    def start_watching(self):
+        """Запускает отслеживание папки текущего анализа (если включено)"""
+        self.stop_watching()
+        if not self.watch_cb.isChecked() or self.current_analysis is None:
+            return
+        
+        self.watch_thread = WatchThread(self.current_analysis,
+                                        workers=self.workers_spin.value() or None)
+        self.watch_thread.progress.connect(self.log)
+        self.watch_thread.changes_ready.connect(self.on_folder_changes)
+        self.watch_thread.start()
+    
+    def stop_watching(self):
+        if self.watch_thread is not None:
+            self.watch_thread.stop()
+            self.watch_thread = None
+    
+    def on_folder_changes(self, changes: FolderChanges):
+        """Применяет изменения в папке к результату анализа и виджетам"""
+        if self.watch_thread is None or self.watch_thread.analysis is not self.current_analysis:
+            return
+        
+        result = self.current_analysis
+        delta = self.watch_thread.analyzer.apply_changes(result, changes)
+        if delta.is_empty:
+            return
+        
+        self.stats_widget.apply_delta(result, delta)
+        self.tree_widget.apply_delta(result, delta)
+        
+        parts = []
+        if delta.added:
+            parts.append(f"новых файлов {len(delta.added)}")
+        if delta.removed:
+            parts.append(f"удалено {len(delta.removed)}")
+        if delta.changed:
+            parts.append(f"изменено {len(delta.changed)}")
+        if delta.scenes_updated or delta.scenes_removed:
+            parts.append(f"сцен перечитано {len(delta.scenes_updated)}, "
+                         f"удалено {len(delta.scenes_removed)}")
+        if delta.missing_added or delta.missing_removed:
+            parts.append(f"отсутствует {len(result.missing_files)}")
+        self.log(f"👁 Изменения в папке: {', '.join(parts) or 'статус файлов не изменился'}")
     
     def start_organizing(self):
         """Запускает организацию файлов"""
@@ -575,6 +944,11 @@ class MainWindow(QMainWindow):
         if reply != QMessageBox.StandardButton.Yes:
             return
         
+        # Организация сама перемещает файлы - результат после неё устареет
+        if self.watch_thread is not None:
+            self.stop_watching()
+            self.log("👁 Отслеживание папки остановлено на время организации")
+        
         self.set_ui_busy(True)
         self.log("\n" + "=" * 60)
         self.log("📦 ОРГАНИЗАЦИЯ ФАЙЛОВ")
@@ -706,6 +1080,14 @@ class MainWindow(QMainWindow):
         QApplication.processEvents()
     
     def load_settings(self):
+        parse_mode = self.settings.value("parse_mode", ParseMode.STANDARD.value)
+        for i in range(self.parse_mode_combo.count()):
+            if self.parse_mode_combo.itemData(i).value == parse_mode:
+                self.parse_mode_combo.setCurrentIndex(i)
+        
+        self.workers_spin.setValue(int(self.settings.value("parse_workers", 0)))
+        self.watch_cb.setChecked(self.settings.value("watch_folder", False, type=bool))
+        
         max_path = self.settings.value("max_path", "")
         if max_path:
             self.max_path_edit.setText(max_path)
@@ -745,6 +1127,12 @@ class MainWindow(QMainWindow):
     
     def closeEvent(self, event):
         self.settings.setValue("max_path", self.max_path_edit.text())
+        self.settings.setValue("parse_mode", self.parse_mode_combo.currentData().value)
+        self.settings.setValue("parse_workers", self.workers_spin.value())
+        self.settings.setValue("watch_folder", self.watch_cb.isChecked())
+        self.stop_watching()
+        self.thumbnail_loader.shutdown()
+        self.header_loader.shutdown()
         event.accept()
 
 
@@ -0,0 +1,81 @@
+"""
+Фоновое чтение сведений о сценах (версия Max, рендер) для списка сцен
+"""
+
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Iterable, List
+
+from PyQt6.QtCore import QObject, pyqtSignal
+
+# Добавляем путь к core
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core import MaxFileParser, SceneHeader
+from core.header_cache import SceneHeaderCache
+
+
+class SceneHeaderLoader(QObject):
+    """
+    Читает сведения о сценах пулом потоков: кэш сведений, при промахе -
+    потоки свойств документа сцены. Готовые сведения приходят пачками
+    сигналом headers_ready (номер загрузки, [(путь, SceneHeader)]) в поток
+    интерфейса.
+    """
+
+    headers_ready = pyqtSignal(int, list)
+
+    # Сцен в одной пачке: реже сигналы - меньше перерисовок списка
+    BATCH_SIZE = 64
+
+    def __init__(self, workers: int = 4, cache: SceneHeaderCache = None,
+                 parent: QObject = None):
+        super().__init__(parent)
+        self.cache = cache if cache is not None else SceneHeaderCache()
+        self.parser = MaxFileParser()
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="headers")
+        self._lock = threading.Lock()
+        # Номер текущей загрузки: пачки прежних загрузок не читаются
+        self._generation = 0
+
+    def load(self, scene_paths: Iterable[str]) -> int:
+        """
+        Ставит в очередь сведения о сценах (по порядку списка) и отменяет
+        прежнюю загрузку. Возвращает номер загрузки для headers_ready.
+        """
+        with self._lock:
+            self._generation += 1
+            generation = self._generation
+        scene_paths = list(scene_paths)
+        for start in range(0, len(scene_paths), self.BATCH_SIZE):
+            self._pool.submit(self._load, generation, scene_paths[start:start + self.BATCH_SIZE])
+        return generation
+
+    def cancel(self):
+        """Отменяет ожидающие пачки (например, при смене папки)"""
+        with self._lock:
+            self._generation += 1
+
+    def shutdown(self):
+        self.cancel()
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        self.cache.close()
+
+    def _load(self, generation: int, scene_paths: List[str]):
+        headers = []
+        for scene_path in scene_paths:
+            if generation != self._generation:
+                return
+            try:
+                header = self.cache.get_or_read(Path(scene_path), self.parser.read_scene_header)
+            except Exception as e:
+                header = SceneHeader(scene_path=Path(scene_path), failed=True, error=str(e))
+            headers.append((scene_path, header))
+
+        try:
+            self.headers_ready.emit(generation, headers)
+        except RuntimeError:
+            # Окно уже закрыто
+            pass
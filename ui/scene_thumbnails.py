@@ -0,0 +1,93 @@
+"""
+Фоновая загрузка миниатюр сцен для списка сцен
+"""
+
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Iterable, Set
+
+from PyQt6.QtCore import QObject, Qt, pyqtSignal
+from PyQt6.QtGui import QImage
+
+# Добавляем путь к core
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core import MaxFileParser
+from core.thumbnail_cache import ThumbnailCache
+
+
+class ThumbnailLoader(QObject):
+    """
+    Загружает миниатюры сцен пулом потоков: кэш миниатюр, при промахе -
+    чтение потока свойств сцены, затем декодирование и масштабирование.
+    Готовые изображения приходят сигналом thumbnail_ready в поток интерфейса.
+    """
+
+    thumbnail_ready = pyqtSignal(str, QImage)
+
+    def __init__(self, icon_size: int = 48, workers: int = 4,
+                 cache: ThumbnailCache = None, parent: QObject = None):
+        super().__init__(parent)
+        self.icon_size = icon_size
+        self.cache = cache if cache is not None else ThumbnailCache()
+        self.parser = MaxFileParser()
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="thumbnails")
+        self._lock = threading.Lock()
+        # Сцены в очереди пула и сцены, которые сейчас видны в списке
+        self._pending: Set[str] = set()
+        self._wanted: Set[str] = set()
+
+    def request(self, scene_paths: Iterable[str]):
+        """
+        Ставит в очередь миниатюры видимых сцен. Сцены, ушедшие из
+        видимой области, из очереди не загружаются.
+        """
+        scene_paths = list(scene_paths)
+        with self._lock:
+            self._wanted = set(scene_paths)
+            queued = [path for path in scene_paths if path not in self._pending]
+            self._pending.update(queued)
+        for scene_path in queued:
+            self._pool.submit(self._load, scene_path)
+
+    def cancel(self):
+        """Отменяет ожидающие загрузки (например, при смене папки)"""
+        with self._lock:
+            self._wanted = set()
+
+    def shutdown(self):
+        self.cancel()
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        self.cache.close()
+
+    def _load(self, scene_path: str):
+        with self._lock:
+            if scene_path not in self._wanted:
+                # Пролистали мимо - загрузим, когда сцена снова станет видна
+                self._pending.discard(scene_path)
+                return
+
+        try:
+            data = self.cache.get_or_read(Path(scene_path), self.parser.read_thumbnail)
+            image = QImage()
+            if data and image.loadFromData(data, "BMP"):
+                image = image.scaled(self.icon_size, self.icon_size,
+                                     Qt.AspectRatioMode.KeepAspectRatio,
+                                     Qt.TransformationMode.SmoothTransformation)
+            else:
+                image = QImage()
+        except Exception:
+            # Сбой чтения (сеть, файл занят) не запоминается: миниатюра
+            # загрузится снова, когда сцена опять окажется в видимой области
+            return
+        finally:
+            with self._lock:
+                self._pending.discard(scene_path)
+
+        try:
+            self.thumbnail_ready.emit(scene_path, image)
+        except RuntimeError:
+            # Окно уже закрыто
+            pass
@@ -18,7 +18,7 @@ from PyQt6.QtGui import QColor, QBrush, QFont
 # Добавляем путь к core
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from core.asset_analyzer import AnalysisResult, FileInfo
+from core.asset_analyzer import AnalysisDelta, AnalysisResult, FileInfo
 
 
 class StatisticsWidget(QWidget):
@@ -27,6 +27,11 @@ class StatisticsWidget(QWidget):
     def __init__(self):
         super().__init__()
         self.current_analysis: Optional[AnalysisResult] = None
+        # Суммы по файлам с известным размером: общие и по папкам.
+        # Обновляются по изменениям, без пересчёта всех файлов
+        self.totals: Dict[str, int] = defaultdict(int)
+        self.folder_sizes: Dict[str, int] = defaultdict(int)
+        self.folder_file_counts: Dict[str, int] = defaultdict(int)
         self.init_ui()
     
     def init_ui(self):
@@ -67,47 +72,73 @@ class StatisticsWidget(QWidget):
         """Обновляет статистику на основе результатов анализа"""
         self.current_analysis = analysis
         
+        # Размеры сняты при сканировании папки
+        self.totals.clear()
+        self.folder_sizes.clear()
+        self.folder_file_counts.clear()
+        for file_info in analysis.all_files_info.values():
+            self._count_file(file_info)
+        
         # Обновляем общую статистику
         self._update_general_stats(analysis)
         
         # Обновляем таблицу
         self._update_stats_table(analysis)
     
+    def apply_delta(self, analysis: AnalysisResult, delta: AnalysisDelta):
+        """Обновляет статистику по изменениям в папке (только затронутые папки таблицы)"""
+        self.current_analysis = analysis
+        
+        folders = set()
+        for file_info in delta.removed + [before for before, _ in delta.changed]:
+            self._count_file(file_info, -1)
+            folders.add(file_info.folder)
+        for file_info in delta.added + [after for _, after in delta.changed]:
+            self._count_file(file_info)
+            folders.add(file_info.folder)
+        
+        self._update_general_stats(analysis)
+        for folder_name in folders:
+            self._update_folder_row(analysis, folder_name)
+    
+    def _count_file(self, file_info: FileInfo, sign: int = 1):
+        """Добавляет размер файла в суммы (sign=-1 - убирает)"""
+        size = file_info.size
+        if size is None:
+            return
+        totals = self.totals
+        totals['total_size'] += sign * size
+        totals['file_count'] += sign
+        
+        if file_info.is_used:
+            totals['used_size'] += sign * size
+            totals['used_count'] += sign
+        else:
+            totals['unused_size'] += sign * size
+        
+        # По типам
+        if file_info.file_type == 'texture':
+            totals['textures_size'] += sign * size
+        elif file_info.file_type == 'proxy':
+            totals['proxies_size'] += sign * size
+        else:
+            totals['other_size'] += sign * size
+        
+        self.folder_sizes[file_info.folder] += sign * size
+        self.folder_file_counts[file_info.folder] += sign
+    
     def _update_general_stats(self, analysis: AnalysisResult):
         """Обновляет общую статистику"""
-        total_size = 0
-        used_size = 0
-        unused_size = 0
-        file_count = 0
-        used_count = 0
+        totals = self.totals
+        total_size = totals['total_size']
+        used_size = totals['used_size']
+        unused_size = totals['unused_size']
+        file_count = totals['file_count']
+        used_count = totals['used_count']
         
-        # Считаем размеры файлов
-        textures_size = 0
-        proxies_size = 0
-        other_size = 0
-        
-        for file_info in analysis.all_files_info.values():
-            try:
-                if file_info.path.exists():
-                    size = file_info.path.stat().st_size
-                    total_size += size
-                    file_count += 1
-                    
-                    if file_info.is_used:
-                        used_size += size
-                        used_count += 1
-                    else:
-                        unused_size += size
-                    
-                    # По типам
-                    if file_info.file_type == 'texture':
-                        textures_size += size
-                    elif file_info.file_type == 'proxy':
-                        proxies_size += size
-                    else:
-                        other_size += size
-            except (OSError, AttributeError):
-                pass
+        textures_size = totals['textures_size']
+        proxies_size = totals['proxies_size']
+        other_size = totals['other_size']
         
         # Форматируем размеры
         def format_size(size_bytes):
@@ -170,6 +201,39 @@ class StatisticsWidget(QWidget):
         if not analysis.folder_stats:
             return
         
+        # Заполняем таблицу
+        for folder_name, stats in sorted(analysis.folder_stats.items()):
+            row = self.stats_table.rowCount()
+            self.stats_table.insertRow(row)
+            self._fill_row(row, folder_name, stats)
+        
+        self.stats_table.resizeColumnsToContents()
+    
+    def _update_folder_row(self, analysis: AnalysisResult, folder_name: str):
+        """Обновляет, добавляет или удаляет строку одной папки"""
+        
+        # Строки отсортированы по имени папки
+        row = 0
+        while row < self.stats_table.rowCount():
+            name = self.stats_table.item(row, 0).text()
+            if name >= folder_name:
+                break
+            row += 1
+        exists = (row < self.stats_table.rowCount() and
+                  self.stats_table.item(row, 0).text() == folder_name)
+        
+        stats = analysis.folder_stats.get(folder_name)
+        if stats is None:
+            if exists:
+                self.stats_table.removeRow(row)
+            return
+        if not exists:
+            self.stats_table.insertRow(row)
+        self._fill_row(row, folder_name, stats)
+    
+    def _fill_row(self, row: int, folder_name: str, stats: Dict[str, int]):
+        """Заполняет строку таблицы для папки"""
+        
         def format_size(size_bytes):
             for unit in ['Б', 'КБ', 'МБ', 'ГБ']:
                 if size_bytes < 1024.0:
@@ -177,64 +241,43 @@ class StatisticsWidget(QWidget):
                 size_bytes /= 1024.0
             return f"{size_bytes:.2f} ГБ"
         
-        # Считаем размеры по папкам
-        folder_sizes = defaultdict(int)
-        folder_file_counts = defaultdict(int)
+        total = stats['total']
+        used = stats['used']
+        unused = stats['unused']
         
-        for file_info in analysis.all_files_info.values():
-            try:
-                if file_info.path.exists():
-                    size = file_info.path.stat().st_size
-                    folder_sizes[file_info.folder] += size
-                    folder_file_counts[file_info.folder] += 1
-            except (OSError, AttributeError):
-                pass
+        total_size = self.folder_sizes.get(folder_name, 0)
+        file_count = self.folder_file_counts.get(folder_name, 0)
+        avg_size = total_size / file_count if file_count > 0 else 0
         
-        # Заполняем таблицу
-        for folder_name, stats in sorted(analysis.folder_stats.items()):
-            row = self.stats_table.rowCount()
-            self.stats_table.insertRow(row)
-            
-            total = stats['total']
-            used = stats['used']
-            unused = stats['unused']
-            
-            total_size = folder_sizes.get(folder_name, 0)
-            file_count = folder_file_counts.get(folder_name, 0)
-            avg_size = total_size / file_count if file_count > 0 else 0
-            
-            # Папка
-            item = QTableWidgetItem(folder_name)
-            self.stats_table.setItem(row, 0, item)
-            
-            # Всего
-            item = QTableWidgetItem(str(total))
-            item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-            self.stats_table.setItem(row, 1, item)
-            
-            # Используется
-            item = QTableWidgetItem(str(used))
-            item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-            if used > 0:
-                item.setForeground(QBrush(QColor(76, 175, 80)))  # Зеленый
-            self.stats_table.setItem(row, 2, item)
-            
-            # Не используется
-            item = QTableWidgetItem(str(unused))
-            item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-            if unused > 0:
-                item.setForeground(QBrush(QColor(244, 67, 54)))  # Красный
-            self.stats_table.setItem(row, 3, item)
-            
-            # Общий размер
-            item = QTableWidgetItem(format_size(total_size))
-            item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
-            self.stats_table.setItem(row, 4, item)
-            
-            # Средний размер
-            item = QTableWidgetItem(format_size(avg_size))
-            item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
-            self.stats_table.setItem(row, 5, item)
+        # Папка
+        item = QTableWidgetItem(folder_name)
+        self.stats_table.setItem(row, 0, item)
         
-        self.stats_table.resizeColumnsToContents()
-
+        # Всего
+        item = QTableWidgetItem(str(total))
+        item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.stats_table.setItem(row, 1, item)
+        
+        # Используется
+        item = QTableWidgetItem(str(used))
+        item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
+        if used > 0:
+            item.setForeground(QBrush(QColor(76, 175, 80)))  # Зеленый
+        self.stats_table.setItem(row, 2, item)
+        
+        # Не используется
+        item = QTableWidgetItem(str(unused))
+        item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
+        if unused > 0:
+            item.setForeground(QBrush(QColor(244, 67, 54)))  # Красный
+        self.stats_table.setItem(row, 3, item)
+        
+        # Общий размер
+        item = QTableWidgetItem(format_size(total_size))
+        item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+        self.stats_table.setItem(row, 4, item)
+        
+        # Средний размер
+        item = QTableWidgetItem(format_size(avg_size))
+        item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+        self.stats_table.setItem(row, 5, item)